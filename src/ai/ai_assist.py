@@ -1,57 +1,64 @@
 # src/ai/ai_assist.py
 import os
 import re
-import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict
 from PyQt6.QtWidgets import QMessageBox
-from PyQt6.QtCore import QDir, QObject, QThread, pyqtSignal
+from PyQt6.QtCore import QDir, QObject, pyqtSignal
 from dotenv import load_dotenv
-from groq import Groq
+from ai.ai_client import DEFAULT_AI_WORKERS, AIClient, next_request_id
+from ai.batch_import import RateLimiter
+from ai.batch_import_thread import BatchImportThread
+from ai.context_builder import ContextBuilder
+from ai.placement import PlacementEngine
+from ai.response_cache import ResponseCache
+from utils.file_structure import StructurePlan
+from utils.structure_parser import iter_lines, parse_structure
 
 class AIWorker(QObject):
+    """One AI request, run on the AIAssist pool.
+
+    The worker lives in the GUI thread while ``run`` executes on a pool
+    thread, so its signals are delivered queued to the GUI.
+    """
+
     finished = pyqtSignal()
     error = pyqtSignal(Exception)
     result = pyqtSignal(str)
     log = pyqtSignal(str)
 
-    def __init__(self, api_key, current_directory, content, prompt_template):
+    def __init__(self, client, request_id, current_directory, content, prompt_template, context_builder=None,
+                 placement_engine=None):
         super().__init__()
-        self.api_key = api_key
+        self.client = client
+        self.context_builder = context_builder
+        self.placement_engine = placement_engine
+        self.request_id = request_id
         self.current_directory = current_directory
         self.content = content
         self.prompt_template = prompt_template
 
     def run(self):
         try:
-            client = Groq(api_key=self.api_key)
+            placement = self.placement_engine.place(self.content, self.current_directory) if self.placement_engine else None
+            if placement:
+                self.log.emit(f"[{self.request_id}] Placed without AI ({placement.reason}, "
+                              f"confidence {placement.confidence:.2f}): {placement.path}")
+                self._create_structure_from_stream([placement.path])
+                self.result.emit(self.current_directory)
+                return
+            context = self.context_builder.build(self.current_directory) if self.context_builder else ''
             prompt = self.prompt_template.format(
                 current_directory=self.current_directory,
+                context=context,
                 content=self.content
             )
-            self.log.emit(f"Prompt to AI:\n{prompt}")
-            chat_completion = client.chat.completions.create(
-                messages=[
-                    {
-                        "role": "system",
-                        "content": (
-                            "You are a helpful assistant. When provided with a description of a file structure, "
-                            "you must respond with the properly formatted structure to create the directories and files. "
-                            "Respond only with the formatted structure and nothing else."
-                        )
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                model="mixtral-8x7b-32768",
-                temperature=0.3,
-                top_p=1
-            )
-            response = chat_completion.choices[0].message.content.strip()
-            self.log.emit(f"Response from AI:\n{response}")
+            self.log.emit(f"[{self.request_id}] Prompt to AI:\n{prompt}")
+            chunks = self.client.stream(prompt, self.request_id, log=self.log.emit)
 
-            # Use the formatted structure directly to create directories and files
-            self._create_structure_from_response(response)
+            # Create each entry as soon as its line of the structure is complete
+            self._create_structure_from_stream(chunks)
 
             self.result.emit(self.current_directory)
         except Exception as e:
@@ -79,88 +86,23 @@ class AIWorker(QObject):
         abs_directory = os.path.abspath(directory)
         return abs_path.startswith(abs_directory)
 
-    def _create_directory(self, path):
-        """Create a directory at the given path.
-
-        Args:
-            path (str): The path of the directory to create.
-        """
-        os.makedirs(path, exist_ok=True)
-        self.log.emit(f"Created directory: {path}")
-
-    def _create_file(self, path):
-        """Create a file at the given path.
-
-        Args:
-            path (str): The path of the file to create.
-        """
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-        open(path, 'a').close()
-        self.log.emit(f"Created file: {path}")
-
-    def _create_structure_from_response(self, response):
-        """Create the file structure from the AI response.
+    def _create_structure_from_stream(self, chunks):
+        """Create the file structure from the streamed AI response, line by line.
 
         Args:
-            response (str): The formatted structure from the AI response.
+            chunks (Iterable[str]): The response text as it arrives.
         """
-        lines = response.split('\n')
-        stack = [self.current_directory]
+        plan = StructurePlan(self.current_directory)
+        for entry in parse_structure(self._logged_lines(iter_lines(chunks))):
+            for path, is_file in plan.create(entry.path, entry.is_file):
+                kind = "file" if is_file else "directory"
+                self.log.emit(f"[{self.request_id}] Created {kind}: {os.path.join(plan.root, path)}")
 
+    def _logged_lines(self, lines):
         for line in lines:
-            line = line.rstrip()
-            if not line:
-                continue
-
-            depth = self._get_indent_level(line)
-
-            clean_line = line.lstrip(' ┣┃┗').strip()
-            if not clean_line:
-                continue
-
-            path_parts = self._extract_path_parts(clean_line)
-
-            while depth < len(stack) - 1:
-                stack.pop()
-
-            current_path = os.path.join(stack[-1], *path_parts)
-
-            if '.' in os.path.basename(current_path):  # It's a file
-                self._create_file(current_path)
-            else:  # It's a directory
-                self._create_directory(current_path)
-                if depth >= len(stack):
-                    stack.append(current_path)
-
-    def _get_indent_level(self, line: str) -> int:
-        """Get the indent level of a line in the input structure.
-
-        Args:
-            line (str): The line from the input structure.
-
-        Returns:
-            int: The indent level of the line.
-        """
-        return len(line) - len(line.lstrip(' ┣┃┗'))
-
-    def _extract_path_parts(self, line: str) -> list:
-        """Extract the path parts from a line in the input structure.
-
-        Args:
-            line (str): The line from the input structure.
-
-        Returns:
-            list: A list of path parts.
-        """
-        parts = []
-        special_chars = ['📦', '📂', '📜', '┣', '┃', '┗']
-        for part in line.split():
-            part = part.strip()
-            for char in special_chars:
-                part = part.replace(char, '')
-            if part:
-                parts.append(part)
-        return parts
+            if line.strip():
+                self.log.emit(f"[{self.request_id}] {line}")
+            yield line
 
 class AIAssist:
     def __init__(self, status_bar, console_logger):
@@ -169,7 +111,15 @@ class AIAssist:
         load_dotenv(os.path.join(os.path.dirname(__file__), '../settings/secret/.env'))
         self.api_key = os.getenv('GROQ_API_KEY')
         self.current_directory = QDir.currentPath()
-        self.thread = None
+        self.response_cache = ResponseCache()  # Identical requests are answered without a round trip
+        self.client = AIClient(self.api_key, self.response_cache)  # One client, so connections are reused
+        # Requests beyond the pool size wait in the executor's queue
+        self.executor = ThreadPoolExecutor(max_workers=DEFAULT_AI_WORKERS, thread_name_prefix='ai')
+        self.workers: Dict[int, AIWorker] = {}  # In-flight requests by id, kept alive until they finish
+        self.context_builder = ContextBuilder()  # Summaries of the directories prompts are about
+        self.placement_engine = PlacementEngine(self.context_builder)  # Routine imports skip the AI
+        self.rate_limiter = RateLimiter()  # Shared by batch imports, as the provider limits are
+        self.batch_thread = None
 
     def set_current_directory(self, path):
         self.current_directory = os.path.abspath(path)
@@ -180,34 +130,87 @@ class AIAssist:
     def ai_import_code_into_file(self, code, current_directory):
         prompt_template = (
             "The current directory is: {current_directory}\n"
+            "Its contents:\n{context}\n"
             "Please provide the relative file path (relative to the current directory) where the following code should be placed.\n"
             "Code:\n{content}\n"
             "Respond with the relative file path only. Do not include any other text."
         )
-        self._run_ai_task(code, current_directory, prompt_template)
+        self._run_ai_task(code, current_directory, prompt_template, self.placement_engine)
+
+    def ai_batch_import(self, current_directory, snippets=None, folder=None):
+        """Place many snippets, given or read from a folder, and offer the plan for review."""
+        self.cancel_batch_import()
+        self.status_bar.showMessage("Placing snippets...")
+        # Parented to a widget, so a cancelled thread is not destroyed before it stops
+        self.batch_thread = BatchImportThread(self.client, self.rate_limiter, current_directory, snippets, folder,
+                                              self.context_builder, self.placement_engine, parent=self.status_bar)
+        self.batch_thread.log.connect(self.log)
+        self.batch_thread.progress.connect(self.on_batch_progress)
+        self.batch_thread.plan_ready.connect(self.on_batch_plan_ready)
+        self.batch_thread.error.connect(self.handle_error)
+        # AIAssist is no QObject, so the thread is bound here instead of checked with sender()
+        self.batch_thread.finished.connect(partial(self.on_batch_finished, self.batch_thread))
+        self.batch_thread.finished.connect(self.batch_thread.deleteLater)
+        self.batch_thread.start()
+
+    def cancel_batch_import(self):
+        if self.batch_thread and self.batch_thread.isRunning():
+            self.batch_thread.progress.disconnect(self.on_batch_progress)
+            self.batch_thread.plan_ready.disconnect(self.on_batch_plan_ready)
+            self.batch_thread.error.disconnect(self.handle_error)
+            self.batch_thread.cancel()
+        self.batch_thread = None
+
+    def on_batch_progress(self, done, total):
+        self.status_bar.showMessage(f"Placed {done} of {total} snippets...")
+
+    def on_batch_finished(self, thread):
+        if thread is self.batch_thread:
+            self.batch_thread = None
+
+    def on_batch_plan_ready(self, plan):
+        box = QMessageBox(QMessageBox.Icon.Question, "Batch Import",
+                          f"In {plan.root}: {plan.summary()}.\n\nWrite the snippets into these files?",
+                          QMessageBox.StandardButton.Apply | QMessageBox.StandardButton.Cancel)
+        box.setDetailedText(plan.details())
+        if box.exec() != QMessageBox.StandardButton.Apply:
+            self.status_bar.showMessage("Batch import cancelled.")
+            return
+        try:
+            written = plan.apply()
+        except OSError as e:
+            self.handle_error(e)
+            return
+        for path in written:
+            self.log(f"Content successfully imported into: {path}")
+        self.status_bar.showMessage(f"Imported {len(plan.placements)} snippets into {len(written)} files.")
 
     def ai_create_file_structure(self, structure, current_directory):
         prompt_template = (
             "The current directory is: {current_directory}\n"
+            "Its contents:\n{context}\n"
             "Convert the following description into a properly formatted file directory structure within the current directory:\n\n{content}"
         )
         self._run_ai_task(structure, current_directory, prompt_template)
 
-    def _run_ai_task(self, content, current_directory, prompt_template):
-        self.worker = AIWorker(self.api_key, current_directory, content, prompt_template)
-        self.thread = QThread()
-        self.worker.moveToThread(self.thread)
-
-        self.worker.finished.connect(self.thread.quit)
-        self.worker.finished.connect(self.worker.deleteLater)
-        self.thread.finished.connect(self.thread.deleteLater)
-
-        self.worker.log.connect(self.log)
-        self.worker.result.connect(self.handle_result)
-        self.worker.error.connect(self.handle_error)
-
-        self.thread.started.connect(self.worker.run)
-        self.thread.start()
+    def _run_ai_task(self, content, current_directory, prompt_template, placement_engine=None):
+        request_id = next_request_id()
+        worker = AIWorker(self.client, request_id, current_directory, content, prompt_template, self.context_builder,
+                          placement_engine)
+        worker.log.connect(self.log)
+        worker.result.connect(self.handle_result)
+        worker.error.connect(self.handle_error)
+        worker.finished.connect(partial(self._request_finished, request_id))
+        if len(self.workers) >= DEFAULT_AI_WORKERS:
+            self.log(f"[{request_id}] Queued behind {len(self.workers)} AI requests")
+        self.workers[request_id] = worker
+        self.executor.submit(worker.run)
+        return request_id
+
+    def _request_finished(self, request_id):
+        worker = self.workers.pop(request_id, None)
+        if worker:
+            worker.deleteLater()
 
     def handle_result(self, full_path):
         self.status_bar.showMessage(f"Content imported into: {full_path}")
@@ -0,0 +1,187 @@
+# src/ai/ai_client.py
+import itertools
+import random
+import threading
+import time
+from typing import Callable, Iterator, List, Optional
+import httpx
+from groq import APIConnectionError, DefaultHttpxClient, Groq, InternalServerError, RateLimitError
+from ai.response_cache import ResponseCache, request_key
+
+MODEL = "mixtral-8x7b-32768"
+TEMPERATURE = 0.3
+SYSTEM_PROMPT = (
+    "You are a helpful assistant. When provided with a description of a file structure, "
+    "you must respond with the properly formatted structure to create the directories and files. "
+    "Respond only with the formatted structure and nothing else."
+)
+
+DEFAULT_AI_WORKERS = 4  # concurrent requests, and pooled HTTP connections
+REQUEST_TIMEOUT = 60.0  # seconds per attempt
+CONNECT_TIMEOUT = 10.0
+MAX_ATTEMPTS = 4
+BACKOFF_BASE = 1.0  # seconds before the first retry, doubled for each further one
+BACKOFF_MAX = 30.0
+
+# Timeouts are APIConnectionErrors; other client errors would fail the same way again
+RETRYABLE_ERRORS = (APIConnectionError, RateLimitError, InternalServerError)
+
+_request_ids = itertools.count(1)
+
+
+def next_request_id() -> int:
+    return next(_request_ids)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count of English text and code, about four characters a token."""
+    return len(text) // 4 + 1
+
+
+class AIClient:
+    """One Groq client shared by every AI request.
+
+    The underlying HTTP client keeps up to ``max_connections`` connections
+    alive, so concurrent and successive requests reuse them instead of
+    paying for a new TLS handshake and client setup each time. Requests are
+    answered from the response cache when possible, and failed attempts
+    that may succeed later are retried with exponential backoff.
+    """
+
+    def __init__(self, api_key: Optional[str], response_cache: Optional[ResponseCache] = None,
+                 max_connections: int = DEFAULT_AI_WORKERS, timeout: float = REQUEST_TIMEOUT,
+                 max_attempts: int = MAX_ATTEMPTS):
+        self.api_key = api_key
+        self.response_cache = response_cache
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.max_attempts = max(1, max_attempts)
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self) -> Groq:
+        """The Groq client, created on first use so a missing API key only fails requests."""
+        with self._lock:
+            if self._client is None:
+                http_client = DefaultHttpxClient(
+                    limits=httpx.Limits(max_connections=self.max_connections,
+                                        max_keepalive_connections=self.max_connections),
+                    timeout=httpx.Timeout(self.timeout, connect=CONNECT_TIMEOUT))
+                # Retries are done here, where they can be logged
+                self._client = Groq(api_key=self.api_key, http_client=http_client, max_retries=0)
+            return self._client
+
+    def _messages(self, system_prompt: str, prompt: str) -> List[dict]:
+        return [
+            {
+                "role": "system",
+                "content": system_prompt
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+
+    def _create(self, request_id: int, log: Callable[[str], None], **kwargs):
+        """Send a chat completion request, retrying the errors that may succeed later."""
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                return self.client.chat.completions.create(
+                    model=MODEL,
+                    temperature=TEMPERATURE,
+                    top_p=1,
+                    extra_headers={"X-Request-Id": f"fm-{request_id}"},
+                    **kwargs
+                )
+            except RETRYABLE_ERRORS as e:
+                if attempt == self.max_attempts:
+                    raise
+                delay = self._backoff(attempt, e)
+                log(f"[{request_id}] Attempt {attempt} failed ({type(e).__name__}), retrying in {delay:.1f} s")
+                time.sleep(delay)
+
+    def complete(self, prompt: str, request_id: int, system_prompt: str = SYSTEM_PROMPT,
+                 log: Optional[Callable[[str], None]] = None) -> str:
+        """Return the model's response to a prompt.
+
+        Args:
+            prompt (str): The user message.
+            request_id (int): Identifies the request in log messages and the request headers.
+            system_prompt (str): The system message.
+            log (callable, optional): Called with progress messages such as retries.
+
+        Returns:
+            str: The response text, stripped.
+
+        Raises:
+            groq.APIError: If the request fails, after the retries for transient errors.
+        """
+        log = log or (lambda message: None)
+        key = request_key(MODEL, system_prompt, prompt, TEMPERATURE)
+        response = self.response_cache.get(key) if self.response_cache else None
+        if response is not None:
+            log(f"[{request_id}] Response from cache ({self.response_cache.stats()}):\n{response}")
+            return response
+        chat_completion = self._create(request_id, log, messages=self._messages(system_prompt, prompt))
+        response = chat_completion.choices[0].message.content.strip()
+        log(f"[{request_id}] Response from AI:\n{response}")
+        if self.response_cache:
+            self.response_cache.put(key, response)
+        return response
+
+    def stream(self, prompt: str, request_id: int, system_prompt: str = SYSTEM_PROMPT,
+               log: Optional[Callable[[str], None]] = None) -> Iterator[str]:
+        """Yield the model's response to a prompt in chunks, as it is generated.
+
+        Only the opening of the stream is retried; an error after the first
+        chunk propagates, since the consumer has already acted on the text.
+        The complete response is cached once the stream ends, and a cached
+        response is yielded as a single chunk. Closing the generator early
+        closes the HTTP response, returning its connection to the pool.
+
+        Args:
+            prompt (str): The user message.
+            request_id (int): Identifies the request in log messages and the request headers.
+            system_prompt (str): The system message.
+            log (callable, optional): Called with progress messages such as retries.
+
+        Yields:
+            str: Pieces of the response text, unstripped.
+        """
+        log = log or (lambda message: None)
+        key = request_key(MODEL, system_prompt, prompt, TEMPERATURE)
+        response = self.response_cache.get(key) if self.response_cache else None
+        if response is not None:
+            log(f"[{request_id}] Response from cache ({self.response_cache.stats()})")
+            yield response
+            return
+        chunks = self._create(request_id, log, messages=self._messages(system_prompt, prompt), stream=True)
+        log(f"[{request_id}] Streaming response from AI")
+        parts = []
+        try:
+            for chunk in chunks:
+                text = chunk.choices[0].delta.content if chunk.choices else None
+                if text:
+                    parts.append(text)
+                    yield text
+        finally:
+            chunks.close()
+        if self.response_cache:
+            self.response_cache.put(key, ''.join(parts).strip())
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        if isinstance(error, RateLimitError):
+            try:
+                return min(BACKOFF_MAX, float(error.response.headers.get('retry-after', '')))
+            except ValueError:
+                pass  # No usable Retry-After; back off as for other errors
+        delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (attempt - 1))
+        return delay / 2 + random.uniform(0, delay / 2)  # Jitter keeps parallel retries apart
+
+    def close(self):
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
@@ -0,0 +1,316 @@
+# src/ai/batch_import.py
+import os
+import re
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Tuple
+from ai.ai_client import DEFAULT_AI_WORKERS, AIClient, estimate_tokens, next_request_id
+from ai.context_builder import ContextBuilder
+from ai.placement import PlacementEngine
+from utils.cancellation import CancelToken
+
+Snippet = namedtuple('Snippet', ['name', 'code'])
+
+IMPORT_SYSTEM_PROMPT = (
+    "You are a helpful assistant that decides where code snippets belong in a project. "
+    "Respond only in the requested format and nothing else."
+)
+IMPORT_PROMPT = (
+    "The current directory is: {current_directory}\n"
+    "Its contents:\n{context}\n"
+    "For each numbered code snippet below, provide the relative file path (relative to the current directory) "
+    "where it should be placed.\n"
+    "Respond with one line per snippet in the form '<number>: <relative file path>'. Do not include any other text.\n"
+    "{snippets}"
+)
+
+PROMPT_TOKEN_BUDGET = 3000  # prompt tokens per grouped request
+MAX_SNIPPET_TOKENS = 300  # leading part of each snippet sent; placement rarely needs more
+RESPONSE_TOKENS_PER_SNIPPET = 20
+REQUESTS_PER_MINUTE = 30  # provider rate limits
+TOKENS_PER_MINUTE = 5000
+MAX_SNIPPET_BYTES = 1024 * 1024
+
+# A fenced block, or a separator line such as '---' or '# ----' between snippets
+_FENCE = re.compile(r'^```[^\n]*\n(.*?)^```', re.M | re.S)
+_SEPARATOR = re.compile(r'^[ \t]*(?:#|//)?[ \t]*-{3,}[ \t]*$', re.M)
+_ANSWER = re.compile(r'^\W*(\d+)\W*?[:.)-]\s*(.+)$')
+
+
+def split_snippets(text: str) -> List[Snippet]:
+    """Split a multi-snippet paste into snippets.
+
+    Fenced code blocks are the snippets when there are any; otherwise the
+    text is split at separator lines of three or more dashes.
+    """
+    blocks = _FENCE.findall(text) or _SEPARATOR.split(text)
+    codes = [block.strip('\n') for block in blocks if block.strip()]
+    return [Snippet(f"snippet {number}", code) for number, code in enumerate(codes, 1)]
+
+
+def load_snippets(folder: str) -> List[Snippet]:
+    """Read the snippet files directly in a folder, sorted by name.
+
+    Hidden files, files over MAX_SNIPPET_BYTES and files that are not UTF-8
+    text are skipped.
+    """
+    snippets = []
+    with os.scandir(folder) as it:
+        entries = sorted((entry for entry in it if entry.is_file() and not entry.name.startswith('.')),
+                         key=lambda entry: entry.name.casefold())
+    for entry in entries:
+        if entry.stat().st_size > MAX_SNIPPET_BYTES:
+            continue
+        try:
+            with open(entry.path, 'r', encoding='utf-8') as file:
+                code = file.read()
+        except (OSError, UnicodeDecodeError):
+            continue
+        if code.strip():
+            snippets.append(Snippet(entry.name, code))
+    return snippets
+
+
+def _head(code: str) -> str:
+    limit = MAX_SNIPPET_TOKENS * 4
+    return code if len(code) <= limit else code[:limit] + "\n..."
+
+
+def group_snippets(snippets: List[Snippet], token_budget: int = PROMPT_TOKEN_BUDGET) -> List[List[int]]:
+    """Pack snippets, in order, into as few prompts as the token budget allows.
+
+    Returns:
+        list: The indexes of the snippets of each prompt. A snippet larger
+        than the budget gets a prompt of its own.
+    """
+    budget = token_budget - estimate_tokens(IMPORT_PROMPT)
+    groups, group, used = [], [], 0
+    for index, snippet in enumerate(snippets):
+        tokens = estimate_tokens(_head(snippet.code)) + 10  # With its heading
+        if group and used + tokens > budget:
+            groups.append(group)
+            group, used = [], 0
+        group.append(index)
+        used += tokens
+    if group:
+        groups.append(group)
+    return groups
+
+
+class TokenBucket:
+    """A thread-safe token bucket: ``rate`` tokens a second, up to ``capacity`` saved up."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: float) -> float:
+        """Take tokens, possibly going into debt, and return how long to wait until it is paid."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= min(tokens, self.capacity)  # A request larger than the bucket waits for a full one
+            return max(0.0, -self._tokens / self.rate)
+
+    def acquire(self, tokens: float, cancel_token: Optional[CancelToken] = None):
+        """Block until ``tokens`` are available.
+
+        Raises:
+            CancelledError: If the cancel token is cancelled while waiting.
+        """
+        cancel_token = cancel_token or CancelToken()
+        deadline = time.monotonic() + self._reserve(tokens)
+        while True:
+            cancel_token.raise_if_cancelled()
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            time.sleep(min(remaining, 0.1))
+
+
+class RateLimiter:
+    """Keeps requests under the provider's requests and tokens per minute."""
+
+    def __init__(self, requests_per_minute: int = REQUESTS_PER_MINUTE, tokens_per_minute: int = TOKENS_PER_MINUTE):
+        self.requests = TokenBucket(requests_per_minute / 60, requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute / 60, tokens_per_minute)
+
+    def acquire(self, tokens: int, cancel_token: Optional[CancelToken] = None):
+        self.requests.acquire(1, cancel_token)
+        self.tokens.acquire(tokens, cancel_token)
+
+
+class ImportPlan:
+    """Where each snippet of a batch goes, for review before anything is written.
+
+    Target paths are relative to the root.
+    """
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+        self.placements: List[Tuple[Snippet, str]] = []
+        self.unplaced: List[Snippet] = []
+
+    def targets(self) -> Dict[str, List[Snippet]]:
+        targets: Dict[str, List[Snippet]] = {}
+        for snippet, path in self.placements:
+            targets.setdefault(path, []).append(snippet)
+        return targets
+
+    def summary(self) -> str:
+        """Describe the plan in one line.
+
+        Returns:
+            str: Counts of the snippets placed, the files written and the snippets left out.
+        """
+        targets = self.targets()
+        new = sum(1 for path in targets if not os.path.exists(os.path.join(self.root, path)))
+        text = f"{len(self.placements)} snippets into {len(targets)} files ({new} new)"
+        if self.unplaced:
+            text += f", {len(self.unplaced)} not placed"
+        return text
+
+    def details(self) -> str:
+        lines = [f"{snippet.name} → {path}" for snippet, path in self.placements]
+        lines.extend(f"{snippet.name} → (not placed)" for snippet in self.unplaced)
+        return '\n'.join(lines)
+
+    def apply(self) -> List[str]:
+        """Write the snippets into their files, appending to files that exist.
+
+        Returns:
+            list: The absolute paths written.
+        """
+        written = []
+        for path, snippets in self.targets().items():
+            full_path = os.path.join(self.root, path)
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            separator = ''
+            if os.path.isfile(full_path) and os.path.getsize(full_path):
+                separator = '\n\n'
+            with open(full_path, 'a', encoding='utf-8') as file:
+                file.write(separator + '\n\n'.join(snippet.code.rstrip('\n') for snippet in snippets) + '\n')
+            written.append(full_path)
+        return written
+
+
+def _relative_target(root: str, path: str) -> Optional[str]:
+    path = path.strip().strip('`"\'')
+    if os.path.isabs(path):
+        path = os.path.relpath(path, root)
+    path = os.path.normpath(path)
+    if not path or path == os.curdir or path == os.pardir or path.startswith(os.pardir + os.sep):
+        return None
+    if path.endswith(os.sep) or os.path.isdir(os.path.join(root, path)):
+        return None  # A directory, not a file to write into
+    return path
+
+
+class BatchImporter:
+    """Places many snippets with few AI requests.
+
+    Snippets are grouped into prompts up to a token budget, and the prompts
+    run concurrently, each waiting for the rate limiter first. With a
+    placement engine, snippets whose target is clear from the tree never
+    reach the AI.
+    """
+
+    def __init__(self, client: AIClient, root: str, rate_limiter: Optional[RateLimiter] = None,
+                 context_builder: Optional[ContextBuilder] = None, placement_engine: Optional[PlacementEngine] = None,
+                 token_budget: int = PROMPT_TOKEN_BUDGET, max_workers: int = DEFAULT_AI_WORKERS):
+        self.client = client
+        self.root = os.path.abspath(root)
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.context_builder = context_builder
+        self.placement_engine = placement_engine
+        self.context = ''
+        self.token_budget = token_budget
+        self.max_workers = max_workers
+
+    def _prompt(self, snippets: List[Snippet], indexes: List[int]) -> str:
+        parts = [f"\n### {number} ({snippets[index].name})\n{_head(snippets[index].code)}"
+                 for number, index in enumerate(indexes, 1)]
+        return IMPORT_PROMPT.format(current_directory=self.root, context=self.context, snippets='\n'.join(parts))
+
+    def _place(self, snippets: List[Snippet], indexes: List[int], cancel_token: CancelToken,
+               log: Callable[[str], None]) -> Dict[int, str]:
+        prompt = self._prompt(snippets, indexes)
+        self.rate_limiter.acquire(estimate_tokens(prompt) + RESPONSE_TOKENS_PER_SNIPPET * len(indexes), cancel_token)
+        request_id = next_request_id()
+        log(f"[{request_id}] Placing {len(indexes)} snippets")
+        response = self.client.complete(prompt, request_id, system_prompt=IMPORT_SYSTEM_PROMPT, log=log)
+        placed = {}
+        for line in response.splitlines():
+            match = _ANSWER.match(line.strip())
+            if not match or not 1 <= int(match.group(1)) <= len(indexes):
+                continue
+            target = _relative_target(self.root, match.group(2))
+            if target:
+                placed[indexes[int(match.group(1)) - 1]] = target
+        return placed
+
+    def run(self, snippets: List[Snippet], cancel_token: Optional[CancelToken] = None,
+            log: Optional[Callable[[str], None]] = None,
+            progress_callback: Optional[Callable[[int, int], None]] = None) -> ImportPlan:
+        """Find the targets of all snippets and collect them into a plan.
+
+        Snippets the placement engine is confident about are placed locally;
+        the AI is asked about the rest.
+
+        Args:
+            snippets (list): The snippets to place.
+            cancel_token (CancelToken, optional): Stops waiting requests once cancelled.
+            log (callable, optional): Called with progress messages.
+            progress_callback (callable, optional): Called with ``(snippets done, total)``.
+
+        Returns:
+            ImportPlan: The placements; snippets whose request failed or whose
+            answer was unusable are listed as not placed.
+
+        Raises:
+            CancelledError: If cancelled.
+        """
+        cancel_token = cancel_token or CancelToken()
+        log = log or (lambda message: None)
+        targets: Dict[int, str] = {}
+        if self.placement_engine:
+            placement_index = self.placement_engine.index(self.root)  # Scanned once for the whole batch
+            for number, snippet in enumerate(snippets):
+                placement = self.placement_engine.place(snippet.code, self.root, placement_index)
+                if placement:
+                    targets[number] = placement.path
+            log(f"Placed {len(targets)} of {len(snippets)} snippets without AI")
+        remaining = [number for number in range(len(snippets)) if number not in targets]
+        done = len(targets)
+        if progress_callback:
+            progress_callback(done, len(snippets))
+        # One summary of the directory, repeated in every prompt, so it comes out of each prompt's budget
+        self.context = self.context_builder.build(self.root) if self.context_builder and remaining else ''
+        token_budget = self.token_budget - estimate_tokens(self.context)
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='ai-batch') as executor:
+            groups = group_snippets([snippets[number] for number in remaining], token_budget)
+            futures = {executor.submit(self._place, snippets, [remaining[i] for i in group], cancel_token, log):
+                       group for group in groups}
+            # Once cancelled, requests still waiting for the rate limiter give up
+            for future in as_completed(futures):
+                cancel_token.raise_if_cancelled()
+                try:
+                    targets.update(future.result())
+                except Exception as e:
+                    log(f"Could not place {len(futures[future])} snippets: {e}")
+                done += len(futures[future])
+                if progress_callback:
+                    progress_callback(done, len(snippets))
+        plan = ImportPlan(self.root)
+        for index, snippet in enumerate(snippets):
+            if index in targets:
+                plan.placements.append((snippet, targets[index]))
+            else:
+                plan.unplaced.append(snippet)
+        return plan
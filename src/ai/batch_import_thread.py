@@ -0,0 +1,43 @@
+# src/ai/batch_import_thread.py
+from typing import List, Optional
+from PyQt6.QtCore import QThread, pyqtSignal
+from ai.ai_client import AIClient
+from ai.batch_import import BatchImporter, RateLimiter, Snippet, load_snippets
+from ai.context_builder import ContextBuilder
+from ai.placement import PlacementEngine
+from utils.cancellation import CancelToken, CancelledError
+
+class BatchImportThread(QThread):
+    """Places a batch of snippets, read from a folder or given directly, off the GUI thread."""
+
+    progress = pyqtSignal(int, int)  # snippets done, total
+    log = pyqtSignal(str)
+    plan_ready = pyqtSignal(object)  # ImportPlan
+    error = pyqtSignal(str)
+
+    def __init__(self, client: AIClient, rate_limiter: RateLimiter, root: str,
+                 snippets: Optional[List[Snippet]] = None, folder: Optional[str] = None,
+                 context_builder: Optional[ContextBuilder] = None, placement_engine: Optional[PlacementEngine] = None,
+                 parent=None):
+        super().__init__(parent)
+        self.importer = BatchImporter(client, root, rate_limiter, context_builder, placement_engine)
+        self.snippets = snippets
+        self.folder = folder
+        self.cancel_token = CancelToken()
+
+    def cancel(self):
+        self.cancel_token.cancel()
+
+    def run(self):
+        try:
+            snippets = self.snippets if self.snippets is not None else load_snippets(self.folder)
+            if not snippets:
+                self.error.emit("No snippets to import.")
+                return
+            self.log.emit(f"Placing {len(snippets)} snippets")
+            plan = self.importer.run(snippets, self.cancel_token, self.log.emit, self.progress.emit)
+            self.plan_ready.emit(plan)
+        except CancelledError:
+            pass
+        except Exception as e:
+            self.error.emit(str(e))
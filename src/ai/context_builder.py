@@ -0,0 +1,185 @@
+# src/ai/context_builder.py
+import os
+import re
+import threading
+from collections import Counter, OrderedDict
+from typing import Dict, List, Optional, Tuple
+from ai.ai_client import estimate_tokens
+from utils.content_search import DEFAULT_EXCLUDES
+from utils.walker import ParallelWalker
+
+DEFAULT_CONTEXT_TOKENS = 800
+CONTEXT_DEPTH = 3  # deepest level summarized
+MAX_CONTEXT_ENTRIES = 20000  # entries scanned at most, for huge trees
+MAX_FILE_TYPES = 10
+MAX_SYMBOLS_PER_FILE = 12
+SYMBOL_SCAN_BYTES = 64 * 1024  # leading part of a file searched for symbols
+TREE_SHARE = 0.5  # part of the budget left after the file types that the tree may use
+MAX_CACHED_CONTEXTS = 32
+
+# Top-level definitions by file extension
+SYMBOL_PATTERNS = {
+    '.py': re.compile(r'^(?:async\s+def|def|class)\s+([A-Za-z_]\w*)', re.M),
+    '.js': re.compile(r'^(?:export\s+(?:default\s+)?)?(?:async\s+)?(?:function\*?|class|const|let)\s+([A-Za-z_$][\w$]*)', re.M),
+    '.go': re.compile(r'^(?:func|type)\s+(?:\([^)]*\)\s*)?([A-Za-z_]\w*)', re.M),
+    '.rs': re.compile(r'^(?:pub(?:\([^)]*\))?\s+)?(?:fn|struct|enum|trait|mod)\s+([A-Za-z_]\w*)', re.M),
+    '.java': re.compile(r'^(?:public\s+|abstract\s+|final\s+)*(?:class|interface|enum|record)\s+([A-Za-z_]\w*)', re.M),
+}
+SYMBOL_PATTERNS.update({'.ts': SYMBOL_PATTERNS['.js'], '.jsx': SYMBOL_PATTERNS['.js'], '.tsx': SYMBOL_PATTERNS['.js']})
+
+# (relative path, is directory, mtime_ns, size)
+_Entry = Tuple[str, bool, int, int]
+
+
+def scan_entries(root: str, max_depth: Optional[int], exclude=DEFAULT_EXCLUDES) -> List[_Entry]:
+    """Return ``(relative path, is directory, mtime_ns, size)`` of the entries below a directory.
+
+    At most MAX_CONTEXT_ENTRIES are scanned. Entries are sorted with the
+    children of each directory right after it.
+    """
+    entries = []
+    walker = ParallelWalker(root, max_depth=max_depth, exclude=exclude)
+    for _, dirs, files in walker.walk():
+        for is_dir, group in ((True, dirs), (False, files)):
+            for entry in group:
+                try:
+                    st = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                entries.append((os.path.relpath(entry.path, root), is_dir, st.st_mtime_ns, st.st_size))
+        if len(entries) >= MAX_CONTEXT_ENTRIES:
+            walker.cancel_token.cancel()
+    entries.sort(key=lambda entry: entry[0].split(os.sep))
+    return entries
+
+
+class ContextBuilder:
+    """Summarizes a directory for AI prompts within a token budget.
+
+    The summary lists the file types, a tree pruned breadth first (shallow
+    entries before deep ones) and the top-level symbols of source files.
+    Summaries are cached per directory and budget, and are rebuilt only
+    when the modification time or size of a summarized entry changes.
+    Symbols are also cached per file, so a rebuild re-reads changed files
+    only.
+    """
+
+    def __init__(self, token_budget: int = DEFAULT_CONTEXT_TOKENS, max_depth: int = CONTEXT_DEPTH,
+                 exclude=DEFAULT_EXCLUDES, max_cached: int = MAX_CACHED_CONTEXTS):
+        self.token_budget = token_budget
+        self.max_depth = max_depth
+        self.exclude = exclude
+        self.max_cached = max_cached
+        self._contexts: OrderedDict = OrderedDict()  # (root, budget) -> (signature, text)
+        self._symbols: Dict[str, Tuple[int, int, List[str]]] = {}  # path -> (mtime_ns, size, symbols)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def build(self, root: str, token_budget: Optional[int] = None) -> str:
+        """Return the summary of a directory.
+
+        Args:
+            root (str): The directory to summarize.
+            token_budget (int, optional): Approximate size limit of the summary in
+                tokens; the builder's ``token_budget`` by default.
+
+        Returns:
+            str: The summary, '' for an empty or unreadable directory.
+        """
+        root = os.path.abspath(root)
+        token_budget = token_budget or self.token_budget
+        entries = scan_entries(root, self.max_depth, self.exclude)
+        signature = hash(tuple(entries))
+        key = (root, token_budget)
+        with self._lock:
+            cached = self._contexts.get(key)
+            if cached and cached[0] == signature:
+                self._contexts.move_to_end(key)
+                self.hits += 1
+                return cached[1]
+            self.misses += 1
+        text = self._render(root, entries, token_budget)
+        with self._lock:
+            self._contexts[key] = (signature, text)
+            self._contexts.move_to_end(key)
+            while len(self._contexts) > self.max_cached:
+                self._contexts.popitem(last=False)
+        return text
+
+    def symbols(self, path: str, mtime_ns: int, size: int) -> List[str]:
+        """Return the top-level symbols defined in a source file, [] for other files."""
+        pattern = SYMBOL_PATTERNS.get(os.path.splitext(path)[1].lower())
+        if pattern is None:
+            return []
+        with self._lock:
+            cached = self._symbols.get(path)
+        if cached and cached[:2] == (mtime_ns, size):
+            return cached[2]
+        try:
+            with open(path, 'r', encoding='utf-8', errors='replace') as file:
+                names = pattern.findall(file.read(SYMBOL_SCAN_BYTES))
+        except OSError:
+            names = []
+        names = list(dict.fromkeys(name for name in names if not name.startswith('_')))
+        with self._lock:
+            self._symbols[path] = (mtime_ns, size, names)
+        return names
+
+    def _render(self, root: str, entries: List[_Entry], token_budget: int) -> str:
+        if not entries:
+            return ''
+        types = Counter(os.path.splitext(path)[1].lower() or os.path.basename(path)
+                        for path, is_dir, _, _ in entries if not is_dir)
+        header = "File types: " + ', '.join(f"{kind} {count}" for kind, count in types.most_common(MAX_FILE_TYPES))
+        remaining = token_budget - estimate_tokens(header)
+
+        # Shallow entries first, so a deep tree still shows its overall shape
+        by_depth = sorted(entries, key=lambda entry: (entry[0].count(os.sep), entry[0]))
+        tree_budget = int(remaining * TREE_SHARE)
+        shown = set()
+        for path, is_dir, _, _ in by_depth:
+            cost = estimate_tokens(path) + 1
+            if cost > tree_budget:
+                break
+            tree_budget -= cost
+            shown.add(path)
+        hidden: Counter = Counter(os.path.dirname(path) for path, _, _, _ in entries if path not in shown)
+        tree = []
+        for path, is_dir, _, _ in entries:
+            if path not in shown:
+                continue
+            line = '  ' * path.count(os.sep) + os.path.basename(path) + ('/' if is_dir else '')
+            if is_dir and hidden[path]:
+                line += f" (+{hidden[path]} more)"
+            tree.append(line)
+        if hidden['']:
+            tree.append(f"(+{hidden['']} more)")
+        remaining -= sum(estimate_tokens(line) for line in tree) + 2
+
+        symbols = []
+        for path, is_dir, mtime_ns, size in by_depth:
+            if is_dir or os.path.splitext(path)[1].lower() not in SYMBOL_PATTERNS:
+                continue
+            names = self.symbols(os.path.join(root, path), mtime_ns, size)
+            if not names:
+                continue
+            line = f"{path}: {', '.join(names[:MAX_SYMBOLS_PER_FILE])}"
+            cost = estimate_tokens(line)
+            if cost > remaining:
+                break
+            remaining -= cost
+            symbols.append(line)
+
+        sections = [header, "Tree:\n" + '\n'.join(tree)]
+        if symbols:
+            sections.append("Symbols:\n" + '\n'.join(symbols))
+        return '\n'.join(sections)
+
+    def stats(self) -> str:
+        return f"context cache: {self.hits} hits, {self.misses} misses"
+
+    def clear(self):
+        with self._lock:
+            self._contexts.clear()
+            self._symbols.clear()
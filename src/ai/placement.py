@@ -0,0 +1,177 @@
+# src/ai/placement.py
+import os
+import re
+import threading
+from collections import OrderedDict, namedtuple
+from typing import Dict, List, Optional, Tuple
+from ai.context_builder import SYMBOL_PATTERNS, ContextBuilder, scan_entries
+
+Placement = namedtuple('Placement', ['path', 'confidence', 'reason'])  # path relative to the root
+
+CONFIDENCE_THRESHOLD = 0.75  # below this, ask the AI
+PLACEMENT_DEPTH = 8  # deepest level indexed
+MAX_INDEXED_FILES = 5000  # source files whose symbols are read, shallowest first
+MAX_CACHED_INDEXES = 8
+TEST_DIRECTORIES = ('tests', 'test')
+
+# Cues for the language of a snippet, most specific first
+_LANGUAGES = [
+    ('.go', re.compile(r'^package\s+\w+|^func\s', re.M)),
+    ('.rs', re.compile(r'^\s*(?:pub\s+)?(?:fn|impl|struct|enum|trait)\s+\w', re.M)),
+    ('.java', re.compile(r'^\s*(?:public|private|protected)\s+(?:static\s+)?(?:final\s+)?(?:class|interface|enum|void)\s', re.M)),
+    ('.py', re.compile(r'^\s*(?:async\s+def|def|class)\s+\w+.*:\s*$|^(?:import|from)\s+[\w.]+', re.M)),
+    ('.ts', re.compile(r':\s*(?:string|number|boolean)\b|^\s*(?:export\s+)?(?:interface|type)\s+\w+', re.M)),
+    ('.js', re.compile(r'^\s*(?:export\s+)?(?:async\s+)?(?:function|class|const|let)\s+\w+|=>', re.M)),
+]
+_TEST = re.compile(r'^\s*(?:async\s+)?def\s+test_?\w*|^\s*class\s+Test\w*|^\s*(?:import|from)\s+(?:pytest|unittest)\b|'
+                   r'^\s*(?:describe|it|test)\s*\(|@Test\b|#\[test\]|^func\s+Test\w+', re.M)
+_WORD_BOUNDARY = re.compile(r'(?<=[a-z0-9])(?=[A-Z])|[^A-Za-z0-9]+')
+
+
+def snippet_language(code: str) -> Optional[str]:
+    """Guess the file extension of a snippet from its syntax, None if unclear."""
+    for extension, pattern in _LANGUAGES:
+        if pattern.search(code):
+            return extension
+    return None
+
+
+def _family(extension: str) -> str:
+    return '.js' if extension in ('.js', '.jsx', '.ts', '.tsx') else extension
+
+
+def _words(name: str) -> List[str]:
+    """'HttpClientPool' and 'http_client_pool' both give ['http', 'client', 'pool']."""
+    return [word.lower() for word in _WORD_BOUNDARY.split(name) if word]
+
+
+class _Index:
+    def __init__(self):
+        self.stems: Dict[str, List[str]] = {}  # stem words joined by '_' -> source files
+        self.symbols: Dict[str, List[str]] = {}  # defined name -> source files
+        self.test_directories: List[str] = []  # shallowest first
+        self.files = set()
+
+
+class PlacementEngine:
+    """Places code snippets in files without the AI, when the tree makes the answer clear.
+
+    The engine indexes the file names and top-level symbols of the source
+    files under a directory and scores candidate targets for a snippet:
+
+    - a file that already defines one of the snippet's symbols;
+    - a module named after the snippet's class or function;
+    - for tests, the test module of the code under test, or a new one in
+      the tests directory;
+    - a module sharing words with the snippet's symbols, scored lower.
+
+    A runner-up for a different file lowers the confidence, so only clear
+    winners pass CONFIDENCE_THRESHOLD. Indexes are cached per directory and
+    rebuilt when an entry's mtime or size changes; symbols come from the
+    ContextBuilder's per-file cache.
+    """
+
+    def __init__(self, context_builder: Optional[ContextBuilder] = None, threshold: float = CONFIDENCE_THRESHOLD):
+        self.context_builder = context_builder or ContextBuilder()
+        self.threshold = threshold
+        self._indexes: OrderedDict = OrderedDict()  # root -> (signature, _Index)
+        self._lock = threading.Lock()
+
+    def index(self, root: str) -> _Index:
+        root = os.path.abspath(root)
+        entries = scan_entries(root, PLACEMENT_DEPTH)
+        signature = hash(tuple(entries))
+        with self._lock:
+            cached = self._indexes.get(root)
+            if cached and cached[0] == signature:
+                self._indexes.move_to_end(root)
+                return cached[1]
+        index = _Index()
+        source_files = []  # (path, mtime_ns, size)
+        for path, is_dir, mtime_ns, size in entries:
+            if is_dir:
+                if os.path.basename(path).lower() in TEST_DIRECTORIES:
+                    index.test_directories.append(path)
+            elif os.path.splitext(path)[1].lower() in SYMBOL_PATTERNS:
+                source_files.append((path, mtime_ns, size))
+        index.test_directories.sort(key=lambda path: path.count(os.sep))
+        source_files.sort(key=lambda entry: entry[0].count(os.sep))
+        for path, mtime_ns, size in source_files[:MAX_INDEXED_FILES]:
+            index.files.add(path)
+            stem = '_'.join(_words(os.path.splitext(os.path.basename(path))[0]))
+            index.stems.setdefault(stem, []).append(path)
+            for name in self.context_builder.symbols(os.path.join(root, path), mtime_ns, size):
+                index.symbols.setdefault(name, []).append(path)
+        with self._lock:
+            self._indexes[root] = (signature, index)
+            self._indexes.move_to_end(root)
+            while len(self._indexes) > MAX_CACHED_INDEXES:
+                self._indexes.popitem(last=False)
+        return index
+
+    def candidates(self, code: str, root: str, index: Optional[_Index] = None) -> List[Placement]:
+        """Score the possible targets of a snippet, best first, one entry per path.
+
+        Pass the ``index`` of the root when placing many snippets, to scan the tree once.
+        """
+        index = index or self.index(root)
+        language = snippet_language(code)
+        pattern = SYMBOL_PATTERNS.get(language or '.py')
+        names = list(dict.fromkeys(pattern.findall(code)))
+        is_test = bool(_TEST.search(code))
+        scores: Dict[str, Tuple[float, str]] = {}
+
+        def offer(path, score, reason):
+            if language and _family(os.path.splitext(path)[1].lower()) != _family(language):
+                score *= 0.5  # A file in another language is an unlikely home
+            if score > scores.get(path, (0.0, ''))[0]:
+                scores[path] = (score, reason)
+
+        for name in names:
+            for path in index.symbols.get(name, ()):
+                offer(path, 0.95, f"{name} is defined there")
+        if is_test:
+            # The code under test: test_parse_line and TestParser point at parse_line and Parser
+            for subject in filter(None, (re.sub(r'^(?:test_?|Test)', '', name) for name in names)):
+                # Tests are named after the module defining the subject, if it is known
+                stems = ['_'.join(_words(os.path.splitext(os.path.basename(path))[0]))
+                         for path in index.symbols.get(subject, ())] or ['_'.join(_words(subject))]
+                for stem in dict.fromkeys(stems):
+                    existing = index.stems.get(f"test_{stem}", []) + index.stems.get(f"{stem}_test", [])
+                    for path in existing:
+                        offer(path, 0.9, f"test module of {subject}")
+                    if not existing and index.test_directories and language:
+                        path = os.path.join(index.test_directories[0], f"test_{stem}{language}")
+                        offer(path, 0.8, f"new test module for {subject}")
+        else:
+            for subject in names:
+                words = _words(subject)
+                stem = '_'.join(words)
+                for path in index.stems.get(stem, ()):
+                    offer(path, 0.85, f"module named after {subject}")
+                for other, paths in index.stems.items():
+                    shared = set(words) & set(other.split('_'))
+                    if shared and other != stem:
+                        overlap = len(shared) / len(set(words) | set(other.split('_')))
+                        for path in paths:
+                            offer(path, 0.7 * overlap, f"name shares '{'_'.join(sorted(shared))}' with {subject}")
+        ranked = sorted(scores.items(), key=lambda item: -item[1][0])
+        return [Placement(path, score, reason) for path, (score, reason) in ranked]
+
+    def place(self, code: str, root: str, index: Optional[_Index] = None) -> Optional[Placement]:
+        """Return the placement of a snippet if it is confident enough to skip the AI, else None.
+
+        The confidence is the best score less half the square of the
+        runner-up's, so a strong runner-up makes the snippet ambiguous while
+        weak name overlaps barely count. A path whose directory does not
+        exist is never chosen.
+        """
+        candidates = [candidate for candidate in self.candidates(code, root, index)
+                      if os.path.isdir(os.path.join(root, os.path.dirname(candidate.path)))]
+        if not candidates:
+            return None
+        best = candidates[0]
+        confidence = best.confidence - (candidates[1].confidence ** 2 / 2 if len(candidates) > 1 else 0.0)
+        if confidence < self.threshold:
+            return None
+        return best._replace(confidence=confidence)
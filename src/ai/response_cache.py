@@ -0,0 +1,101 @@
+# src/ai/response_cache.py
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+from utils.utils import CACHE_DIR
+
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+DEFAULT_MAX_AGE = 30 * 24 * 3600  # seconds
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed);
+"""
+
+
+def request_key(model: str, system_prompt: str, prompt: str, temperature: float) -> str:
+    """Content address of a completion request: everything that determines the response."""
+    request = json.dumps([model, system_prompt, prompt, temperature], ensure_ascii=False)
+    return hashlib.sha256(request.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """Persistent AI responses keyed by their request, evicted least recently used first.
+
+    Entries older than ``max_age`` seconds are dropped, and once the stored
+    responses exceed ``max_bytes`` the least recently read ones go. Counters
+    record the hit rate.
+    """
+
+    def __init__(self, cache_path: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES,
+                 max_age: float = DEFAULT_MAX_AGE):
+        if cache_path is None:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            cache_path = os.path.join(CACHE_DIR, 'ai_responses.sqlite')
+        self.cache_path = cache_path
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        # Shared by the AI worker threads, serialized by the lock.
+        self.connection = sqlite3.connect(cache_path, check_same_thread=False)
+        self.connection.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> str:
+        return f"response cache: {self.hits} hits, {self.misses} misses ({self.hit_rate:.0%})"
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for ``key`` and mark it recently used, or None."""
+        now = time.time()
+        with self._lock:
+            row = self.connection.execute("SELECT response, created FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None or now - row[1] > self.max_age:
+                self.misses += 1
+                return None
+            self.connection.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self.connection.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, response: str):
+        """Store a response, then evict expired entries and trim the cache to ``max_bytes``."""
+        now = time.time()
+        size = len(response.encode('utf-8'))
+        with self._lock:
+            self.connection.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                                    (key, response, size, now, now))
+            self.connection.execute("DELETE FROM responses WHERE created < ?", (now - self.max_age,))
+            total = self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total > self.max_bytes:
+                excess = total - self.max_bytes
+                for old_key, old_size in self.connection.execute(
+                        "SELECT key, size FROM responses ORDER BY accessed").fetchall():
+                    if excess <= 0:
+                        break
+                    self.connection.execute("DELETE FROM responses WHERE key = ?", (old_key,))
+                    excess -= old_size
+            self.connection.commit()
+
+    def clear(self):
+        with self._lock:
+            self.connection.execute("DELETE FROM responses")
+            self.connection.commit()
+
+    def close(self):
+        self.connection.close()
@@ -1,13 +1,31 @@
 # src/core/main_operations.py
 import os
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QSplitter, QPushButton, QLineEdit, QComboBox, QHBoxLayout, QMessageBox
 from ui.tree_view_widget import TreeViewWidget
 from ui.main_content_widget import MainContentWidget
+from utils.content_search import LITERAL, IGNORE_CASE, REGEX
+from utils.content_index import INDEXED, ContentIndex
+from utils.fuzzy_match import FUZZY
+from utils.filename_index import FilenameIndex
+from utils.fs_watcher import FileSystemWatcher, update_content_index, update_disk_usage, update_filename_index
+from utils.job_queue import JobQueue
+
+SEARCH_MODES = {
+    "Names": None,
+    "Names (fuzzy)": FUZZY,
+    "Contents": LITERAL,
+    "Contents (ignore case)": IGNORE_CASE,
+    "Contents (regex)": REGEX,
+    "Contents (index)": INDEXED,
+}
+SEARCH_DEBOUNCE_MS = 200
+DISK_USAGE_REFRESH_MS = 2000  # Least time between disk usage rescans triggered by the watcher
 
 class MainOperations(QWidget):
     def __init__(self, parent=None, console_tab=None):
         super().__init__(parent)
+        self.console_tab = console_tab
         self.layout = QVBoxLayout(self)
         self.splitter = QSplitter(Qt.Orientation.Horizontal, self)
 
@@ -31,13 +49,19 @@ class MainOperations(QWidget):
         self.search_bar = QLineEdit(self)
         self.search_bar.setPlaceholderText("Search...")
         self.nav_layout.addWidget(self.search_bar)
+
+        # Search mode selector
+        self.search_mode_selector = QComboBox()
+        self.search_mode_selector.addItems(list(SEARCH_MODES))
+        self.nav_layout.addWidget(self.search_mode_selector)
         
         # Add navigation layout to the main layout
         self.layout.addLayout(self.nav_layout)
 
-        # Initialize Tree View and Main Content
-        self.tree_view = TreeViewWidget(self)
-        self.main_content = MainContentWidget(self, console_tab)  # Pass console_tab to MainContentWidget
+        # Initialize Tree View and Main Content, sharing one queue for file operations
+        self.job_queue = JobQueue(parent=self)
+        self.tree_view = TreeViewWidget(self, job_queue=self.job_queue)
+        self.main_content = MainContentWidget(self, console_tab, self.job_queue)  # Pass console_tab to MainContentWidget
 
         # Add widgets to splitter
         self.splitter.addWidget(self.tree_view)
@@ -55,11 +79,33 @@ class MainOperations(QWidget):
         self.tree_view.dir_changed.connect(self.clear_search_bar)
         self.tree_view.dir_changed.connect(self.on_directory_changed)  # Updated to use on_directory_changed
         self.tree_view.file_selected.connect(self.main_content.set_selected_file_path)
+        self.tree_view.find_duplicates_requested.connect(self.main_content.find_duplicates)
+        self.tree_view.compare_requested.connect(self.main_content.compare_directories)
+        self.tree_view.export_structure_requested.connect(self.main_content.export_structure)
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.on_search_timeout)
         self.search_bar.textChanged.connect(self.on_search_text_changed)
+        self.search_bar.returnPressed.connect(self.on_search_submitted)
+        self.search_mode_selector.currentTextChanged.connect(self.on_search_mode_changed)
         self.back_button.clicked.connect(self.go_back)
         self.drive_selector.currentIndexChanged.connect(self.on_drive_selected)
         self.dir_input.returnPressed.connect(self.on_enter_directory)
 
+        # Keep search indexes and caches in step with the disk
+        self.fs_watcher = FileSystemWatcher(parent=self)
+        self.fs_watcher.add_listener(update_filename_index)
+        self.fs_watcher.add_listener(update_content_index)
+        self.fs_watcher.add_listener(update_disk_usage)
+        self.fs_watcher.changes_applied.connect(self.on_filesystem_changes)
+        self.disk_usage_timer = QTimer(self)
+        self.disk_usage_timer.setSingleShot(True)
+        self.disk_usage_timer.setInterval(DISK_USAGE_REFRESH_MS)
+        self.disk_usage_timer.timeout.connect(self.on_disk_usage_timeout)
+        self.tree_view.dir_changed.connect(self.update_watched_root)
+        self.tree_view.search_finished.connect(self.update_watched_root)
+
         # Populate drives
         self.populate_drives()
 
@@ -88,8 +134,28 @@ class MainOperations(QWidget):
             QMessageBox.warning(self, "Invalid Path", f"Path '{path}' does not exist.")
 
     def on_search_text_changed(self, text):
-        self.tree_view.model.setNameFilters([f"*{text}*"])
-        self.tree_view.model.setNameFilterDisables(False)
+        # Restarting the timer on each keystroke means searching only runs
+        # once typing pauses.
+        self.search_timer.start()
+
+    def on_search_timeout(self):
+        # Matches are listed in the results view only; filtering the tree by
+        # name too would make QFileSystemModel re-filter every loaded node.
+        text = self.search_bar.text()
+        # Content searches read every file, so they only run on Enter.
+        if self.search_content_mode() in (None, FUZZY) or not text:
+            self.tree_view.start_search(self.tree_view.current_directory, text, self.search_content_mode())
+
+    def on_search_submitted(self):
+        self.search_timer.stop()
+        self.tree_view.start_search(self.tree_view.current_directory, self.search_bar.text(),
+                                    self.search_content_mode())
+
+    def on_search_mode_changed(self, mode):
+        self.on_search_submitted()
+
+    def search_content_mode(self):
+        return SEARCH_MODES[self.search_mode_selector.currentText()]
 
     def update_directory_input(self, path):
         self.dir_input.setText(path)
@@ -100,3 +166,28 @@ class MainOperations(QWidget):
     def on_directory_changed(self, path):
         self.main_content.current_directory = path  # Directly update current_directory attribute
         self.main_content.ai_assist.set_current_directory(path)  # Update the current directory in AI Assist
+
+    def update_watched_root(self, path):
+        # Watching only pays off once there is an index to maintain; a
+        # recursive watch on an arbitrary drive root is not free.
+        if path == self.tree_view.current_directory and (FilenameIndex.exists(path) or ContentIndex.exists(path)):
+            self.fs_watcher.watch(path)
+        elif self.fs_watcher.root_path != os.path.abspath(self.tree_view.current_directory):
+            self.fs_watcher.stop()
+
+    def on_filesystem_changes(self, changes):
+        for directory in changes.directories:
+            self.tree_view.search_cache.invalidate(directory)
+        if changes.root_path == os.path.abspath(self.tree_view.current_directory) and not self.disk_usage_timer.isActive():
+            # Not restarted by later batches, so a long burst of changes still rescans every interval
+            self.disk_usage_timer.start()
+        if self.console_tab:
+            self.console_tab.log_message(
+                f"Applied {len(changes)} filesystem changes under {changes.root_path} "
+                f"(lag {changes.lag:.2f}s, took {self.fs_watcher.last_apply_duration:.2f}s, "
+                f"queue depth {self.fs_watcher.queue_depth})")
+
+    def on_disk_usage_timeout(self):
+        # Changing directory rescans anyway, so a refresh still pending for the previous root is dropped
+        if self.fs_watcher.root_path == os.path.abspath(self.tree_view.current_directory):
+            self.tree_view.refresh_disk_usage()
@@ -0,0 +1,120 @@
+# src/ui/archive_widget.py
+
+import os
+import time
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QTreeWidget, QPushButton, QLabel, QProgressBar
+from PyQt6.QtCore import Qt
+from ui.duplicates_widget import GroupItem
+from utils.archive_thread import ArchiveListThread
+from utils.utils import format_size
+
+class ArchiveWidget(QWidget):
+    """Browses the members of an archive as a tree without extracting it."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.layout = QVBoxLayout(self)
+
+        self.header_layout = QHBoxLayout()
+        self.summary_label = QLabel("Double-click an archive to browse its contents.", self)
+        self.header_layout.addWidget(self.summary_label)
+        self.header_layout.addStretch()
+        self.cancel_button = QPushButton("Cancel", self)
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self.cancel)
+        self.header_layout.addWidget(self.cancel_button)
+        self.layout.addLayout(self.header_layout)
+
+        self.member_list = QTreeWidget(self)
+        self.member_list.setHeaderLabels(["Name", "Size", "Packed", "Modified"])
+        self.member_list.setColumnWidth(0, 400)
+        self.layout.addWidget(self.member_list)
+
+        self.progress_bar = QProgressBar(self)
+        self.progress_bar.setRange(0, 0)
+        self.progress_bar.setVisible(False)
+        self.layout.addWidget(self.progress_bar)
+        self.setLayout(self.layout)
+
+        self.list_thread = None
+        self.items = {}  # member path -> item, to hang children under their directories
+        self.total_size = 0
+
+    def start(self, archive_path):
+        self.cancel()
+        self.archive_path = archive_path
+        self.member_list.clear()
+        self.member_list.setSortingEnabled(False)
+        self.items = {}
+        self.total_size = 0
+        self.summary_label.setText(f"Reading {archive_path}...")
+        self.progress_bar.setVisible(True)
+        self.cancel_button.setEnabled(True)
+        self.list_thread = ArchiveListThread(archive_path, parent=self)
+        self.list_thread.members_found.connect(self.on_members_found)
+        self.list_thread.listing_complete.connect(self.on_listing_complete)
+        self.list_thread.error.connect(self.on_listing_error)
+        self.list_thread.finished.connect(self.on_listing_finished)
+        self.list_thread.finished.connect(self.list_thread.deleteLater)
+        self.list_thread.start()
+
+    def cancel(self):
+        if self.list_thread and self.list_thread.isRunning():
+            self.list_thread.members_found.disconnect(self.on_members_found)
+            self.list_thread.listing_complete.disconnect(self.on_listing_complete)
+            self.list_thread.error.disconnect(self.on_listing_error)
+            self.list_thread.cancel()
+            self.summary_label.setText(f"Cancelled. {len(self.items)} entries read.")
+        self.list_thread = None
+        self.progress_bar.setVisible(False)
+        self.cancel_button.setEnabled(False)
+
+    def _item(self, path):
+        """The item for ``path``, creating it and its parent directories if the archive did not list them."""
+        item = self.items.get(path)
+        if item is None:
+            parent_path, _, name = path.rpartition('/')
+            item = GroupItem([name])
+            if parent_path:
+                self._item(parent_path).addChild(item)
+            else:
+                self.member_list.addTopLevelItem(item)
+            self.items[path] = item
+        return item
+
+    def on_members_found(self, members):
+        if self.sender() is not self.list_thread:
+            return
+        self.member_list.setUpdatesEnabled(False)
+        for member in members:
+            item = self._item(member.name.strip('/'))
+            if member.is_dir:
+                continue
+            item.setText(1, format_size(member.size))
+            item.setData(1, Qt.ItemDataRole.UserRole, member.size)
+            if member.compressed_size is not None:
+                item.setText(2, format_size(member.compressed_size))
+                item.setData(2, Qt.ItemDataRole.UserRole, member.compressed_size)
+            item.setText(3, time.strftime('%Y-%m-%d %H:%M', time.localtime(member.mtime)))
+            self.total_size += member.size
+        self.member_list.setUpdatesEnabled(True)
+        self.summary_label.setText(f"Reading {self.archive_path}... {len(self.items)} entries")
+
+    def on_listing_complete(self, count):
+        if self.sender() is not self.list_thread:
+            return
+        self.member_list.setSortingEnabled(True)
+        self.member_list.sortByColumn(0, Qt.SortOrder.AscendingOrder)
+        self.summary_label.setText(f"{os.path.basename(self.archive_path)}: {count} entries, "
+                                   f"{format_size(self.total_size)} uncompressed, "
+                                   f"{format_size(os.path.getsize(self.archive_path))} on disk")
+
+    def on_listing_error(self, message):
+        if self.sender() is self.list_thread:
+            self.summary_label.setText(f"Could not read {self.archive_path}: {message}")
+
+    def on_listing_finished(self):
+        if self.sender() is self.list_thread:
+            self.list_thread = None
+            self.progress_bar.setVisible(False)
+            self.cancel_button.setEnabled(False)
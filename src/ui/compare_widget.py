@@ -0,0 +1,112 @@
+# src/ui/compare_widget.py
+
+import os
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QTreeWidget, QTreeWidgetItem, QPushButton, QLabel, QProgressBar, QMessageBox
+from PyQt6.QtCore import Qt, pyqtSignal
+from utils.compare_thread import CompareThread
+from utils.job_queue import MirrorJob, DONE
+
+MAX_LISTED = 5000  # entries shown per group; the counts stay exact
+
+class CompareWidget(QWidget):
+    """Shows the differences between two directories and mirrors the first onto the second."""
+
+    file_double_clicked = pyqtSignal(str)
+
+    def __init__(self, job_queue, parent=None):
+        super().__init__(parent)
+        self.job_queue = job_queue
+        self.layout = QVBoxLayout(self)
+
+        self.header_layout = QHBoxLayout()
+        self.summary_label = QLabel("Select two directories and choose \"Compare Directories\".", self)
+        self.header_layout.addWidget(self.summary_label)
+        self.header_layout.addStretch()
+        self.mirror_button = QPushButton("Mirror A → B", self)
+        self.mirror_button.setEnabled(False)
+        self.mirror_button.clicked.connect(self.mirror)
+        self.header_layout.addWidget(self.mirror_button)
+        self.layout.addLayout(self.header_layout)
+
+        self.diff_list = QTreeWidget(self)
+        self.diff_list.setHeaderLabels(["Path"])
+        self.diff_list.itemDoubleClicked.connect(self.on_item_double_clicked)
+        self.layout.addWidget(self.diff_list)
+
+        self.progress_bar = QProgressBar(self)
+        self.progress_bar.setRange(0, 0)
+        self.progress_bar.setVisible(False)
+        self.layout.addWidget(self.progress_bar)
+        self.setLayout(self.layout)
+
+        self.compare_thread = None
+        self.diff = None
+        self.mirror_job_id = None
+        self.job_queue.job_finished.connect(self.on_job_finished)
+
+    def start(self, source, target):
+        if self.compare_thread and self.compare_thread.isRunning():
+            self.compare_thread.compare_complete.disconnect(self.on_compare_complete)
+            self.compare_thread.error.disconnect(self.on_compare_error)
+            self.compare_thread.cancel()
+        self.diff = None
+        self.diff_list.clear()
+        self.mirror_button.setEnabled(False)
+        self.summary_label.setText(f"Comparing {source} with {target}...")
+        self.progress_bar.setVisible(True)
+        self.compare_thread = CompareThread(source, target, parent=self)
+        self.compare_thread.compare_complete.connect(self.on_compare_complete)
+        self.compare_thread.error.connect(self.on_compare_error)
+        self.compare_thread.finished.connect(self.compare_thread.deleteLater)
+        self.compare_thread.start()
+
+    def on_compare_complete(self, diff):
+        if self.sender() is not self.compare_thread:
+            return
+        self.compare_thread = None
+        self.progress_bar.setVisible(False)
+        self.diff = diff
+        self.summary_label.setText(
+            f"A: {diff.source}  B: {diff.target} — {len(diff.only_in_a)} only in A, {len(diff.only_in_b)} only in B, "
+            f"{len(diff.changed)} changed, {diff.unchanged} unchanged ({diff.hashed} compared by content)")
+        self.diff_list.setUpdatesEnabled(False)
+        for title, paths, root in (("Only in A", diff.only_in_a, diff.source), ("Only in B", diff.only_in_b, diff.target),
+                                   ("Changed", diff.changed, diff.source)):
+            group = QTreeWidgetItem([f"{title} ({len(paths)})"])
+            for path in paths[:MAX_LISTED]:
+                item = QTreeWidgetItem([path])
+                item.setData(0, Qt.ItemDataRole.UserRole, os.path.join(root, path.replace('/', os.sep)))
+                group.addChild(item)
+            self.diff_list.addTopLevelItem(group)
+            group.setExpanded(len(paths) <= 100)
+        self.diff_list.setUpdatesEnabled(True)
+        self.mirror_button.setEnabled(bool(diff) and self.mirror_job_id is None)
+
+    def on_compare_error(self, message):
+        if self.sender() is not self.compare_thread:
+            return
+        self.compare_thread = None
+        self.progress_bar.setVisible(False)
+        self.summary_label.setText(f"Could not compare: {message}")
+
+    def mirror(self):
+        diff = self.diff
+        reply = QMessageBox.question(self, "Mirror", f"Copy {len(diff.only_in_a) + len(diff.changed)} entries to {diff.target} "
+                                     f"and delete {len(diff.only_in_b)} entries from it?",
+                                     QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No, QMessageBox.StandardButton.No)
+        if reply == QMessageBox.StandardButton.Yes:
+            self.mirror_button.setEnabled(False)
+            self.mirror_job_id = self.job_queue.submit(MirrorJob(diff))
+
+    def on_job_finished(self, job_id, state, error):
+        if job_id != self.mirror_job_id:
+            return
+        self.mirror_job_id = None
+        if state != DONE and error:
+            QMessageBox.critical(self, "Error", f"Could not mirror {self.diff.source}. Error: {error}")
+        self.start(self.diff.source, self.diff.target)  # Show what is left
+
+    def on_item_double_clicked(self, item, column):
+        path = item.data(0, Qt.ItemDataRole.UserRole)
+        if path and os.path.isfile(path):
+            self.file_double_clicked.emit(path)
@@ -0,0 +1,125 @@
+# src/ui/duplicates_widget.py
+
+import os
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QTreeWidget, QTreeWidgetItem, QPushButton, QLabel, QProgressBar
+from PyQt6.QtCore import Qt, pyqtSignal
+from utils.duplicate_finder import reclaimable_bytes
+from utils.duplicate_thread import DuplicateSearchThread
+from utils.utils import format_size
+
+class GroupItem(QTreeWidgetItem):
+    """Sorts the size columns by byte count rather than by their formatted text."""
+
+    def __lt__(self, other):
+        column = self.treeWidget().sortColumn()
+        key, other_key = self.data(column, Qt.ItemDataRole.UserRole), other.data(column, Qt.ItemDataRole.UserRole)
+        if column and key is not None and other_key is not None:
+            return key < other_key
+        return super().__lt__(other)
+
+class DuplicatesWidget(QWidget):
+    """Streams the duplicate groups below a directory into a tree, most reclaimable bytes first."""
+
+    file_double_clicked = pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.layout = QVBoxLayout(self)
+
+        self.header_layout = QHBoxLayout()
+        self.summary_label = QLabel("Right-click a directory and choose \"Find Duplicates\".", self)
+        self.header_layout.addWidget(self.summary_label)
+        self.header_layout.addStretch()
+        self.cancel_button = QPushButton("Cancel", self)
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self.cancel)
+        self.header_layout.addWidget(self.cancel_button)
+        self.layout.addLayout(self.header_layout)
+
+        self.group_list = QTreeWidget(self)
+        self.group_list.setHeaderLabels(["Files", "Size", "Reclaimable"])
+        self.group_list.setColumnWidth(0, 500)
+        self.group_list.setSortingEnabled(True)
+        self.group_list.sortByColumn(2, Qt.SortOrder.DescendingOrder)
+        self.group_list.itemDoubleClicked.connect(self.on_item_double_clicked)
+        self.layout.addWidget(self.group_list)
+
+        self.progress_bar = QProgressBar(self)
+        self.progress_bar.setRange(0, 0)
+        self.progress_bar.setVisible(False)
+        self.layout.addWidget(self.progress_bar)
+        self.setLayout(self.layout)
+
+        self.search_thread = None
+        self.group_count = 0
+        self.reclaimable = 0
+        self.root_path = None
+
+    def start(self, root_path):
+        self.cancel()
+        self.root_path = root_path
+        self.group_list.clear()
+        self.group_count = 0
+        self.reclaimable = 0
+        self.summary_label.setText(f"Searching {root_path}...")
+        self.progress_bar.setVisible(True)
+        self.cancel_button.setEnabled(True)
+        self.search_thread = DuplicateSearchThread(root_path, parent=self)
+        self.search_thread.groups_found.connect(self.on_groups_found)
+        self.search_thread.search_complete.connect(self.on_search_complete)
+        self.search_thread.finished.connect(self.on_search_finished)
+        self.search_thread.finished.connect(self.search_thread.deleteLater)
+        self.search_thread.start()
+
+    def cancel(self):
+        if self.search_thread and self.search_thread.isRunning():
+            self.search_thread.groups_found.disconnect(self.on_groups_found)
+            self.search_thread.search_complete.disconnect(self.on_search_complete)
+            self.search_thread.cancel()
+            self.summary_label.setText(f"Cancelled. {self._summary()}")
+        self.search_thread = None
+        self.progress_bar.setVisible(False)
+        self.cancel_button.setEnabled(False)
+
+    def _summary(self):
+        return f"{self.group_count} duplicate groups, {format_size(self.reclaimable)} reclaimable"
+
+    def on_groups_found(self, groups):
+        if self.sender() is not self.search_thread:
+            return
+        self.group_list.setUpdatesEnabled(False)
+        for group in groups:
+            waste = reclaimable_bytes(group)
+            item = GroupItem([f"{len(group.paths)} copies of {os.path.basename(group.paths[0])}",
+                                    format_size(group.size), format_size(waste)])
+            item.setData(1, Qt.ItemDataRole.UserRole, group.size)
+            item.setData(2, Qt.ItemDataRole.UserRole, waste)
+            for path in group.paths:
+                child = QTreeWidgetItem([os.path.relpath(path, self.root_path)])
+                child.setData(0, Qt.ItemDataRole.UserRole, path)
+                child.setToolTip(0, path)
+                item.addChild(child)
+            self.group_list.addTopLevelItem(item)
+            self.group_count += 1
+            self.reclaimable += waste
+        self.group_list.setUpdatesEnabled(True)
+        self.summary_label.setText(f"Searching {self.root_path}... {self._summary()}")
+
+    def on_search_complete(self, group_count, reclaimable):
+        if self.sender() is not self.search_thread:
+            return
+        finder = self.search_thread.finder
+        self.summary_label.setText(f"{self._summary()} ({finder.files_scanned} files scanned, "
+                                   f"{finder.files_partially_hashed} partially and {finder.files_fully_hashed} fully hashed; "
+                                   f"{self.search_thread.hash_cache.stats()})")
+
+    def on_search_finished(self):
+        if self.sender() is self.search_thread:
+            self.search_thread = None
+            self.progress_bar.setVisible(False)
+            self.cancel_button.setEnabled(False)
+
+    def on_item_double_clicked(self, item, column):
+        path = item.data(0, Qt.ItemDataRole.UserRole)
+        if path and os.path.isfile(path):
+            self.file_double_clicked.emit(path)
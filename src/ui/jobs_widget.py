@@ -0,0 +1,92 @@
+# src/ui/jobs_widget.py
+
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QTreeWidget, QTreeWidgetItem, QPushButton, QProgressBar
+from PyQt6.QtCore import Qt
+from utils.job_queue import JobQueue, DONE
+
+class JobsWidget(QWidget):
+    """Lists the JobQueue's jobs with their progress and lets the user pause, resume or cancel them."""
+
+    def __init__(self, job_queue: JobQueue, parent=None):
+        super().__init__(parent)
+        self.job_queue = job_queue
+        self.layout = QVBoxLayout(self)
+
+        self.job_list = QTreeWidget(self)
+        self.job_list.setHeaderLabels(["Job", "Progress", "State"])
+        self.job_list.setRootIsDecorated(False)
+        self.job_list.setColumnWidth(0, 400)
+        self.layout.addWidget(self.job_list)
+
+        self.button_layout = QHBoxLayout()
+        self.pause_button = QPushButton("Pause", self)
+        self.pause_button.clicked.connect(lambda: self.for_selected_jobs(self.job_queue.pause))
+        self.button_layout.addWidget(self.pause_button)
+        self.resume_button = QPushButton("Resume", self)
+        self.resume_button.clicked.connect(lambda: self.for_selected_jobs(self.job_queue.resume))
+        self.button_layout.addWidget(self.resume_button)
+        self.cancel_button = QPushButton("Cancel", self)
+        self.cancel_button.clicked.connect(lambda: self.for_selected_jobs(self.job_queue.cancel))
+        self.button_layout.addWidget(self.cancel_button)
+        self.clear_button = QPushButton("Clear Finished", self)
+        self.clear_button.clicked.connect(self.clear_finished)
+        self.button_layout.addWidget(self.clear_button)
+        self.button_layout.addStretch()
+        self.layout.addLayout(self.button_layout)
+        self.setLayout(self.layout)
+
+        self.items = {}  # job id -> (QTreeWidgetItem, QProgressBar)
+        self.finished_jobs = set()
+        self.job_queue.job_added.connect(self.on_job_added)
+        self.job_queue.job_progress.connect(self.on_job_progress)
+        self.job_queue.job_state_changed.connect(self.on_job_state_changed)
+        self.job_queue.job_finished.connect(self.on_job_finished)
+
+    def on_job_added(self, job_id, description):
+        item = QTreeWidgetItem([description, "", "Queued"])
+        item.setData(0, Qt.ItemDataRole.UserRole, job_id)
+        item.setToolTip(0, description)
+        self.job_list.addTopLevelItem(item)
+        progress_bar = QProgressBar(self.job_list)
+        progress_bar.setRange(0, 1000)
+        self.job_list.setItemWidget(item, 1, progress_bar)
+        self.items[job_id] = (item, progress_bar)
+
+    def on_job_progress(self, job_id, done, total, bytes_per_second):
+        if job_id not in self.items:
+            return
+        progress_bar = self.items[job_id][1]
+        if not total:
+            progress_bar.setRange(0, 0)  # Busy indicator for jobs that only count what they did
+            self.items[job_id][0].setToolTip(1, f"{done} items")
+            return
+        progress_bar.setValue(int(done * 1000 / total))
+        if bytes_per_second:
+            progress_bar.setFormat(f"%p% ({bytes_per_second / (1024 * 1024):.1f} MB/s)")
+
+    def on_job_state_changed(self, job_id, state):
+        if job_id in self.items:
+            self.items[job_id][0].setText(2, state)
+
+    def on_job_finished(self, job_id, state, error):
+        if job_id not in self.items:
+            return
+        item, progress_bar = self.items[job_id]
+        item.setText(2, state)
+        if error:
+            item.setToolTip(2, error)
+        progress_bar.setRange(0, 1000)
+        if state == DONE:
+            progress_bar.setValue(1000)
+        progress_bar.resetFormat()
+        self.finished_jobs.add(job_id)
+
+    def for_selected_jobs(self, action):
+        for item in self.job_list.selectedItems():
+            action(item.data(0, Qt.ItemDataRole.UserRole))
+
+    def clear_finished(self):
+        for job_id in self.finished_jobs:
+            item = self.items.pop(job_id)[0]
+            self.job_list.takeTopLevelItem(self.job_list.indexOfTopLevelItem(item))
+        self.finished_jobs.clear()
@@ -2,15 +2,22 @@
 
 import os
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QTabWidget, QTextEdit, QPushButton, QLabel, QScrollArea,
-                             QMessageBox, QFileDialog, QStatusBar, QHBoxLayout, QCheckBox)
-from PyQt6.QtGui import QPixmap, QIcon
+                             QMessageBox, QFileDialog, QStatusBar, QHBoxLayout, QCheckBox, QInputDialog)
+from PyQt6.QtGui import QPixmap, QIcon, QTextCursor
 from PyQt6.QtCore import QDir, QTimer, Qt
 from utils.file_structure import FileStructure
 from ai.ai_assist import AIAssist
+from ai.batch_import import split_snippets
 from ui.tree_view_widget import TreeViewWidget
+from ui.jobs_widget import JobsWidget
+from ui.duplicates_widget import DuplicatesWidget
+from ui.compare_widget import CompareWidget
+from ui.archive_widget import ArchiveWidget
+from utils.archive import archive_format
+from utils.structure_export_thread import StructureExportThread
 
 class MainContentWidget(QWidget):
-    def __init__(self, parent=None, console_tab=None):
+    def __init__(self, parent=None, console_tab=None, job_queue=None):
         super().__init__(parent)
 
         self.layout = QVBoxLayout(self)
@@ -24,6 +31,18 @@ class MainContentWidget(QWidget):
 
         self.tab_widget.addTab(self.text_editor, "Text/Code Editor")
         self.tab_widget.addTab(self.scroll_area, "Image Viewer")
+        self.duplicates_widget = DuplicatesWidget(self)
+        self.duplicates_widget.file_double_clicked.connect(self.display_content)
+        self.tab_widget.addTab(self.duplicates_widget, "Duplicates")
+        self.archive_widget = ArchiveWidget(self)
+        self.tab_widget.addTab(self.archive_widget, "Archive")
+        if job_queue:
+            self.jobs_widget = JobsWidget(job_queue, self)
+            self.tab_widget.addTab(self.jobs_widget, "Jobs")
+            self.compare_widget = CompareWidget(job_queue, self)
+            self.compare_widget.file_double_clicked.connect(self.display_content)
+            self.tab_widget.addTab(self.compare_widget, "Compare")
+            job_queue.status_changed.connect(self.status_bar.showMessage)
 
         self.layout.addWidget(self.tab_widget)
         self.layout.addWidget(self.status_bar)
@@ -34,12 +53,13 @@ class MainContentWidget(QWidget):
         self.current_file_path = None
         self.selected_file_path = None
         self.current_directory = QDir.currentPath()  # Initialize current directory
+        self.export_thread = None
         self.setup_auto_save()
 
         self.is_ai_assist = False
         self.file_structure = FileStructure(self.status_bar)
         self.ai_assist = AIAssist(self.status_bar, console_tab)  # Pass console_tab as the logger
-        self.tree_view_widget = TreeViewWidget()
+        self.tree_view_widget = TreeViewWidget(job_queue=job_queue)
         self.tree_view_widget.directory_selected.connect(self.on_directory_selected)
 
     def setup_image_viewer(self):
@@ -65,10 +85,20 @@ class MainContentWidget(QWidget):
         self.create_structure_button.clicked.connect(self.create_file_structure)
         self.bottom_right_layout.addWidget(self.create_structure_button)
 
+        self.preview_structure_button = QPushButton("Dry Run")
+        self.preview_structure_button.setToolTip("Compare the file structure with the disk without creating anything")
+        self.preview_structure_button.clicked.connect(self.preview_file_structure)
+        self.bottom_right_layout.addWidget(self.preview_structure_button)
+
         self.import_code_button = QPushButton("Import Code into File")
         self.import_code_button.clicked.connect(self.import_code_into_file)
         self.bottom_right_layout.addWidget(self.import_code_button)
 
+        self.batch_import_button = QPushButton("Batch Import...")
+        self.batch_import_button.setToolTip("Let AI assist place many snippets, from the editor or a folder")
+        self.batch_import_button.clicked.connect(self.batch_import_code)
+        self.bottom_right_layout.addWidget(self.batch_import_button)
+
         self.ai_assist_toggle = QCheckBox("AI Assist", self)
         self.ai_assist_toggle.toggled.connect(self.toggle_ai_assist)
         self.bottom_right_layout.addWidget(self.ai_assist_toggle)
@@ -83,10 +113,13 @@ class MainContentWidget(QWidget):
     def display_content(self, path):
         if path.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp', '.gif')):
             self.display_image(path)
+        elif archive_format(path):
+            self.display_archive(path)
         else:
             self.display_text(path)
 
     def display_text(self, path):
+        self.cancel_structure_export()
         try:
             with open(path, 'r', encoding='utf-8') as file:
                 content = file.read()
@@ -106,6 +139,59 @@ class MainContentWidget(QWidget):
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Could not display image {path}. Error: {e}")
 
+    def display_archive(self, path):
+        self.tab_widget.setCurrentWidget(self.archive_widget)
+        self.archive_widget.start(path)
+
+    def export_structure(self, path):
+        depth, ok = QInputDialog.getInt(self, "Export Structure", "Levels to export (0 for all):", 0, 0, 1000)
+        if not ok:
+            return
+        self.cancel_structure_export()
+        self.current_file_path = None  # The export is new text, not the file that was open
+        self.text_editor.clear()
+        self.text_editor.setUndoRedoEnabled(False)  # An undo stack would hold a second copy of the text
+        self.tab_widget.setCurrentWidget(self.text_editor)
+        self.status_bar.showMessage(f"Exporting the structure of {path}...")
+        self.export_thread = StructureExportThread(path, depth - 1 if depth else None, parent=self)
+        self.export_thread.lines_ready.connect(self.on_structure_lines)
+        self.export_thread.export_complete.connect(self.on_structure_exported)
+        self.export_thread.finished.connect(self.on_structure_export_finished)
+        self.export_thread.finished.connect(self.export_thread.deleteLater)
+        self.export_thread.start()
+
+    def cancel_structure_export(self):
+        if self.export_thread and self.export_thread.isRunning():
+            self.export_thread.lines_ready.disconnect(self.on_structure_lines)
+            self.export_thread.export_complete.disconnect(self.on_structure_exported)
+            self.export_thread.cancel()
+        self.export_thread = None
+        self.text_editor.setUndoRedoEnabled(True)
+
+    def on_structure_lines(self, text):
+        if self.sender() is not self.export_thread:
+            return
+        cursor = QTextCursor(self.text_editor.document())
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.insertText(text)
+
+    def on_structure_exported(self, count):
+        if self.sender() is self.export_thread:
+            self.status_bar.showMessage(f"Exported {count} entries.")
+
+    def on_structure_export_finished(self):
+        if self.sender() is self.export_thread:
+            self.export_thread = None
+            self.text_editor.setUndoRedoEnabled(True)
+
+    def find_duplicates(self, path):
+        self.tab_widget.setCurrentWidget(self.duplicates_widget)
+        self.duplicates_widget.start(path)
+
+    def compare_directories(self, source, target):
+        self.tab_widget.setCurrentWidget(self.compare_widget)
+        self.compare_widget.start(source, target)
+
     def save_code(self):
         if not self.current_file_path:
             self.select_file()
@@ -139,6 +225,23 @@ class MainContentWidget(QWidget):
         code = self.text_editor.toPlainText()
         self.ai_assist.ai_import_code_into_file(code, self.current_directory)
 
+    def batch_import_code(self):
+        sources = ["Snippets in the editor", "Snippet files in a folder"]
+        source, ok = QInputDialog.getItem(self, "Batch Import", "Import from:", sources, 0, False)
+        if not ok:
+            return
+        if source == sources[0]:
+            snippets = split_snippets(self.text_editor.toPlainText())
+            if not snippets:
+                QMessageBox.warning(self, "No Snippets", "Separate the snippets in the editor with code fences or '---' lines.")
+                return
+            self.ai_assist.ai_batch_import(self.current_directory, snippets=snippets)
+        else:
+            folder = QFileDialog.getExistingDirectory(self, "Select Snippet Folder", self.current_directory,
+                                                      QFileDialog.Option.DontUseNativeDialog)
+            if folder:
+                self.ai_assist.ai_batch_import(self.current_directory, folder=folder)
+
     def set_selected_file_path(self, path):
         self.selected_file_path = path
 
@@ -163,3 +266,12 @@ class MainContentWidget(QWidget):
             print("Using manual method to create file structure")  # Debugging
             self.file_structure.set_current_directory(self.current_directory)
             self.file_structure.create_file_structure(structure)
+
+    def preview_file_structure(self):
+        self.file_structure.set_current_directory(self.current_directory)
+        diff = self.file_structure.create_file_structure(self.text_editor.toPlainText(), dry_run=True)
+        if diff is None:
+            return
+        missing = diff.missing_directories + diff.missing_files
+        details = '\n'.join(missing[:20]) + ('\n...' if len(missing) > 20 else '')
+        QMessageBox.information(self, "Dry Run", f"In {self.current_directory}: {diff.summary()}.\n\n{details}")
@@ -1,18 +1,35 @@
 # src/ui/tree_view_widget.py
 
 import os
-from PyQt6.QtWidgets import QTreeView, QVBoxLayout, QWidget, QMenu, QInputDialog, QMessageBox, QLineEdit, QProgressBar
+from PyQt6.QtWidgets import QTreeView, QListView, QVBoxLayout, QWidget, QMenu, QInputDialog, QMessageBox, QLineEdit, QProgressBar, QAbstractItemView
 from PyQt6.QtCore import QDir, Qt, pyqtSignal
 from PyQt6.QtGui import QCursor, QAction, QFileSystemModel
-from utils.search_thread import SearchThread
+from utils.search_thread import SearchThread, ContentSearchThread, IndexedSearchThread, FuzzySearchThread
+from utils.content_index import INDEXED
+from utils.fuzzy_match import FUZZY
+from utils.search_results_model import SearchResultsModel
+from utils.search_cache import SearchCache
+from utils.job_queue import JobQueue, CopyJob, MoveJob, DeleteJob, RenameJob, HashJob, ArchiveJob, ExtractJob, FAILED
+from utils.archive import archive_format, archive_stem, available_formats
+from utils.disk_usage_proxy_model import DiskUsageProxyModel
+from utils.disk_usage_thread import DiskUsageThread
+
+# Name searches are cached for prefix refinement. Content results go stale
+# when a file is edited, which neither the root's mtime nor the watcher's
+# directory changes reveal, so content searches always run.
+CACHED_MODES = (None, FUZZY)
 
 class TreeViewWidget(QWidget):
     file_double_clicked = pyqtSignal(str)
     dir_changed = pyqtSignal(str)
     file_selected = pyqtSignal(str)
     directory_selected = pyqtSignal(str)  # New signal for directory selection
+    search_finished = pyqtSignal(str)
+    find_duplicates_requested = pyqtSignal(str)
+    compare_requested = pyqtSignal(str, str)
+    export_structure_requested = pyqtSignal(str)
 
-    def __init__(self, parent=None, ai_assist=None):
+    def __init__(self, parent=None, ai_assist=None, job_queue=None):
         super().__init__(parent)
         self.layout = QVBoxLayout(self)
         
@@ -20,40 +37,70 @@ class TreeViewWidget(QWidget):
         self.model.setRootPath(QDir.rootPath())
         self.model.setFilter(QDir.Filter.AllEntries | QDir.Filter.NoDotAndDotDot)
         
+        # Directory totals from the disk-usage scan go into the Size column
+        self.proxy_model = DiskUsageProxyModel(self)
+        self.proxy_model.setSourceModel(self.model)
+
         self.tree = QTreeView()
-        self.tree.setModel(self.model)
-        self.tree.setRootIndex(self.model.index(QDir.rootPath()))
+        self.tree.setModel(self.proxy_model)
+        self.tree.setRootIndex(self.path_index(QDir.rootPath()))
+        self.tree.setSortingEnabled(True)
+        self.tree.sortByColumn(0, Qt.SortOrder.AscendingOrder)
+        self.tree.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
         self.tree.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.tree.customContextMenuRequested.connect(self.open_context_menu)
         self.tree.doubleClicked.connect(self.on_double_click)
         self.tree.selectionModel().selectionChanged.connect(self.on_selection_changed)
-        self.tree.setColumnHidden(1, True)
         self.tree.setColumnHidden(2, True)
         self.tree.setColumnHidden(3, True)
 
+        self.results_model = SearchResultsModel(self)
+        self.results_view = QListView(self)
+        self.results_view.setModel(self.results_model)
+        self.results_view.setUniformItemSizes(True)
+        self.results_view.doubleClicked.connect(self.on_result_double_clicked)
+        self.results_view.setVisible(False)
+
         self.progress_bar = QProgressBar(self)
         self.progress_bar.setVisible(False)
 
         self.layout.addWidget(self.tree)
+        self.layout.addWidget(self.results_view)
         self.layout.addWidget(self.progress_bar)
         self.setLayout(self.layout)
 
         self.search_thread = None
+        self.disk_usage_thread = None
+        self.search_cache = SearchCache()
+        self.clipboard_paths = []
+        self.clipboard_cut = False
+        self.job_queue = job_queue or JobQueue(parent=self)
+        self.job_queue.job_finished.connect(self.on_job_finished)
+        self.job_dirs = {}  # id of a job we submitted -> directories it changes
+        self._search_key = None
         self.ai_assist = ai_assist
         self.current_directory = QDir.rootPath()  # Track the current directory
 
     def setModel(self, model):
         self.tree.setModel(model)
 
+    def file_path(self, index):
+        return self.model.filePath(self.proxy_model.mapToSource(index))
+
+    def path_index(self, path):
+        return self.proxy_model.mapFromSource(self.model.index(path))
+
     def set_root_directory(self, path):
         if os.path.exists(path):
             self.current_directory = path  # Update the current directory
             self.model.setRootPath(path)
-            self.tree.setRootIndex(self.model.index(path))
+            self.tree.setRootIndex(self.path_index(path))
+            self.proxy_model.clear_usage()
+            self.refresh_disk_usage()
             self.dir_changed.emit(path)
 
     def on_double_click(self, index):
-        path = self.model.filePath(index)
+        path = self.file_path(index)
         if os.path.isdir(path):
             self.set_root_directory(path)
         elif os.path.isfile(path):
@@ -62,7 +109,7 @@ class TreeViewWidget(QWidget):
     def on_selection_changed(self, selected, deselected):
         indexes = self.tree.selectionModel().selectedIndexes()
         if indexes:
-            path = self.model.filePath(indexes[0])
+            path = self.file_path(indexes[0])
             if os.path.isdir(path):
                 self.directory_selected.emit(path)  # Emit directory path
             elif os.path.isfile(path):
@@ -76,57 +123,243 @@ class TreeViewWidget(QWidget):
             open_action.triggered.connect(lambda: self.on_double_click(indexes[0]))
             menu.addAction(open_action)
             set_as_current_dir_action = QAction("Set as Root Directory", self)
-            set_as_current_dir_action.triggered.connect(lambda: self.set_root_directory(self.model.filePath(indexes[0])))
+            set_as_current_dir_action.triggered.connect(lambda: self.set_root_directory(self.file_path(indexes[0])))
             menu.addAction(set_as_current_dir_action)
-            delete_action = QAction("Delete", self)
-            delete_action.triggered.connect(lambda: self.delete_item(indexes[0]))
+            trash_action = QAction("Move to Trash", self)
+            trash_action.triggered.connect(lambda: self.delete_selected_items(trash=True))
+            menu.addAction(trash_action)
+            delete_action = QAction("Delete Permanently", self)
+            delete_action.triggered.connect(self.delete_selected_items)
             menu.addAction(delete_action)
             rename_action = QAction("Rename", self)
             rename_action.triggered.connect(lambda: self.rename_item(indexes[0]))
             menu.addAction(rename_action)
+            cut_action = QAction("Cut", self)
+            cut_action.triggered.connect(lambda: self.copy_selected_items(cut=True))
+            menu.addAction(cut_action)
+            copy_action = QAction("Copy", self)
+            copy_action.triggered.connect(self.copy_selected_items)
+            menu.addAction(copy_action)
+            paste_action = QAction("Paste", self)
+            paste_action.setEnabled(bool(self.clipboard_paths))
+            paste_action.triggered.connect(lambda: self.paste_item(indexes[0]))
+            menu.addAction(paste_action)
+            archive_action = QAction("Create Archive...", self)
+            archive_action.triggered.connect(self.archive_selected_items)
+            menu.addAction(archive_action)
+            extract_action = QAction("Extract Here", self)
+            extract_action.setEnabled(archive_format(self.file_path(indexes[0])) is not None)
+            extract_action.triggered.connect(lambda: self.extract_item(indexes[0]))
+            menu.addAction(extract_action)
+            hash_action = QAction("Compute Hashes", self)
+            hash_action.triggered.connect(lambda: self.submit_job(HashJob(self.file_path(indexes[0])), set()))
+            menu.addAction(hash_action)
+            compare_action = QAction("Compare Directories", self)
+            selected = self.selected_paths()
+            compare_action.setEnabled(len(selected) == 2 and all(os.path.isdir(path) for path in selected))
+            compare_action.triggered.connect(lambda: self.compare_requested.emit(*selected))
+            menu.addAction(compare_action)
+            export_structure_action = QAction("Export Structure", self)
+            export_structure_action.triggered.connect(lambda: self.request_export_structure(indexes[0]))
+            menu.addAction(export_structure_action)
+            find_duplicates_action = QAction("Find Duplicates", self)
+            find_duplicates_action.triggered.connect(lambda: self.request_find_duplicates(indexes[0]))
+            menu.addAction(find_duplicates_action)
             import_code_action = QAction("Import Code", self)
             import_code_action.triggered.connect(self.import_code)
             menu.addAction(import_code_action)
             menu.exec(QCursor.pos())
 
-    def delete_item(self, index):
-        path = self.model.filePath(index)
-        reply = QMessageBox.question(self, "Delete", f"Are you sure you want to delete {path}?", QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No, QMessageBox.StandardButton.No)
-        if reply == QMessageBox.StandardButton.Yes:
-            try:
-                if os.path.isdir(path):
-                    os.rmdir(path)
-                else:
-                    os.remove(path)
-                QMessageBox.information(self, "Deleted", f"{path} has been deleted.")
-                self.model.setRootPath(self.model.rootPath())
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Could not delete {path}. Error: {e}")
+    def selected_paths(self):
+        return [self.file_path(index) for index in self.tree.selectionModel().selectedRows()]
+
+    def submit_job(self, job, directories):
+        self.job_dirs[job.id] = directories
+        self.job_queue.submit(job)
+
+    def delete_selected_items(self, trash=False):
+        paths = self.selected_paths()
+        if not paths:
+            return
+        if not trash:
+            target = paths[0] if len(paths) == 1 else f"these {len(paths)} items"
+            reply = QMessageBox.question(self, "Delete", f"Are you sure you want to permanently delete {target}?", QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No, QMessageBox.StandardButton.No)
+            if reply != QMessageBox.StandardButton.Yes:
+                return
+        self.submit_job(DeleteJob(paths, trash=trash), {os.path.dirname(path) for path in paths})
 
     def rename_item(self, index):
-        path = self.model.filePath(index)
-        new_name, ok = QInputDialog.getText(self, "Rename", "Enter new name:", QLineEdit.Normal, QDir(path).dirName())
+        path = self.file_path(index)
+        new_name, ok = QInputDialog.getText(self, "Rename", "Enter new name:", QLineEdit.EchoMode.Normal, QDir(path).dirName())
         if ok and new_name:
             new_path = os.path.join(os.path.dirname(path), new_name)
-            try:
-                os.rename(path, new_path)
-                QMessageBox.information(self, "Renamed", f"{path} has been renamed to {new_name}.")
-                self.model.setRootPath(self.model.rootPath())
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Could not rename {path}. Error: {e}")
-
-    def start_search(self, root_path, search_text):
-        if self.search_thread and self.search_thread.isRunning():
-            self.search_thread.terminate()
+            self.submit_job(RenameJob(path, new_path), {os.path.dirname(path)})
+
+    def copy_selected_items(self, cut=False):
+        self.clipboard_paths = self.selected_paths()
+        self.clipboard_cut = cut
+
+    def paste_item(self, index):
+        target_dir = self.file_path(index)
+        if not os.path.isdir(target_dir):
+            target_dir = os.path.dirname(target_dir)
+        for src in self.clipboard_paths:
+            if os.path.isdir(src) and os.path.abspath(target_dir).startswith(os.path.join(os.path.abspath(src), '')):
+                QMessageBox.warning(self, "Paste", f"Cannot {'move' if self.clipboard_cut else 'copy'} {src} into itself.")
+                continue
+            name, ext = os.path.splitext(os.path.basename(src.rstrip('\\/')))
+            dst = os.path.join(target_dir, name + ext)
+            if self.clipboard_cut:
+                if os.path.abspath(dst) != os.path.abspath(src):
+                    self.submit_job(MoveJob(src, dst), {os.path.dirname(src), target_dir})
+                continue
+            copy_number = 1
+            while os.path.exists(dst):
+                dst = os.path.join(target_dir, f"{name} - Copy{f' ({copy_number})' if copy_number > 1 else ''}{ext}")
+                copy_number += 1
+            self.submit_job(CopyJob(src, dst), {target_dir})
+        if self.clipboard_cut:
+            self.clipboard_paths = []  # Moved items are no longer at the clipboard paths
+
+    def archive_selected_items(self):
+        paths = self.selected_paths()
+        if not paths:
+            return
+        format, ok = QInputDialog.getItem(self, "Create Archive", "Format:", available_formats(), 0, False)
+        if not ok:
+            return
+        target_dir = os.path.dirname(paths[0])
+        name = os.path.basename(paths[0]) if len(paths) == 1 else os.path.basename(target_dir)
+        archive_path = os.path.join(target_dir, f"{name}.{format}")
+        number = 1
+        while os.path.lexists(archive_path):
+            number += 1
+            archive_path = os.path.join(target_dir, f"{name} ({number}).{format}")
+        self.submit_job(ArchiveJob(paths, archive_path), {target_dir})
+
+    def extract_item(self, index):
+        archive_path = self.file_path(index)
+        target_dir = os.path.dirname(archive_path)
+        name = archive_stem(archive_path)
+        destination = os.path.join(target_dir, name)
+        number = 1
+        while os.path.lexists(destination):
+            number += 1
+            destination = os.path.join(target_dir, f"{name} ({number})")
+        self.submit_job(ExtractJob(archive_path, destination), {target_dir})
+
+    def on_job_finished(self, job_id, state, error):
+        directories = self.job_dirs.pop(job_id, None)
+        if directories is None:
+            return  # Submitted by someone else sharing the queue
+        for directory in directories:
+            self.search_cache.invalidate(directory)
+        if state == FAILED:
+            QMessageBox.critical(self, "Error", f"File operation failed. Error: {error}")
+
+    def request_find_duplicates(self, index):
+        path = self.file_path(index)
+        self.find_duplicates_requested.emit(path if os.path.isdir(path) else os.path.dirname(path))
+
+    def request_export_structure(self, index):
+        path = self.file_path(index)
+        self.export_structure_requested.emit(path if os.path.isdir(path) else os.path.dirname(path))
+
+    def refresh_disk_usage(self):
+        """(Re)compute directory totals below the current directory; cached subtrees are not listed again."""
+        if self.disk_usage_thread and self.disk_usage_thread.isRunning():
+            self.disk_usage_thread.usage_found.disconnect(self.on_usage_found)
+            self.disk_usage_thread.cancel()
+        self.disk_usage_thread = DiskUsageThread(self.current_directory, parent=self)
+        self.disk_usage_thread.usage_found.connect(self.on_usage_found)
+        self.disk_usage_thread.finished.connect(self.on_disk_usage_finished)
+        self.disk_usage_thread.finished.connect(self.disk_usage_thread.deleteLater)
+        self.disk_usage_thread.start()
+
+    def on_usage_found(self, usage):
+        if self.sender() is not self.disk_usage_thread:
+            return  # Batch queued by a scan that has since been cancelled
+        self.proxy_model.add_usage(usage)
+
+    def on_disk_usage_finished(self):
+        if self.sender() is self.disk_usage_thread:
+            self.disk_usage_thread = None
 
+    def start_search(self, root_path, search_text, content_mode=None):
+        self.cancel_search()
+        self.results_model.reset(root_path)
+        if not search_text:
+            self.results_view.setVisible(False)
+            return
+
+        self.results_view.setVisible(True)
+        cached = self.search_cache.get(root_path, content_mode, search_text) if content_mode in CACHED_MODES else None
+        if cached is not None and content_mode != FUZZY:
+            self.results_model.add_results(cached)
+            return
+        # Name matches of a shorter query are a superset of the new query's,
+        # so typing one more character filters them instead of searching.
+        refine_from = cached
+        if refine_from is None and content_mode in CACHED_MODES:
+            prefix = self.search_cache.closest_prefix(root_path, content_mode, search_text)
+            if prefix:
+                refine_from = prefix[1]
+
+        self.progress_bar.setRange(0, 0)
         self.progress_bar.setVisible(True)
-        self.search_thread = SearchThread(root_path, search_text)
+        # Parented to the widget so a cancelled search can finish winding
+        # down after we drop our reference to it.
+        if content_mode == FUZZY:
+            self.search_thread = FuzzySearchThread(root_path, search_text, refine_from=refine_from, parent=self)
+        elif content_mode == INDEXED:
+            self.search_thread = IndexedSearchThread(root_path, search_text, parent=self)
+        elif content_mode:
+            self.search_thread = ContentSearchThread(root_path, search_text, content_mode, parent=self)
+        else:
+            self.search_thread = SearchThread(root_path, search_text, refine_from=refine_from, parent=self)
+        self._search_key = (root_path, content_mode, search_text)
+        self.search_thread.results_found.connect(self.on_results_found)
         self.search_thread.search_complete.connect(self.on_search_complete)
+        self.search_thread.search_failed.connect(self.on_search_failed)
+        self.search_thread.finished.connect(self.search_thread.deleteLater)
         self.search_thread.start()
 
-    def on_search_complete(self, matches):
+    def cancel_search(self):
+        if self.search_thread and self.search_thread.isRunning():
+            self.search_thread.results_found.disconnect(self.on_results_found)
+            self.search_thread.search_complete.disconnect(self.on_search_complete)
+            self.search_thread.search_failed.disconnect(self.on_search_failed)
+            self.search_thread.cancel()
+        self.search_thread = None
         self.progress_bar.setVisible(False)
-        print("Search complete:", matches)
+
+    def on_results_found(self, results):
+        if self.sender() is not self.search_thread:
+            return  # Batch queued by a search that has since been cancelled
+        self.results_model.add_results(results)
+
+    def on_search_complete(self, match_count):
+        if self.sender() is not self.search_thread:
+            return
+        if self._search_key[1] in CACHED_MODES:
+            self.search_cache.put(*self._search_key, self.search_thread.cache_entry)
+        self.progress_bar.setVisible(False)
+        self.search_thread = None
+        self.search_finished.emit(self._search_key[0])
+
+    def on_search_failed(self, error):
+        if self.sender() is not self.search_thread:
+            return
+        self.progress_bar.setVisible(False)
+        self.search_thread = None
+        QMessageBox.warning(self, "Search Failed", f"The search could not be completed. Error: {error}")
+
+    def on_result_double_clicked(self, index):
+        path = self.results_model.path(index)
+        if os.path.isdir(path):
+            self.set_root_directory(path)
+        elif os.path.isfile(path):
+            self.file_double_clicked.emit(path)
 
     def import_code(self):
         if self.ai_assist:
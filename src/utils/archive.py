@@ -0,0 +1,387 @@
+# src/utils/archive.py
+import gzip
+import os
+import stat
+import tarfile
+import threading
+import time
+import zipfile
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Iterator, List, Optional, Tuple
+from utils.cancellation import CancelToken
+from utils.copy_engine import CopyProgress
+from utils.walker import ParallelWalker
+
+try:
+    import zstandard
+except ImportError:  # Optional: only needed for .tar.zst archives
+    zstandard = None
+
+ZIP = 'zip'
+TAR = 'tar'
+TAR_GZ = 'tar.gz'
+TAR_ZST = 'tar.zst'
+
+_SUFFIXES = [('.tar.gz', TAR_GZ), ('.tgz', TAR_GZ), ('.tar.zst', TAR_ZST), ('.tzst', TAR_ZST),
+             ('.tar', TAR), ('.zip', ZIP)]
+
+BUFFER_SIZE = 1024 * 1024
+GZIP_CHUNK_SIZE = 1024 * 1024  # bytes compressed as one gzip member by one worker
+DEFAULT_ARCHIVE_WORKERS = os.cpu_count() or 1
+
+ArchiveMember = namedtuple('ArchiveMember', ['name', 'size', 'compressed_size', 'is_dir', 'mtime'])
+
+
+def archive_format(path: str) -> Optional[str]:
+    """The archive format implied by the file name, or None if it is not an archive."""
+    name = path.lower()
+    for suffix, format in _SUFFIXES:
+        if name.endswith(suffix):
+            return format
+    return None
+
+
+def archive_stem(path: str) -> str:
+    """The file name without its archive suffix ('src.tar.gz' -> 'src')."""
+    name = os.path.basename(path)
+    for suffix, _ in _SUFFIXES:
+        if name.lower().endswith(suffix):
+            return name[:-len(suffix)]
+    return name
+
+
+def available_formats() -> List[str]:
+    formats = [ZIP, TAR, TAR_GZ]
+    if zstandard:
+        formats.append(TAR_ZST)
+    return formats
+
+
+def _require_zstandard():
+    if zstandard is None:
+        raise ValueError("tar.zst archives need the zstandard package")
+
+
+class _ParallelGzipWriter:
+    """Write-only file object that gzips fixed-size chunks on a thread pool, like pigz.
+
+    Each chunk becomes an independent gzip member; concatenated members are
+    one valid gzip stream for gzip, tar and GzipFile. zlib releases the GIL,
+    so the chunks compress on all cores, and at most two chunks per worker
+    are held in memory at a time.
+    """
+
+    def __init__(self, fileobj, level: int, max_workers: int):
+        self.fileobj = fileobj
+        self.level = level
+        self.max_workers = max(1, max_workers)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='gzip')
+        self._pending = deque()
+        self._buffer = bytearray()
+
+    def write(self, data) -> int:
+        self._buffer += data
+        while len(self._buffer) >= GZIP_CHUNK_SIZE:
+            self._submit(bytes(self._buffer[:GZIP_CHUNK_SIZE]))
+            del self._buffer[:GZIP_CHUNK_SIZE]
+        return len(data)
+
+    def _submit(self, chunk: bytes):
+        # mtime=0 keeps the output reproducible
+        self._pending.append(self._executor.submit(gzip.compress, chunk, self.level, mtime=0))
+        while len(self._pending) > 2 * self.max_workers:
+            self.fileobj.write(self._pending.popleft().result())
+
+    def close(self):
+        try:
+            if self._buffer or not self._pending:
+                self._submit(bytes(self._buffer))
+                self._buffer.clear()
+            while self._pending:
+                self.fileobj.write(self._pending.popleft().result())
+        finally:
+            self._executor.shutdown(cancel_futures=True)
+
+
+class _ProgressReader:
+    """Wraps a source file so tarfile's copy loop reports progress and honours cancellation."""
+
+    def __init__(self, fileobj, progress: CopyProgress, cancel_token: CancelToken):
+        self.fileobj = fileobj
+        self.progress = progress
+        self.cancel_token = cancel_token
+
+    def read(self, size: int = -1) -> bytes:
+        self.cancel_token.raise_if_cancelled()
+        data = self.fileobj.read(size)
+        self.progress.add_bytes(len(data))
+        return data
+
+
+def _collect(sources: List[str], cancel_token: CancelToken) -> List[Tuple[str, str]]:
+    """(path, archive name) of every entry below ``sources``, parents before children."""
+    entries = []
+    for source in sources:
+        source = os.path.abspath(source)
+        base = os.path.dirname(source)
+        entries.append((source, os.path.relpath(source, base)))
+        if not os.path.isdir(source) or os.path.islink(source):
+            continue
+        for entry in ParallelWalker(source, cancel_token=cancel_token).iter_entries():
+            entries.append((entry.path, os.path.relpath(entry.path, base)))
+    cancel_token.raise_if_cancelled()
+    return sorted((path, name.replace(os.sep, '/')) for path, name in entries)
+
+
+def _create_zip(archive, entries, level: int, progress: CopyProgress, cancel_token: CancelToken):
+    with zipfile.ZipFile(archive, 'w', zipfile.ZIP_DEFLATED, compresslevel=level) as zf:
+        for path, name in entries:
+            cancel_token.raise_if_cancelled()
+            st = os.lstat(path)
+            if stat.S_ISDIR(st.st_mode):
+                info = zipfile.ZipInfo.from_file(path, name)
+                zf.writestr(info, b'')
+            elif stat.S_ISLNK(st.st_mode):
+                # Info-ZIP convention: a member with the link's mode whose data is the target
+                info = zipfile.ZipInfo(name, time.localtime(st.st_mtime)[:6])
+                info.create_system = 3  # Unix, so external_attr holds st_mode
+                info.external_attr = st.st_mode << 16
+                zf.writestr(info, os.readlink(path))
+            elif stat.S_ISREG(st.st_mode):
+                info = zipfile.ZipInfo.from_file(path, name)
+                info.compress_type = zipfile.ZIP_DEFLATED
+                with open(path, 'rb') as src, zf.open(info, 'w', force_zip64=st.st_size > zipfile.ZIP64_LIMIT) as dst:
+                    while True:
+                        cancel_token.raise_if_cancelled()
+                        data = src.read(BUFFER_SIZE)
+                        if not data:
+                            break
+                        dst.write(data)
+                        progress.add_bytes(len(data))
+                progress.file_done()
+
+
+def _create_tar(archive, entries, format: str, level: int, max_workers: int, progress: CopyProgress,
+                cancel_token: CancelToken):
+    if format == TAR_GZ:
+        stream = _ParallelGzipWriter(archive, level, max_workers)
+    elif format == TAR_ZST:
+        _require_zstandard()
+        stream = zstandard.ZstdCompressor(level=level, threads=max_workers).stream_writer(archive, closefd=False)
+    else:
+        stream = None
+    try:
+        with tarfile.open(fileobj=stream or archive, mode='w|', bufsize=BUFFER_SIZE) as tar:
+            for path, name in entries:
+                cancel_token.raise_if_cancelled()
+                info = tar.gettarinfo(path, name)
+                if info is None:
+                    continue  # Sockets cannot be archived
+                if not info.isreg():
+                    tar.addfile(info)
+                    continue
+                with open(path, 'rb') as src:
+                    tar.addfile(info, _ProgressReader(src, progress, cancel_token))
+                progress.file_done()
+    finally:
+        if stream:
+            stream.close()
+
+
+def create_archive(sources: List[str], archive_path: str, format: Optional[str] = None, level: Optional[int] = None,
+                   max_workers: int = DEFAULT_ARCHIVE_WORKERS,
+                   progress_callback: Optional[Callable[[CopyProgress], None]] = None,
+                   cancel_token: Optional[CancelToken] = None) -> CopyProgress:
+    """Pack ``sources`` into a zip or tar archive, streaming every file in bounded buffers.
+
+    Members are named relative to each source's parent directory. tar.gz
+    output is compressed in parallel chunks and tar.zst by zstd's own
+    worker threads; zip members are deflated one at a time. The archive is
+    written under a temporary name and only appears once complete.
+    """
+    cancel_token = cancel_token or CancelToken()
+    format = format or archive_format(archive_path)
+    if format is None:
+        raise ValueError(f"Unknown archive format: {archive_path}")
+    entries = _collect(sources, cancel_token)
+    sizes = [os.lstat(path).st_size for path, _ in entries if os.path.isfile(path) and not os.path.islink(path)]
+    progress = CopyProgress(sum(sizes), len(sizes), progress_callback)
+
+    temporary = f"{archive_path}.{os.getpid()}.part"
+    try:
+        with open(temporary, 'wb') as archive:
+            if format == ZIP:
+                _create_zip(archive, entries, 6 if level is None else level, progress, cancel_token)
+            else:
+                default_level = 3 if format == TAR_ZST else 6
+                _create_tar(archive, entries, format, default_level if level is None else level, max_workers,
+                            progress, cancel_token)
+        os.replace(temporary, archive_path)
+    except BaseException:
+        try:
+            os.remove(temporary)
+        except OSError:
+            pass
+        raise
+    return progress
+
+
+def _open_tar_stream(raw, format: str):
+    """A forward-only reader of the tar data in ``raw``."""
+    if format == TAR_GZ:
+        return gzip.GzipFile(fileobj=raw, mode='rb')  # Reads multi-member output too
+    if format == TAR_ZST:
+        _require_zstandard()
+        return zstandard.ZstdDecompressor().stream_reader(raw, closefd=False)
+    return raw
+
+
+def list_archive(archive_path: str, cancel_token: Optional[CancelToken] = None) -> Iterator[ArchiveMember]:
+    """Yield the members of an archive without extracting any data.
+
+    Zip archives are listed from the central directory alone and plain tar
+    archives by seeking from header to header, so both are instant at any
+    size. Compressed tar archives have no index and must be decompressed
+    to reach each header, but nothing is kept in memory or written.
+    """
+    cancel_token = cancel_token or CancelToken()
+    format = archive_format(archive_path)
+    if format == ZIP:
+        with zipfile.ZipFile(archive_path) as zf:
+            for info in zf.infolist():
+                yield ArchiveMember(info.filename.rstrip('/'), info.file_size, info.compress_size, info.is_dir(),
+                                   time.mktime(info.date_time + (0, 0, -1)))
+        return
+    if format is None:
+        raise ValueError(f"Unknown archive format: {archive_path}")
+    with open(archive_path, 'rb') as raw:
+        stream = _open_tar_stream(raw, format)
+        mode = 'r:' if stream is raw else 'r|'  # Plain tar can seek past member data
+        with tarfile.open(fileobj=stream, mode=mode) as tar:
+            for info in tar:
+                cancel_token.raise_if_cancelled()
+                yield ArchiveMember(info.name, info.size, None, info.isdir(), info.mtime)
+                if mode == 'r:':
+                    tar.members = []  # Listing only; do not keep every TarInfo around
+
+
+def _safe_target(destination: str, name: str) -> str:
+    target = os.path.realpath(os.path.join(destination, name))
+    if os.path.commonpath([destination, target]) != destination:
+        raise ValueError(f"{name} would be extracted outside {destination}")
+    return target
+
+
+def _extract_zip(archive_path: str, destination: str, max_workers: int,
+                 progress_callback: Optional[Callable[[CopyProgress], None]], cancel_token: CancelToken) -> CopyProgress:
+    with zipfile.ZipFile(archive_path) as zf:
+        infos = zf.infolist()
+    files = [info for info in infos if not info.is_dir()]
+    progress = CopyProgress(sum(info.file_size for info in files), len(files), progress_callback)
+    directories = []
+    for info in infos:
+        if info.is_dir():
+            target = _safe_target(destination, info.filename)
+            os.makedirs(target, exist_ok=True)
+            directories.append((target, info))
+        else:
+            os.makedirs(os.path.dirname(_safe_target(destination, info.filename)), exist_ok=True)
+
+    local = threading.local()
+
+    def extract(info: zipfile.ZipInfo):
+        # Members decompress independently, so each worker reads through its own handle
+        if not hasattr(local, 'zf'):
+            local.zf = zipfile.ZipFile(archive_path)
+            handles.append(local.zf)
+        target = _safe_target(destination, info.filename)
+        mode = info.external_attr >> 16
+        if info.create_system == 3 and stat.S_ISLNK(mode):
+            link = local.zf.read(info).decode()
+            _safe_target(destination, os.path.join(os.path.dirname(info.filename), link))  # No links out of it
+            os.symlink(link, target)
+            progress.add_bytes(info.file_size)
+            progress.file_done()
+            return
+        with local.zf.open(info) as src, open(target, 'wb') as dst:
+            while True:
+                cancel_token.raise_if_cancelled()
+                data = src.read(BUFFER_SIZE)
+                if not data:
+                    break
+                dst.write(data)
+                progress.add_bytes(len(data))
+        if info.create_system == 3 and mode:
+            os.chmod(target, stat.S_IMODE(mode) & 0o777)
+        mtime = time.mktime(info.date_time + (0, 0, -1))
+        os.utime(target, (mtime, mtime))
+        progress.file_done()
+
+    handles = []
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='unzip') as executor:
+            futures = [executor.submit(extract, info) for info in files]
+            try:
+                for future in as_completed(futures):
+                    future.result()
+            except BaseException:
+                cancel_token.cancel()
+                raise
+    finally:
+        for handle in handles:
+            handle.close()
+    for target, info in reversed(directories):
+        mtime = time.mktime(info.date_time + (0, 0, -1))
+        os.utime(target, (mtime, mtime))
+    return progress
+
+
+def _extract_tar(archive_path: str, format: str, destination: str,
+                 progress_callback: Optional[Callable[[CopyProgress], None]], cancel_token: CancelToken) -> CopyProgress:
+    # The uncompressed size is unknown without a full pass, so progress counts archive bytes read
+    progress = CopyProgress(os.path.getsize(archive_path), 0, progress_callback)
+    directories = []
+    with open(archive_path, 'rb') as raw:
+        stream = _open_tar_stream(raw, format)
+        with tarfile.open(fileobj=stream, mode='r|', bufsize=BUFFER_SIZE) as tar:
+            for info in tar:
+                cancel_token.raise_if_cancelled()
+                # The 'data' filter rejects absolute paths, '..', links leaving the
+                # destination and device files, and strips setuid bits.
+                info = tarfile.data_filter(info, destination)
+                tar.extract(info, destination, set_attrs=not info.isdir(), filter='fully_trusted')
+                if info.isdir():
+                    directories.append(info)
+                else:
+                    progress.total_files += 1
+                    progress.file_done()
+                progress.add_bytes(raw.tell() - progress.bytes_done)
+    # Extracting into the directories bumped their mtimes; set them last.
+    for info in reversed(directories):
+        path = os.path.join(destination, info.name)
+        if info.mode is not None:
+            os.chmod(path, info.mode)
+        os.utime(path, (info.mtime, info.mtime))
+    return progress
+
+
+def extract_archive(archive_path: str, destination: str, max_workers: int = DEFAULT_ARCHIVE_WORKERS,
+                    progress_callback: Optional[Callable[[CopyProgress], None]] = None,
+                    cancel_token: Optional[CancelToken] = None) -> CopyProgress:
+    """Extract an archive into ``destination``, holding at most one buffer per worker in memory.
+
+    Zip members are decompressed in parallel; tar archives are read in a
+    single forward pass, so compressed ones are never seeked or staged.
+    Members that would land outside ``destination`` raise instead of being
+    written. A cancelled extract leaves the members written so far.
+    """
+    cancel_token = cancel_token or CancelToken()
+    format = archive_format(archive_path)
+    if format is None:
+        raise ValueError(f"Unknown archive format: {archive_path}")
+    os.makedirs(destination, exist_ok=True)
+    destination = os.path.realpath(destination)
+    if format == ZIP:
+        return _extract_zip(archive_path, destination, max_workers, progress_callback, cancel_token)
+    return _extract_tar(archive_path, format, destination, progress_callback, cancel_token)
@@ -0,0 +1,42 @@
+# src/utils/archive_thread.py
+import tarfile
+import time
+import zipfile
+from PyQt6.QtCore import QThread, pyqtSignal
+from utils.archive import list_archive
+from utils.cancellation import CancelToken, CancelledError
+
+BATCH_INTERVAL = 0.1  # seconds between member batches
+
+class ArchiveListThread(QThread):
+    members_found = pyqtSignal(list)  # ArchiveMember batches
+    listing_complete = pyqtSignal(int)
+    error = pyqtSignal(str)
+
+    def __init__(self, archive_path: str, parent=None):
+        super().__init__(parent)
+        self.archive_path = archive_path
+        self.cancel_token = CancelToken()
+
+    def cancel(self):
+        self.cancel_token.cancel()
+
+    def run(self):
+        batch = []
+        count = 0
+        last_emit = 0.0
+        try:
+            for member in list_archive(self.archive_path, self.cancel_token):
+                batch.append(member)
+                count += 1
+                if time.monotonic() - last_emit >= BATCH_INTERVAL:
+                    self.members_found.emit(batch)
+                    batch, last_emit = [], time.monotonic()
+        except CancelledError:
+            return
+        except (OSError, EOFError, ValueError, zipfile.BadZipFile, tarfile.TarError) as e:
+            self.error.emit(str(e))
+            return
+        if batch:
+            self.members_found.emit(batch)
+        self.listing_complete.emit(count)
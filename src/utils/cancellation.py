@@ -0,0 +1,46 @@
+# src/utils/cancellation.py
+import threading
+
+
+class CancelledError(Exception):
+    """Raised by ``CancelToken.raise_if_cancelled`` once cancellation was requested."""
+    pass
+
+
+class CancelToken:
+    """Thread-safe flag that long-running work checks to stop cooperatively.
+
+    Unlike ``QThread.terminate``, the worker decides where it is safe to
+    stop, so files and indexes are never left half-written. The same
+    checkpoints also honour ``pause``: ``raise_if_cancelled`` blocks while
+    the token is paused.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._running = threading.Event()
+        self._running.set()
+
+    def cancel(self):
+        self._event.set()
+        self._running.set()  # Wake paused workers so they can notice
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def pause(self):
+        if not self._event.is_set():
+            self._running.clear()
+
+    def resume(self):
+        self._running.set()
+
+    @property
+    def paused(self) -> bool:
+        return not self._running.is_set()
+
+    def raise_if_cancelled(self):
+        self._running.wait()
+        if self._event.is_set():
+            raise CancelledError()
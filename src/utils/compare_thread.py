@@ -0,0 +1,32 @@
+# src/utils/compare_thread.py
+import sqlite3
+from PyQt6.QtCore import QThread, pyqtSignal
+from utils.cancellation import CancelToken, CancelledError
+from utils.dir_compare import compare_directories
+from utils.hash_cache import HashCache
+
+class CompareThread(QThread):
+    compare_complete = pyqtSignal(object)  # DirectoryDiff
+    error = pyqtSignal(str)
+
+    def __init__(self, source: str, target: str, parent=None):
+        super().__init__(parent)
+        self.source = source
+        self.target = target
+        self.cancel_token = CancelToken()
+
+    def cancel(self):
+        self.cancel_token.cancel()
+
+    def run(self):
+        hash_cache = HashCache()
+        try:
+            diff = compare_directories(self.source, self.target, hash_cache, cancel_token=self.cancel_token)
+        except CancelledError:
+            return
+        except (OSError, sqlite3.Error) as e:
+            self.error.emit(str(e))
+            return
+        finally:
+            hash_cache.close()
+        self.compare_complete.emit(diff)
@@ -0,0 +1,260 @@
+# src/utils/content_index.py
+import os
+import re
+import sqlite3
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+from utils.cancellation import CancelToken
+from utils.content_search import DEFAULT_EXCLUDES, is_binary
+from utils.utils import get_cache_path
+from utils.walker import ParallelWalker
+
+INDEXED = 'indexed'  # Search mode answered by ContentIndex
+
+MAX_FILE_SIZE = 8 * 1024 * 1024
+MAX_TERM_LENGTH = 64
+PARALLEL_THRESHOLD = 32  # Files to (re)index before a process pool pays off
+
+TOKEN_RE = re.compile(r'\w+')
+QUERY_RE = re.compile(r'"([^"]*)"|(\S+)')
+
+SCHEMA_VERSION = 2  # 2: one postings row per (term, file)
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    terms BLOB
+);
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    file_id INTEGER NOT NULL,
+    positions BLOB NOT NULL,
+    PRIMARY KEY (term, file_id)
+) WITHOUT ROWID;
+"""
+
+
+def _encode_varints(values: Iterable[int]) -> bytearray:
+    out = bytearray()
+    for value in values:
+        while value > 0x7f:
+            out.append((value & 0x7f) | 0x80)
+            value >>= 7
+        out.append(value)
+    return out
+
+
+def _decode_varints(data: bytes) -> List[int]:
+    values, value, shift = [], 0, 0
+    for byte in data:
+        value |= (byte & 0x7f) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            values.append(value)
+            value, shift = 0, 0
+    return values
+
+
+def encode_positions(positions: List[int]) -> bytes:
+    """Delta-code the ascending token positions of a term in one file."""
+    deltas, previous = [], 0
+    for position in positions:
+        deltas.append(position - previous)
+        previous = position
+    return bytes(_encode_varints(deltas))
+
+
+def decode_positions(data: bytes) -> List[int]:
+    positions, position = [], 0
+    for delta in _decode_varints(data):
+        position += delta
+        positions.append(position)
+    return positions
+
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in TOKEN_RE.findall(text.lower()) if len(token) <= MAX_TERM_LENGTH]
+
+
+def _tokenize_file(path: str) -> Optional[Dict[str, List[int]]]:
+    """Return ``{term: positions}`` for a text file, or None if it is not indexable."""
+    try:
+        with open(path, 'rb') as f:
+            data = f.read(MAX_FILE_SIZE + 1)
+    except OSError:
+        return None
+    if len(data) > MAX_FILE_SIZE or is_binary(data):
+        return None
+    terms = {}
+    for position, term in enumerate(tokenize(data.decode('utf-8', 'ignore'))):
+        terms.setdefault(term, []).append(position)
+    return terms
+
+
+class ContentIndex:
+    """Persistent positional inverted index over the text files below a root.
+
+    Each (term, file) pair has a postings row holding the term's token
+    positions in that file, which is enough to answer word and phrase
+    queries without reading the files again. ``update`` re-tokenizes only
+    files whose size or mtime changed, and rewrites only their rows, so
+    the cost of an update does not grow with the rest of the corpus.
+    """
+
+    def __init__(self, root_path: str, index_path: Optional[str] = None):
+        self.root_path = os.path.abspath(root_path)
+        self.index_path = index_path or self.path_for(self.root_path)
+        self.connection = sqlite3.connect(self.index_path)
+        version, = self.connection.execute("PRAGMA user_version").fetchone()
+        if version != SCHEMA_VERSION:
+            # Older layouts are dropped; the next update indexes everything again
+            self.connection.executescript("DROP TABLE IF EXISTS postings; DROP TABLE IF EXISTS files;")
+            self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.connection.executescript(SCHEMA)
+
+    @staticmethod
+    def path_for(root_path: str) -> str:
+        return get_cache_path('content_index', root_path, '.sqlite')
+
+    @classmethod
+    def exists(cls, root_path: str) -> bool:
+        return os.path.isfile(cls.path_for(root_path))
+
+    def close(self):
+        self.connection.close()
+
+    def update(self, cancel_token: Optional[CancelToken] = None) -> Tuple[int, int]:
+        """Bring the index in line with the disk.
+
+        Returns:
+            tuple[int, int]: Number of files (re)indexed and number removed.
+        """
+        cancel_token = cancel_token or CancelToken()
+        known = {path: (size, mtime_ns) for path, size, mtime_ns in
+                 self.connection.execute("SELECT path, size, mtime_ns FROM files")}
+        seen = set()
+        changed = []
+        walker = ParallelWalker(self.root_path, exclude=DEFAULT_EXCLUDES, cancel_token=cancel_token)
+        for _, _, files in walker.walk():
+            for entry in files:
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                seen.add(entry.path)
+                if known.get(entry.path) != (st.st_size, st.st_mtime_ns):
+                    changed.append(entry.path)
+        if cancel_token.cancelled:
+            return 0, 0
+        removed = [path for path in known if path not in seen]
+        self.update_paths(changed + removed)
+        return len(changed), len(removed)
+
+    def update_paths(self, paths: List[str]):
+        """Re-index the given files; paths that no longer exist are dropped."""
+        if not paths:
+            return
+        existing = [path for path in paths if os.path.isfile(path)]
+        if len(existing) >= PARALLEL_THRESHOLD:
+            with ProcessPoolExecutor() as executor:
+                tokenized = list(executor.map(_tokenize_file, existing, chunksize=16))
+        else:
+            tokenized = [_tokenize_file(path) for path in existing]
+
+        cursor = self.connection.cursor()
+        # Old term lists tell us which postings rows belong to the outdated files.
+        for path in paths:
+            row = cursor.execute("SELECT id, terms FROM files WHERE path = ?", (path,)).fetchone()
+            if row:
+                terms = zlib.decompress(row[1]).decode('utf-8').split('\n') if row[1] else []
+                cursor.executemany("DELETE FROM postings WHERE term = ? AND file_id = ?",
+                                   ((term, row[0]) for term in terms))
+                cursor.execute("DELETE FROM files WHERE id = ?", (row[0],))
+
+        for path, terms in zip(existing, tokenized):
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            # Binary and oversized files are recorded without terms so that
+            # later updates can tell they are unchanged.
+            term_blob = zlib.compress('\n'.join(terms).encode('utf-8')) if terms else None
+            cursor.execute("INSERT INTO files (path, size, mtime_ns, terms) VALUES (?, ?, ?, ?)",
+                           (path, st.st_size, st.st_mtime_ns, term_blob))
+            file_id = cursor.lastrowid
+            cursor.executemany("INSERT INTO postings (term, file_id, positions) VALUES (?, ?, ?)",
+                               ((term, file_id, encode_positions(positions)) for term, positions in (terms or {}).items()))
+        self.connection.commit()
+
+    def apply_changes(self, changed: Iterable[str], deleted: Iterable[str]):
+        """Re-index changed files and drop deleted ones, including whole directories.
+
+        Args:
+            changed (Iterable[str]): Absolute paths created or modified below the root.
+            deleted (Iterable[str]): Absolute paths that no longer exist.
+        """
+        paths = [path for path in changed if os.path.isfile(path) and not self._is_excluded(path)]
+        for path in deleted:
+            paths.append(path)
+            prefix = path.rstrip(os.sep) + os.sep
+            paths += [known for known, in self.connection.execute(
+                "SELECT path FROM files WHERE substr(path, 1, ?) = ?", (len(prefix), prefix))]
+        self.update_paths(paths)
+
+    def _is_excluded(self, path: str) -> bool:
+        relative_path = os.path.relpath(path, self.root_path)
+        return relative_path.startswith(os.pardir) or any(
+            part in DEFAULT_EXCLUDES for part in relative_path.split(os.sep))
+
+    def _postings(self, term: str) -> Dict[int, bytes]:
+        """Return ``{file_id: encoded positions}``; positions are decoded only for phrase checks."""
+        return dict(self.connection.execute("SELECT file_id, positions FROM postings WHERE term = ?", (term,)))
+
+    def search(self, query: str) -> List[str]:
+        """Return the files matching every word and quoted phrase in ``query``.
+
+        Args:
+            query (str): Words and ``"quoted phrases"``, all of which must match.
+
+        Returns:
+            list[str]: Absolute paths of the matching files.
+        """
+        phrases = [tokenize(phrase or word) for phrase, word in QUERY_RE.findall(query)]
+        phrases = [phrase for phrase in phrases if phrase]
+        if not phrases:
+            return []
+
+        cache = {}
+        candidates = None
+        for phrase in phrases:
+            for term in phrase:
+                if term not in cache:
+                    cache[term] = self._postings(term)
+                files = set(cache[term])
+                candidates = files if candidates is None else candidates & files
+                if not candidates:
+                    return []
+
+        matches = []
+        for file_id in candidates:
+            if all(self._contains_phrase(file_id, phrase, cache) for phrase in phrases if len(phrase) > 1):
+                matches.append(file_id)
+        paths = []
+        for i in range(0, len(matches), 500):
+            chunk = matches[i:i + 500]
+            placeholders = ','.join('?' * len(chunk))
+            paths += [path for path, in self.connection.execute(
+                f"SELECT path FROM files WHERE id IN ({placeholders})", chunk)]
+        return sorted(paths)
+
+    @staticmethod
+    def _contains_phrase(file_id: int, phrase: List[str], cache) -> bool:
+        following = [set(decode_positions(cache[term][file_id])) for term in phrase[1:]]
+        for start in decode_positions(cache[phrase[0]][file_id]):
+            if all(start + offset + 1 in positions for offset, positions in enumerate(following)):
+                return True
+        return False
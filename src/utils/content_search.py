@@ -0,0 +1,155 @@
+# src/utils/content_search.py
+import mmap
+import os
+import re
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Iterator, List, Optional
+from utils.cancellation import CancelToken
+from utils.walker import ParallelWalker
+
+ContentMatch = namedtuple('ContentMatch', ['path', 'line', 'column', 'text'])
+
+LITERAL = 'literal'
+IGNORE_CASE = 'ignore_case'
+REGEX = 'regex'
+
+SNIFF_SIZE = 8192
+MAX_LINE_LENGTH = 300
+FILES_PER_TASK = 64
+DEFAULT_EXCLUDES = ('.git', '.hg', '.svn', 'node_modules', '__pycache__')
+
+_pattern = None  # Compiled in each worker process by _init_worker
+
+
+def compile_pattern(pattern: str, mode: str = LITERAL):
+    """Compile a search pattern into a bytes regex usable on memory maps.
+
+    Args:
+        pattern (str): The text to look for.
+        mode (str): LITERAL, IGNORE_CASE or REGEX.
+
+    Returns:
+        re.Pattern: The compiled bytes pattern.
+
+    Raises:
+        re.error: If ``mode`` is REGEX and the pattern is invalid.
+    """
+    source = pattern.encode('utf-8')
+    if mode != REGEX:
+        source = re.escape(source)
+    flags = re.MULTILINE
+    if mode == IGNORE_CASE:
+        flags |= re.IGNORECASE
+    return re.compile(source, flags)
+
+
+def is_binary(data) -> bool:
+    """Guess whether a file is binary from its first bytes, as grep does."""
+    return b'\0' in data[:SNIFF_SIZE]
+
+
+def search_file(path: str, pattern, max_matches: Optional[int] = None) -> List[ContentMatch]:
+    """Return the matches of ``pattern`` in a single file.
+
+    The file is memory-mapped so the regex engine scans the page cache
+    directly. Empty, unreadable and binary files yield no matches.
+    """
+    matches = []
+    try:
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return matches
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if is_binary(mm):
+                    return matches
+                line, line_start, counted_to = 1, 0, 0
+                for match in pattern.finditer(mm):
+                    start = match.start()
+                    if start < line_start:
+                        continue  # Further match on a line already reported
+                    line += mm[counted_to:start].count(b'\n')
+                    counted_to = start
+                    line_start = mm.rfind(b'\n', 0, start) + 1
+                    line_end = mm.find(b'\n', start)
+                    if line_end == -1:
+                        line_end = len(mm)
+                    text = mm[line_start:min(line_end, line_start + MAX_LINE_LENGTH)]
+                    matches.append(ContentMatch(path, line, start - line_start + 1,
+                                                text.decode('utf-8', 'replace').rstrip('\r')))
+                    line_start = line_end + 1
+                    if max_matches is not None and len(matches) >= max_matches:
+                        break
+    except (OSError, ValueError):
+        pass
+    return matches
+
+
+def _init_worker(pattern: str, mode: str):
+    global _pattern
+    _pattern = compile_pattern(pattern, mode)
+
+
+def _search_files(paths: List[str], max_matches: Optional[int]) -> List[ContentMatch]:
+    matches = []
+    for path in paths:
+        matches.extend(search_file(path, _pattern, max_matches))
+    return matches
+
+
+class ContentSearcher:
+    """Search file contents below a root, spreading files over a process pool.
+
+    Files are discovered with ParallelWalker and handed to worker processes
+    in groups of FILES_PER_TASK, so the walk, the regex scanning and the
+    consumer all overlap. Each line is reported at most once, at its first
+    match.
+    """
+
+    def __init__(self, root_path: str, pattern: str, mode: str = LITERAL, max_workers: Optional[int] = None,
+                 max_matches_per_file: Optional[int] = None, exclude=DEFAULT_EXCLUDES,
+                 cancel_token: Optional[CancelToken] = None):
+        compile_pattern(pattern, mode)  # Fail fast on bad regexes, before spawning workers
+        self.root_path = root_path
+        self.pattern = pattern
+        self.mode = mode
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_matches_per_file = max_matches_per_file
+        self.exclude = exclude
+        self.cancel_token = cancel_token or CancelToken()
+
+    def _file_batches(self) -> Iterator[List[str]]:
+        batch = []
+        walker = ParallelWalker(self.root_path, exclude=self.exclude, cancel_token=self.cancel_token)
+        for _, _, files in walker.walk():
+            for entry in files:
+                batch.append(entry.path)
+                if len(batch) >= FILES_PER_TASK:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
+
+    def search(self) -> Iterator[List[ContentMatch]]:
+        """Yield lists of matches as worker processes complete them."""
+        max_pending = self.max_workers * 4
+        executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                       initargs=(self.pattern, self.mode))
+        try:
+            pending = set()
+            for batch in self._file_batches():
+                pending.add(executor.submit(_search_files, batch, self.max_matches_per_file))
+                if len(pending) >= max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        if future.result():
+                            yield future.result()
+                if self.cancel_token.cancelled:
+                    return
+            while pending and not self.cancel_token.cancelled:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future.result():
+                        yield future.result()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,278 @@
+# src/utils/copy_engine.py
+import errno
+import os
+import shutil
+import stat
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, List, Optional, Tuple
+from utils.cancellation import CancelToken
+from utils.hash_cache import HashCache, hash_file
+from utils.walker import ParallelWalker
+
+BUFFER_SIZE = 8 * 1024 * 1024
+KERNEL_CHUNK_SIZE = 64 * 1024 * 1024
+DEFAULT_COPY_WORKERS = 8
+FICLONE = 0x40049409  # Linux ioctl: share extents with the source (btrfs, XFS, bcachefs)
+
+# errnos that mean "this kernel path is not available here", not "the copy failed"
+_UNSUPPORTED = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTSUP,
+                errno.EBADF, errno.ETXTBSY, errno.EPERM}
+
+
+class CopyProgress:
+    """Thread-safe byte and file counters shared by the workers of one copy."""
+
+    def __init__(self, total_bytes: int = 0, total_files: int = 0,
+                 callback: Optional[Callable[['CopyProgress'], None]] = None):
+        self.total_bytes = total_bytes
+        self.total_files = total_files
+        self.bytes_done = 0
+        self.files_done = 0
+        self.started = time.monotonic()
+        self.callback = callback
+        self._lock = threading.Lock()
+
+    @property
+    def bytes_per_second(self) -> float:
+        elapsed = time.monotonic() - self.started
+        return self.bytes_done / elapsed if elapsed > 0 else 0.0
+
+    def add_bytes(self, count: int):
+        with self._lock:
+            self.bytes_done += count
+        if self.callback:
+            self.callback(self)
+
+    def file_done(self):
+        with self._lock:
+            self.files_done += 1
+        if self.callback:
+            self.callback(self)
+
+
+def _reflink(src_fd: int, dst_fd: int) -> bool:
+    if not sys.platform.startswith('linux'):
+        return False
+    import fcntl
+    try:
+        fcntl.ioctl(dst_fd, FICLONE, src_fd)
+        return True
+    except OSError:
+        return False
+
+
+def _copy_kernel(copy_chunk, size: int, progress: Optional[CopyProgress], cancel_token: CancelToken) -> int:
+    offset = 0
+    while offset < size:
+        cancel_token.raise_if_cancelled()
+        copied = copy_chunk(offset, min(KERNEL_CHUNK_SIZE, size - offset))
+        if copied == 0:
+            break  # Source shrank while copying
+        offset += copied
+        if progress:
+            progress.add_bytes(copied)
+    return offset
+
+
+def _copy_buffered(src, dst, progress: Optional[CopyProgress], cancel_token: CancelToken) -> int:
+    buffer = bytearray(BUFFER_SIZE)
+    view = memoryview(buffer)
+    copied = 0
+    while True:
+        cancel_token.raise_if_cancelled()
+        count = src.readinto(buffer)
+        if not count:
+            return copied
+        dst.write(view[:count])
+        copied += count
+        if progress:
+            progress.add_bytes(count)
+
+
+def _rewind(src, dst, progress: Optional[CopyProgress]):
+    """Undo a partial copy so that another method can start from the beginning."""
+    written = os.fstat(dst.fileno()).st_size
+    if progress and written:
+        progress.add_bytes(-written)
+    dst.seek(0)
+    dst.truncate()
+    src.seek(0)
+
+
+if hasattr(os, 'copy_file_range'):
+    def _copy_file_range(src_fd, dst_fd, offset, count):
+        return os.copy_file_range(src_fd, dst_fd, count, offset, offset)
+else:
+    _copy_file_range = None
+
+if sys.platform.startswith('linux'):
+    def _sendfile(src_fd, dst_fd, offset, count):
+        os.lseek(dst_fd, offset, os.SEEK_SET)
+        return os.sendfile(dst_fd, src_fd, offset, count)
+else:
+    _sendfile = None  # Elsewhere sendfile only writes to sockets
+
+
+def _verify_copy(src: str, dst: str, algorithm: str, hash_cache: Optional[HashCache]):
+    src_digest = hash_cache.digest(src, algorithm) if hash_cache else hash_file(src, algorithm)
+    # The copy is always read back: it may reuse a deleted file's inode,
+    # and copystat gave it the source's mtime, so a cached row could match.
+    st = os.stat(dst)
+    started = time.monotonic()
+    dst_digest = hash_file(dst, algorithm)
+    if dst_digest != src_digest:
+        raise OSError(errno.EIO, f"Checksum mismatch after copying {src}", dst)
+    if hash_cache:
+        hash_cache.store([(dst, st, dst_digest)], algorithm, time.monotonic() - started)
+
+
+def copy_file(src: str, dst: str, progress: Optional[CopyProgress] = None, cancel_token: Optional[CancelToken] = None,
+              verify: Optional[str] = None, hash_cache: Optional[HashCache] = None) -> int:
+    """Copy one file's data and metadata using the fastest path available.
+
+    Tries, in order: a reflink clone, ``os.copy_file_range``, ``os.sendfile``
+    and finally a large-buffer read/write loop, which also takes over when a
+    kernel copy ends short of the reported size or the size is 0. A
+    partially written destination is removed if the copy fails or is
+    cancelled.
+
+    Args:
+        src (str): The file to copy.
+        dst (str): The destination file path (not a directory).
+        progress (CopyProgress, optional): Receives the bytes as they are copied.
+        cancel_token (CancelToken, optional): Checked between chunks.
+        verify (str, optional): Hash algorithm name; compare both files' digests afterwards.
+        hash_cache (HashCache, optional): Supplies the source's digest if it is unchanged since last hashed.
+
+    Returns:
+        int: The number of bytes copied.
+
+    Raises:
+        CancelledError: If the token was cancelled.
+        OSError: If the copy fails, or verification finds a mismatch (EIO).
+    """
+    cancel_token = cancel_token or CancelToken()
+    with open(src, 'rb') as fsrc:
+        size = os.fstat(fsrc.fileno()).st_size
+        try:
+            with open(dst, 'wb') as fdst:
+                src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+                copied = None
+                if size and _reflink(src_fd, dst_fd):
+                    copied = size
+                    if progress:
+                        progress.add_bytes(size)
+                # Files reporting no size (procfs, sysfs, some FUSE mounts) may
+                # still have content, which only reading them reveals.
+                for kernel_copy in (_copy_file_range, _sendfile) if size else ():
+                    if copied is not None or kernel_copy is None:
+                        continue
+                    try:
+                        copied = _copy_kernel(lambda offset, count: kernel_copy(src_fd, dst_fd, offset, count),
+                                              size, progress, cancel_token)
+                    except OSError as e:
+                        if e.errno not in _UNSUPPORTED:
+                            raise
+                        _rewind(fsrc, fdst, progress)
+                        continue
+                    if copied < size:
+                        # Less data than reported; reading is the only way to get all of it
+                        _rewind(fsrc, fdst, progress)
+                        copied = None
+                        break
+                if copied is None:
+                    copied = _copy_buffered(fsrc, fdst, progress, cancel_token)
+        except BaseException:
+            try:
+                os.remove(dst)
+            except OSError:
+                pass
+            raise
+    shutil.copystat(src, dst)
+    if verify:
+        _verify_copy(src, dst, verify, hash_cache)
+    if progress:
+        progress.file_done()
+    return copied
+
+
+def plan_tree_copy(src: str, dst: str, cancel_token: Optional[CancelToken] = None) -> Tuple[List[str], List[Tuple[str, str]], List[Tuple[str, str]], int]:
+    """Walk ``src`` and list what copying it to ``dst`` involves.
+
+    Returns:
+        tuple: (directories to create, (src, dst) files, (src, dst) symlinks, total bytes).
+    """
+    src = os.path.abspath(src)
+    directories, files, links = [dst], [], []
+    total_bytes = 0
+    for dirpath, dirs, entries in ParallelWalker(src, cancel_token=cancel_token).walk():
+        target_dir = os.path.join(dst, os.path.relpath(dirpath, src))
+        for entry in dirs:
+            target = os.path.join(target_dir, entry.name)
+            if entry.is_symlink():
+                links.append((entry.path, target))
+            else:
+                directories.append(target)
+        for entry in entries:
+            target = os.path.join(target_dir, entry.name)
+            if entry.is_symlink():
+                links.append((entry.path, target))
+            elif entry.is_file(follow_symlinks=False):  # Sockets, FIFOs and devices are skipped
+                files.append((entry.path, target))
+                total_bytes += entry.stat(follow_symlinks=False).st_size
+    return directories, files, links, total_bytes
+
+
+def copy_tree(src: str, dst: str, max_workers: int = DEFAULT_COPY_WORKERS,
+              progress_callback: Optional[Callable[[CopyProgress], None]] = None,
+              cancel_token: Optional[CancelToken] = None, verify: Optional[str] = None,
+              hash_cache: Optional[HashCache] = None) -> CopyProgress:
+    """Copy a directory tree, many files at a time.
+
+    Directories are created up front, then files are copied by a thread
+    pool (the copy syscalls release the GIL) so trees of small files are
+    not bound by per-file latency. Symlinks are recreated, not followed.
+
+    Returns:
+        CopyProgress: The final counters, including throughput.
+    """
+    cancel_token = cancel_token or CancelToken()
+    directories, files, links, total_bytes = plan_tree_copy(src, dst, cancel_token)
+    cancel_token.raise_if_cancelled()
+    progress = CopyProgress(total_bytes, len(files), progress_callback)
+    for directory in sorted(directories):
+        os.makedirs(directory, exist_ok=True)
+    for link_src, link_dst in links:
+        os.symlink(os.readlink(link_src), link_dst, target_is_directory=os.path.isdir(link_src))
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='copy') as executor:
+        futures = [executor.submit(copy_file, file_src, file_dst, progress, cancel_token, verify, hash_cache)
+                   for file_src, file_dst in files]
+        try:
+            for future in as_completed(futures):
+                future.result()
+        except BaseException:
+            cancel_token.cancel()
+            raise
+
+    # Copying files into the directories bumped their mtimes; restore them last.
+    for directory in sorted(directories, reverse=True):
+        source = os.path.join(src, os.path.relpath(directory, dst))
+        try:
+            shutil.copystat(source, directory)
+        except OSError:
+            pass
+    return progress
+
+
+def copy_path(src: str, dst: str, **kwargs) -> CopyProgress:
+    """Copy a file or a directory tree to ``dst``."""
+    st = os.stat(src)
+    if stat.S_ISDIR(st.st_mode):
+        return copy_tree(src, dst, **kwargs)
+    progress = CopyProgress(st.st_size, 1, kwargs.get('progress_callback'))
+    copy_file(src, dst, progress, kwargs.get('cancel_token'), kwargs.get('verify'), kwargs.get('hash_cache'))
+    return progress
@@ -0,0 +1,299 @@
+# src/utils/delete_engine.py
+import ctypes
+import errno
+import os
+import stat
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Callable, List, Optional
+from urllib.parse import quote
+from utils.cancellation import CancelToken
+
+DEFAULT_DELETE_WORKERS = 8
+CANCEL_CHECK_INTERVAL = 256  # entries unlinked between cancellation checks
+
+_FD_SUPPORTED = (os.open in os.supports_dir_fd and os.unlink in os.supports_dir_fd
+                 and os.rmdir in os.supports_dir_fd and os.scandir in os.supports_fd)
+_DIR_FLAGS = os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0) | getattr(os, 'O_NOFOLLOW', 0) | getattr(os, 'O_CLOEXEC', 0)
+
+
+class DeleteProgress:
+    """Thread-safe count of the entries a delete has removed so far."""
+
+    def __init__(self, callback: Optional[Callable[['DeleteProgress'], None]] = None):
+        self.entries_done = 0
+        self.started = time.monotonic()
+        self.callback = callback
+        self._lock = threading.Lock()
+
+    @property
+    def entries_per_second(self) -> float:
+        elapsed = time.monotonic() - self.started
+        return self.entries_done / elapsed if elapsed > 0 else 0.0
+
+    def add_entries(self, count: int):
+        with self._lock:
+            self.entries_done += count
+        if self.callback:
+            self.callback(self)
+
+
+class _Directory:
+    """A directory being emptied; it is removed once its last subdirectory is."""
+
+    __slots__ = ('name', 'path', 'parent', 'fd', 'pending', 'lock')
+
+    def __init__(self, name: str, path: str, parent: Optional['_Directory']):
+        self.name = name
+        self.path = path
+        self.parent = parent
+        self.fd = None
+        self.pending = 0
+        self.lock = threading.Lock()
+
+
+class _TreeDeleter:
+    """Empties and removes a tree with a pool of threads sharing a LIFO stack.
+
+    Each directory is opened once and its entries are unlinked relative to
+    that descriptor, so paths are never resolved again and a directory
+    swapped for a symlink mid-delete cannot redirect the unlinks. Popping
+    the deepest work first keeps the number of open directories near
+    ``workers * depth`` rather than the width of the tree.
+    """
+
+    def __init__(self, root_path: str, max_workers: int, progress: DeleteProgress, cancel_token: CancelToken):
+        self.root = _Directory(root_path, root_path, None)
+        self.max_workers = max_workers
+        self.progress = progress
+        self.cancel_token = cancel_token
+        self.error: Optional[BaseException] = None
+        self._stack: List[_Directory] = [self.root]
+        self._open = set()
+        self._active = 0
+        self._finished = False
+        self._condition = threading.Condition()
+
+    def run(self):
+        threads = [threading.Thread(target=self._work, name=f'delete-{i}', daemon=True)
+                   for i in range(self.max_workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for directory in list(self._open):  # Left open by a failed or cancelled delete
+            os.close(directory.fd)
+        if self.error:
+            raise self.error
+
+    def _work(self):
+        while True:
+            with self._condition:
+                while not self._stack and self._active and not self._finished:
+                    self._condition.wait()
+                if self._finished or not self._stack:
+                    self._finished = True
+                    self._condition.notify_all()
+                    return
+                directory = self._stack.pop()
+                self._active += 1
+            try:
+                self._empty(directory)
+            except BaseException as e:
+                with self._condition:
+                    if self.error is None:
+                        self.error = e
+                    self._finished = True
+                    self._condition.notify_all()
+            with self._condition:
+                self._active -= 1
+                self._condition.notify_all()
+
+    def _empty(self, directory: _Directory):
+        self.cancel_token.raise_if_cancelled()
+        if _FD_SUPPORTED:
+            if directory.parent:
+                directory.fd = os.open(directory.name, _DIR_FLAGS, dir_fd=directory.parent.fd)
+            else:
+                directory.fd = os.open(directory.path, _DIR_FLAGS)
+            with self._condition:
+                self._open.add(directory)
+        subdirectories = []
+        removed = 0
+        with os.scandir(directory.fd if _FD_SUPPORTED else directory.path) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False) and not _is_junction(entry):
+                    subdirectories.append(_Directory(entry.name, os.path.join(directory.path, entry.name), directory))
+                    continue
+                self._unlink(directory, entry.name)
+                removed += 1
+                if removed % CANCEL_CHECK_INTERVAL == 0:
+                    self.progress.add_entries(CANCEL_CHECK_INTERVAL)
+                    self.cancel_token.raise_if_cancelled()
+        self.progress.add_entries(removed % CANCEL_CHECK_INTERVAL)
+        if not subdirectories:
+            self._remove(directory)
+            return
+        directory.pending = len(subdirectories)
+        with self._condition:
+            self._stack.extend(subdirectories)
+            self._condition.notify_all()
+
+    def _unlink(self, directory: _Directory, name: str):
+        try:
+            if _FD_SUPPORTED:
+                os.unlink(name, dir_fd=directory.fd)
+            else:
+                os.unlink(os.path.join(directory.path, name))
+        except PermissionError:
+            if _FD_SUPPORTED:
+                raise
+            # Windows refuses to delete read-only files
+            path = os.path.join(directory.path, name)
+            os.chmod(path, stat.S_IWRITE)
+            os.unlink(path)
+
+    def _remove(self, directory: _Directory):
+        """Remove an emptied directory, then its parent if this was its last subdirectory."""
+        while directory:
+            if _FD_SUPPORTED:
+                os.close(directory.fd)
+                with self._condition:
+                    self._open.discard(directory)
+            parent = directory.parent
+            if parent is None:
+                os.rmdir(directory.path)
+            elif _FD_SUPPORTED:
+                os.rmdir(directory.name, dir_fd=parent.fd)
+            else:
+                os.rmdir(directory.path)
+            self.progress.add_entries(1)
+            if parent is None:
+                return
+            with parent.lock:
+                parent.pending -= 1
+                if parent.pending:
+                    return
+            directory = parent
+
+
+def _is_junction(entry: os.DirEntry) -> bool:
+    # Windows junctions look like directories but must be removed, not descended into
+    if sys.platform != 'win32':
+        return False
+    return getattr(entry.stat(follow_symlinks=False), 'st_reparse_tag', 0) == stat.IO_REPARSE_TAG_MOUNT_POINT
+
+
+def delete_tree(path: str, max_workers: int = DEFAULT_DELETE_WORKERS,
+                progress_callback: Optional[Callable[[DeleteProgress], None]] = None,
+                cancel_token: Optional[CancelToken] = None) -> DeleteProgress:
+    """Delete ``path`` and everything below it, many subtrees at a time.
+
+    Symlinks are removed, never followed. A cancelled delete leaves the
+    entries it has not reached yet in place.
+
+    Returns:
+        DeleteProgress: The final counters.
+
+    Raises:
+        CancelledError: If the token was cancelled.
+        OSError: If an entry could not be removed.
+    """
+    cancel_token = cancel_token or CancelToken()
+    progress = DeleteProgress(progress_callback)
+    st = os.lstat(path)
+    if not stat.S_ISDIR(st.st_mode):
+        os.unlink(path)
+        progress.add_entries(1)
+        return progress
+    _TreeDeleter(os.path.abspath(path), max_workers, progress, cancel_token).run()
+    return progress
+
+
+def _home_trash() -> str:
+    data_home = os.environ.get('XDG_DATA_HOME') or os.path.expanduser('~/.local/share')
+    return os.path.join(data_home, 'Trash')
+
+
+def _mount_point(path: str) -> str:
+    device = os.lstat(path).st_dev
+    while True:
+        parent = os.path.dirname(path)
+        if parent == path or os.lstat(parent).st_dev != device:
+            return path
+        path = parent
+
+
+def _freedesktop_trash(path: str) -> str:
+    trash = _home_trash()
+    os.makedirs(trash, exist_ok=True)
+    if os.lstat(trash).st_dev != os.lstat(path).st_dev:
+        # Renames cannot cross filesystems; use the trash at the top of the path's own one
+        trash = os.path.join(_mount_point(path), f'.Trash-{os.getuid()}')
+    files_dir = os.path.join(trash, 'files')
+    info_dir = os.path.join(trash, 'info')
+    os.makedirs(files_dir, mode=0o700, exist_ok=True)
+    os.makedirs(info_dir, mode=0o700, exist_ok=True)
+
+    name, ext = os.path.splitext(os.path.basename(path))
+    candidate, number = name + ext, 1
+    while True:
+        try:  # O_EXCL claims the name atomically, as the spec requires
+            info_fd = os.open(os.path.join(info_dir, candidate + '.trashinfo'), os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            break
+        except FileExistsError:
+            number += 1
+            candidate = f"{name}.{number}{ext}"
+    with os.fdopen(info_fd, 'w') as info:
+        info.write(f"[Trash Info]\nPath={quote(path)}\nDeletionDate={datetime.now().strftime('%Y-%m-%dT%H:%M:%S')}\n")
+    target = os.path.join(files_dir, candidate)
+    try:
+        os.rename(path, target)
+    except OSError:
+        os.remove(os.path.join(info_dir, candidate + '.trashinfo'))
+        raise
+    return target
+
+
+def _windows_recycle(path: str) -> str:
+    from ctypes import wintypes
+
+    class SHFILEOPSTRUCTW(ctypes.Structure):
+        _fields_ = [('hwnd', wintypes.HWND), ('wFunc', wintypes.UINT), ('pFrom', wintypes.LPCWSTR),
+                    ('pTo', wintypes.LPCWSTR), ('fFlags', ctypes.c_uint16), ('fAnyOperationsAborted', wintypes.BOOL),
+                    ('hNameMappings', ctypes.c_void_p), ('lpszProgressTitle', wintypes.LPCWSTR)]
+
+    FO_DELETE, FOF_SILENT, FOF_NOCONFIRMATION, FOF_ALLOWUNDO, FOF_NOERRORUI = 0x3, 0x4, 0x10, 0x40, 0x400
+    operation = SHFILEOPSTRUCTW(wFunc=FO_DELETE, pFrom=path + '\0',  # The list is double NUL terminated
+                                fFlags=FOF_SILENT | FOF_NOCONFIRMATION | FOF_ALLOWUNDO | FOF_NOERRORUI)
+    result = ctypes.windll.shell32.SHFileOperationW(ctypes.byref(operation))
+    if result or operation.fAnyOperationsAborted:
+        raise OSError(errno.EIO, f"Could not move to the Recycle Bin (code {result})", path)
+    return path
+
+
+def move_to_trash(path: str) -> str:
+    """Move ``path`` to the desktop trash with a single rename of the top-level entry.
+
+    The cost does not depend on how many entries are below ``path``. Uses
+    the freedesktop.org trash on Linux and other Unixes, ``~/.Trash`` on
+    macOS and the Recycle Bin on Windows.
+
+    Returns:
+        str: Where the entry now lives (the original path on Windows).
+    """
+    path = os.path.abspath(path)
+    if sys.platform == 'win32':
+        return _windows_recycle(path)
+    if sys.platform == 'darwin':
+        trash = os.path.expanduser('~/.Trash')
+        name, ext = os.path.splitext(os.path.basename(path))
+        target, number = os.path.join(trash, name + ext), 1
+        while os.path.lexists(target):
+            number += 1
+            target = os.path.join(trash, f"{name} {number}{ext}")
+        os.rename(path, target)
+        return target
+    return _freedesktop_trash(path)
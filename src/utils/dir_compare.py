@@ -0,0 +1,221 @@
+# src/utils/dir_compare.py
+import os
+import shutil
+from bisect import bisect_left
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional
+from utils.cancellation import CancelToken
+from utils.copy_engine import DEFAULT_COPY_WORKERS, CopyProgress, copy_file
+from utils.delete_engine import delete_tree
+from utils.hash_cache import DEFAULT_ALGORITHM, HashCache, hash_file
+from utils.walker import ParallelWalker
+
+DIRECTORY = 'dir'
+FILE = 'file'
+LINK = 'link'
+
+Entry = namedtuple('Entry', ['kind', 'size', 'mtime_ns'])
+
+
+class DirectoryDiff:
+    """Differences between a source directory A and a target directory B.
+
+    All paths are relative. ``only_in_a`` and ``only_in_b`` list the top of
+    each missing subtree only (a directory missing from B is one entry, not
+    one per file inside it).
+    """
+
+    def __init__(self, source: str, target: str):
+        self.source = source
+        self.target = target
+        self.only_in_a: List[str] = []
+        self.only_in_b: List[str] = []
+        self.changed: List[str] = []
+        self.unchanged = 0
+        self.hashed = 0  # Files whose contents had to be compared
+        self.source_entries: Dict[str, Entry] = {}
+
+    def __bool__(self):
+        return bool(self.only_in_a or self.only_in_b or self.changed)
+
+
+def scan_tree(root_path: str, cancel_token: Optional[CancelToken] = None) -> Dict[str, Entry]:
+    """Map every path below ``root_path`` (relative, '/'-separated) to its kind, size and mtime."""
+    entries = {}
+    prefix = len(os.path.join(root_path, ''))
+    for _, dirs, files in ParallelWalker(root_path, cancel_token=cancel_token).walk():
+        for entry in dirs + files:
+            try:
+                st = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            if entry.is_symlink():
+                kind = LINK
+            elif entry.is_dir(follow_symlinks=False):
+                kind = DIRECTORY
+            elif entry.is_file(follow_symlinks=False):
+                kind = FILE
+            else:
+                continue  # Sockets, FIFOs and devices are not compared or copied
+            entries[entry.path[prefix:].replace(os.sep, '/')] = Entry(kind, st.st_size, st.st_mtime_ns)
+    return entries
+
+
+def _is_below_listed(path: str, listed: set) -> bool:
+    parent = path.rpartition('/')[0]
+    while parent:
+        if parent in listed:
+            return True
+        parent = parent.rpartition('/')[0]
+    return False
+
+
+def _top_level(paths, exclude_below: set = frozenset()) -> List[str]:
+    """Keep the paths none of whose ancestors are listed, in ``paths`` or in ``exclude_below``."""
+    listed = set(paths)
+    return sorted(path for path in listed
+                  if not _is_below_listed(path, listed) and not _is_below_listed(path, exclude_below))
+
+
+def compare_directories(source: str, target: str, hash_cache: Optional[HashCache] = None,
+                        algorithm: str = DEFAULT_ALGORITHM,
+                        cancel_token: Optional[CancelToken] = None) -> DirectoryDiff:
+    """Compare two trees, reading file contents only when size and mtime cannot decide.
+
+    Files with equal sizes and mtimes are taken as unchanged and files of
+    different sizes as changed, without opening either. Equal sizes with
+    different mtimes are settled by digests, from ``hash_cache`` where the
+    files were hashed before.
+    """
+    cancel_token = cancel_token or CancelToken()
+    diff = DirectoryDiff(os.path.abspath(source), os.path.abspath(target))
+    with ThreadPoolExecutor(max_workers=1) as executor:  # Both trees are walked at once
+        source_future = executor.submit(scan_tree, diff.source, cancel_token)
+        target_entries = scan_tree(diff.target, cancel_token)
+        source_entries = source_future.result()
+    cancel_token.raise_if_cancelled()
+    diff.source_entries = source_entries
+
+    only_in_a, changed, ambiguous = [], [], []
+    for path, entry in source_entries.items():
+        other = target_entries.get(path)
+        if other is None:
+            only_in_a.append(path)
+        elif other.kind != entry.kind:
+            changed.append(path)
+        elif entry.kind == DIRECTORY:
+            continue
+        elif entry.kind == LINK:
+            if os.readlink(os.path.join(diff.source, path)) != os.readlink(os.path.join(diff.target, path)):
+                changed.append(path)
+            else:
+                diff.unchanged += 1
+        elif entry.size != other.size:
+            changed.append(path)
+        elif entry.mtime_ns == other.mtime_ns:
+            diff.unchanged += 1
+        else:
+            ambiguous.append(path)
+    # An entry that changed kind is replaced with its whole subtree, which
+    # covers the entries below it on either side.
+    replaced = set(changed)
+    diff.only_in_a = _top_level(only_in_a, replaced)
+    diff.only_in_b = _top_level((path for path in target_entries if path not in source_entries), replaced)
+
+    if ambiguous:
+        diff.hashed = len(ambiguous)
+        source_paths = [os.path.join(diff.source, path) for path in ambiguous]
+        target_paths = [os.path.join(diff.target, path) for path in ambiguous]
+        if hash_cache:
+            digests = dict(hash_cache.digests(source_paths + target_paths, algorithm, cancel_token=cancel_token))
+        else:
+            digests = {path: hash_file(path, algorithm) for path in source_paths + target_paths}
+        for path, source_path, target_path in zip(ambiguous, source_paths, target_paths):
+            if digests.get(source_path) is None or digests.get(source_path) != digests.get(target_path):
+                changed.append(path)
+            else:
+                diff.unchanged += 1
+    diff.changed = sorted(changed)
+    return diff
+
+
+def _replace_file(src: str, dst: str, progress: CopyProgress, cancel_token: CancelToken):
+    # Copy next to the old file and swap it in, so a failed copy leaves the old one intact
+    temporary = f"{dst}.mirror-{os.getpid()}.tmp"
+    copy_file(src, temporary, progress, cancel_token)
+    os.replace(temporary, dst)
+
+
+def mirror(diff: DirectoryDiff, max_workers: int = DEFAULT_COPY_WORKERS,
+           progress_callback: Optional[Callable[[CopyProgress], None]] = None,
+           cancel_token: Optional[CancelToken] = None) -> CopyProgress:
+    """Make ``diff.target`` match ``diff.source`` by applying only the differences.
+
+    Entries only in B are deleted, entries only in A are copied, and
+    changed files are replaced. Subtrees missing from B are expanded from
+    the source scan, so all their files are copied by one thread pool and
+    unchanged files are never read.
+    """
+    cancel_token = cancel_token or CancelToken()
+    source, target = diff.source, diff.target
+    source_paths = sorted(diff.source_entries)
+
+    def native(path):
+        return path.replace('/', os.sep)
+
+    def with_descendants(path):
+        yield path
+        if diff.source_entries[path].kind == DIRECTORY:
+            # '/' sorts just before '0', so the subtree is one contiguous range
+            for descendant in source_paths[bisect_left(source_paths, path + '/'):bisect_left(source_paths, path + '0')]:
+                yield descendant
+
+    for path in diff.only_in_b:
+        cancel_token.raise_if_cancelled()
+        delete_tree(os.path.join(target, native(path)), cancel_token=cancel_token)
+
+    directories, links, files = [], [], []  # files: (relative path, replace an existing file)
+    for path in diff.changed:
+        target_path = os.path.join(target, native(path))
+        if diff.source_entries[path].kind == FILE and os.path.isfile(target_path) and not os.path.islink(target_path):
+            files.append((path, True))
+            continue
+        if os.path.lexists(target_path):  # Kind changed, or a link points elsewhere
+            delete_tree(target_path, cancel_token=cancel_token)
+        for descendant in with_descendants(path):
+            kind = diff.source_entries[descendant].kind
+            (directories if kind == DIRECTORY else links if kind == LINK else files).append((descendant, False))
+    for path in diff.only_in_a:
+        for descendant in with_descendants(path):
+            kind = diff.source_entries[descendant].kind
+            (directories if kind == DIRECTORY else links if kind == LINK else files).append((descendant, False))
+
+    cancel_token.raise_if_cancelled()
+    total_bytes = sum(diff.source_entries[path].size for path, _ in files)
+    progress = CopyProgress(total_bytes, len(files), progress_callback)
+    directories.sort()
+    for path, _ in directories:
+        os.makedirs(os.path.join(target, native(path)), exist_ok=True)
+    for path, _ in links:
+        src = os.path.join(source, native(path))
+        os.symlink(os.readlink(src), os.path.join(target, native(path)), target_is_directory=os.path.isdir(src))
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='mirror') as executor:
+        futures = [executor.submit(_replace_file if replace else copy_file, os.path.join(source, native(path)),
+                                   os.path.join(target, native(path)), progress, cancel_token)
+                   for path, replace in files]
+        try:
+            for future in as_completed(futures):
+                future.result()
+        except BaseException:
+            cancel_token.cancel()
+            raise
+
+    # Copying into the new directories bumped their mtimes; restore them last.
+    for path, _ in reversed(directories):
+        try:
+            shutil.copystat(os.path.join(source, native(path)), os.path.join(target, native(path)))
+        except OSError:
+            pass
+    return progress
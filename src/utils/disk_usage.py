@@ -0,0 +1,182 @@
+# src/utils/disk_usage.py
+import os
+import sqlite3
+import stat
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List, Optional, Tuple
+from utils.cancellation import CancelToken
+from utils.utils import CACHE_DIR
+
+DirectoryUsage = namedtuple('DirectoryUsage', ['apparent', 'allocated', 'files'])
+EMPTY_USAGE = DirectoryUsage(0, 0, 0)
+
+DEFAULT_USAGE_WORKERS = 8
+COMMIT_INTERVAL = 1000  # directories stored between commits
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS directories (
+    dev INTEGER NOT NULL,
+    ino INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    apparent INTEGER NOT NULL,
+    allocated INTEGER NOT NULL,
+    files INTEGER NOT NULL,
+    subdirs TEXT NOT NULL,
+    PRIMARY KEY (dev, ino)
+) WITHOUT ROWID;
+"""
+
+
+def add_usage(a: DirectoryUsage, b: DirectoryUsage) -> DirectoryUsage:
+    return DirectoryUsage(a.apparent + b.apparent, a.allocated + b.allocated, a.files + b.files)
+
+
+def allocated_size(st: os.stat_result) -> int:
+    blocks = getattr(st, 'st_blocks', None)
+    return blocks * 512 if blocks is not None else st.st_size  # Windows has no block counts
+
+
+class DiskUsageCache:
+    """Persistent per-directory usage keyed by (device, inode, mtime).
+
+    A row holds the totals of the files directly inside one directory plus
+    the names of its subdirectories. Adding, removing or renaming an entry
+    bumps the directory's mtime, so a row whose key still matches is
+    current and the directory need not be listed again; subtree totals are
+    summed from the rows of the directories below. Files changing size in
+    place do not touch the mtime, which is what ``invalidate`` is for.
+    """
+
+    def __init__(self, cache_path: Optional[str] = None):
+        if cache_path is None:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            cache_path = os.path.join(CACHE_DIR, 'disk_usage.sqlite')
+        self.cache_path = cache_path
+        # Shared by the scanner's worker threads, serialized by the lock.
+        self.connection = sqlite3.connect(cache_path, check_same_thread=False)
+        self.connection.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self._uncommitted = 0
+
+    def lookup(self, st: os.stat_result) -> Optional[Tuple[DirectoryUsage, List[str]]]:
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT mtime_ns, apparent, allocated, files, subdirs FROM directories WHERE dev = ? AND ino = ?",
+                (st.st_dev, st.st_ino)).fetchone()
+        if row is None or row[0] != st.st_mtime_ns:
+            return None
+        return DirectoryUsage(*row[1:4]), row[4].split('\0') if row[4] else []
+
+    def store(self, st: os.stat_result, usage: DirectoryUsage, subdirs: List[str]):
+        with self._lock:
+            self.connection.execute("INSERT OR REPLACE INTO directories VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                    (st.st_dev, st.st_ino, st.st_mtime_ns, *usage, '\0'.join(subdirs)))
+            self._uncommitted += 1
+            if self._uncommitted >= COMMIT_INTERVAL:
+                self.connection.commit()
+                self._uncommitted = 0
+
+    def invalidate(self, directories: Iterable[str]):
+        """Forget the rows of ``directories``, e.g. after files in them changed size."""
+        with self._lock:
+            for directory in directories:
+                try:
+                    st = os.lstat(directory)
+                except OSError:
+                    continue
+                self.connection.execute("DELETE FROM directories WHERE dev = ? AND ino = ?", (st.st_dev, st.st_ino))
+            self.connection.commit()
+
+    def commit(self):
+        with self._lock:
+            self.connection.commit()
+            self._uncommitted = 0
+
+    def close(self):
+        self.commit()
+        self.connection.close()
+
+
+class DiskUsageScanner:
+    """Computes recursive usage for a directory, reusing DiskUsageCache rows.
+
+    The root's subdirectories are scanned in parallel. ``on_directory`` is
+    called with ``(path, usage)`` for every directory as soon as its total
+    is known, deepest first. Like ``du -x``, other filesystems mounted
+    below the root are not entered, and symlinks count as themselves.
+    """
+
+    def __init__(self, root_path: str, cache: DiskUsageCache, max_workers: int = DEFAULT_USAGE_WORKERS,
+                 on_directory: Optional[Callable[[str, DirectoryUsage], None]] = None,
+                 cancel_token: Optional[CancelToken] = None):
+        self.root_path = os.path.abspath(root_path)
+        self.cache = cache
+        self.max_workers = max_workers
+        self.on_directory = on_directory
+        self.cancel_token = cancel_token or CancelToken()
+        self.directories_listed = 0
+        self.directories_cached = 0
+
+    def scan(self) -> DirectoryUsage:
+        st = os.lstat(self.root_path)
+        own, subdirs = self._own_usage(self.root_path, st)
+        total = own
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='disk-usage') as executor:
+            futures = [executor.submit(self._subtree_usage, os.path.join(self.root_path, name), st.st_dev)
+                       for name in subdirs]
+            try:
+                for future in futures:
+                    total = add_usage(total, future.result())
+            except BaseException:
+                self.cancel_token.cancel()
+                raise
+        self.cache.commit()
+        if self.on_directory:
+            self.on_directory(self.root_path, total)
+        return total
+
+    def _own_usage(self, path: str, st: os.stat_result) -> Tuple[DirectoryUsage, List[str]]:
+        cached = self.cache.lookup(st)
+        if cached is not None:
+            self.directories_cached += 1
+            own, subdirs = cached
+        else:
+            self.directories_listed += 1
+            apparent = allocated = files = 0
+            subdirs = []
+            try:
+                with os.scandir(path) as it:
+                    for entry in it:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                subdirs.append(entry.name)
+                                continue
+                            entry_st = entry.stat(follow_symlinks=False)
+                        except OSError:
+                            continue
+                        apparent += entry_st.st_size
+                        allocated += allocated_size(entry_st)
+                        files += 1
+            except OSError:
+                return EMPTY_USAGE, []  # Unreadable: counts as empty, and is not cached
+            own = DirectoryUsage(apparent, allocated, files)
+            self.cache.store(st, own, subdirs)
+        # The directory itself takes up space too
+        return own._replace(apparent=own.apparent + st.st_size, allocated=own.allocated + allocated_size(st)), subdirs
+
+    def _subtree_usage(self, path: str, device: int) -> DirectoryUsage:
+        self.cancel_token.raise_if_cancelled()
+        try:
+            st = os.lstat(path)
+        except OSError:
+            return EMPTY_USAGE
+        if not stat.S_ISDIR(st.st_mode) or st.st_dev != device:
+            return EMPTY_USAGE
+        total, subdirs = self._own_usage(path, st)
+        for name in subdirs:
+            total = add_usage(total, self._subtree_usage(os.path.join(path, name), device))
+        if self.on_directory:
+            self.on_directory(path, total)
+        return total
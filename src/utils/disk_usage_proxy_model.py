@@ -0,0 +1,75 @@
+# src/utils/disk_usage_proxy_model.py
+
+import os
+from PyQt6.QtCore import QModelIndex, QSortFilterProxyModel, Qt, QTimer
+from utils.utils import format_size
+
+SIZE_COLUMN = 1  # QFileSystemModel's "Size" column
+RESORT_INTERVAL_MS = 1000  # Least time between re-sorts by size while totals arrive
+
+class DiskUsageProxyModel(QSortFilterProxyModel):
+    """Shows computed directory totals in QFileSystemModel's Size column and sorts by them."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.usage = {}  # directory path -> DirectoryUsage
+        self._resort_timer = QTimer(self)
+        self._resort_timer.setSingleShot(True)
+        self._resort_timer.setInterval(RESORT_INTERVAL_MS)
+        self._resort_timer.timeout.connect(self.invalidate)
+
+    def add_usage(self, usage):
+        self.usage.update(usage)
+        parents = {os.path.dirname(path) for path in usage}
+        # Only rows the model has already loaded are updated: looking a path
+        # up with QFileSystemModel.index() would load every directory along it.
+        pending = [QModelIndex()]
+        while pending:
+            parent = pending.pop()
+            rows = self.rowCount(parent)
+            if not rows:
+                continue
+            if parent.isValid() and os.path.normpath(self.sourceModel().filePath(self.mapToSource(parent))) in parents:
+                self.dataChanged.emit(self.index(0, SIZE_COLUMN, parent), self.index(rows - 1, SIZE_COLUMN, parent),
+                                      [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole])
+            pending.extend(self.index(row, 0, parent) for row in range(rows))
+        if self.sortColumn() == SIZE_COLUMN and not self._resort_timer.isActive():
+            self._resort_timer.start()  # Re-sort with the new totals, at most once per interval
+
+    def clear_usage(self):
+        self.usage = {}
+
+    def _size_key(self, source_index):
+        source = self.sourceModel()
+        if source.isDir(source_index):
+            usage = self.usage.get(os.path.normpath(source.filePath(source_index)))
+            return usage.apparent if usage else -1  # Not computed yet
+        return source.size(source_index)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if index.column() == SIZE_COLUMN and role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+            source = self.sourceModel()
+            source_index = self.mapToSource(index)
+            if source.isDir(source_index):
+                usage = self.usage.get(os.path.normpath(source.filePath(source_index)))
+                if usage is None:
+                    return ""
+                if role == Qt.ItemDataRole.ToolTipRole:
+                    return (f"{format_size(usage.apparent)} ({format_size(usage.allocated)} on disk), "
+                            f"{usage.files} files")
+                return format_size(usage.apparent)
+            if role == Qt.ItemDataRole.DisplayRole:
+                return format_size(source.size(source_index))
+        return super().data(index, role)
+
+    def lessThan(self, left, right):
+        source = self.sourceModel()
+        # Keep directories above files, as QFileSystemModel does
+        left_dir, right_dir = source.isDir(left), source.isDir(right)
+        if left_dir != right_dir:
+            return left_dir if self.sortOrder() == Qt.SortOrder.AscendingOrder else right_dir
+        if left.column() == SIZE_COLUMN:
+            return self._size_key(left) < self._size_key(right)
+        if left.column() == 0:
+            return source.fileName(left).casefold() < source.fileName(right).casefold()
+        return super().lessThan(left, right)
@@ -0,0 +1,54 @@
+# src/utils/disk_usage_thread.py
+import sqlite3
+import threading
+import time
+from PyQt6.QtCore import QThread, pyqtSignal
+from utils.cancellation import CancelToken, CancelledError
+from utils.disk_usage import DiskUsageCache, DiskUsageScanner
+
+BATCH_INTERVAL = 0.1  # seconds between usage batches
+
+class DiskUsageThread(QThread):
+    """Computes directory totals below a root and streams them to the GUI.
+
+    ``usage_found`` carries ``{path: DirectoryUsage}`` batches as subtrees
+    finish, the root's own total last.
+    """
+
+    usage_found = pyqtSignal(dict)
+
+    def __init__(self, root_path: str, parent=None):
+        super().__init__(parent)
+        self.root_path = root_path
+        self.cancel_token = CancelToken()
+        self._batch = {}
+        self._batch_lock = threading.Lock()
+        self._last_emit = 0.0
+
+    def cancel(self):
+        self.cancel_token.cancel()
+
+    def run(self):
+        cache = DiskUsageCache()
+        try:
+            scanner = DiskUsageScanner(self.root_path, cache, on_directory=self._add_usage, cancel_token=self.cancel_token)
+            scanner.scan()
+        except (CancelledError, OSError, sqlite3.Error):
+            return
+        finally:
+            cache.close()  # Keeps what a cancelled scan already computed
+        self._flush()
+
+    def _add_usage(self, path, usage):
+        # Called from the scanner's worker threads
+        with self._batch_lock:
+            self._batch[path] = usage
+        if time.monotonic() - self._last_emit >= BATCH_INTERVAL:
+            self._flush()
+
+    def _flush(self):
+        with self._batch_lock:
+            batch, self._batch = self._batch, {}
+            self._last_emit = time.monotonic()
+        if batch and not self.cancel_token.cancelled:
+            self.usage_found.emit(batch)
@@ -0,0 +1,165 @@
+# src/utils/duplicate_finder.py
+import hashlib
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+from utils.cancellation import CancelToken
+from utils.content_search import DEFAULT_EXCLUDES
+from utils.hash_cache import DEFAULT_ALGORITHM, HashCache, hash_file
+from utils.walker import ParallelWalker
+
+PARTIAL_SIZE = 64 * 1024  # bytes hashed at each end of a file in the second stage
+FILES_PER_ROUND = 4096  # candidate files hashed per round, bounding the hashes held at once
+PARTIAL_ALGORITHM = 'blake2b-ends'  # HashCache name for partial_hash digests
+
+DuplicateGroup = namedtuple('DuplicateGroup', ['size', 'paths'])
+
+
+def reclaimable_bytes(group: DuplicateGroup) -> int:
+    """Bytes freed by keeping one copy of the group."""
+    return group.size * (len(group.paths) - 1)
+
+
+def partial_hash(path: str) -> Optional[bytes]:
+    """Hash the first and last PARTIAL_SIZE bytes; for small files this covers the whole file."""
+    try:
+        with open(path, 'rb') as f:
+            digest = hashlib.blake2b(f.read(PARTIAL_SIZE), digest_size=16)
+            size = os.fstat(f.fileno()).st_size
+            if size > PARTIAL_SIZE:
+                f.seek(max(PARTIAL_SIZE, size - PARTIAL_SIZE))
+                digest.update(f.read(PARTIAL_SIZE))
+            return digest.digest()
+    except OSError:
+        return None
+
+
+def full_hash(path: str) -> Optional[bytes]:
+    try:
+        return hash_file(path, DEFAULT_ALGORITHM)
+    except OSError:
+        return None
+
+
+def _regroup(paths: List[str], digests: List[Optional[bytes]]) -> List[List[str]]:
+    groups: Dict[bytes, List[str]] = {}
+    for path, digest in zip(paths, digests):
+        if digest is not None:
+            groups.setdefault(digest, []).append(path)
+    return [group for group in groups.values() if len(group) > 1]
+
+
+class DuplicateFinder:
+    """Finds files with identical contents below a root in three stages.
+
+    1. Group by size (from the walk, no file is opened).
+    2. Hash the first and last 64 KB of files that share a size.
+    3. Fully hash only the files whose partial hashes still collide.
+
+    Hashing runs on a process pool. Size groups are processed in rounds of
+    about FILES_PER_ROUND files, largest sizes first, and each round's
+    digests are dropped once its groups are yielded, so memory holds the
+    size map but never a hash for every file. Hard links to one inode are
+    counted once, since deleting them frees nothing. With a HashCache, both
+    stages take the digests of unchanged files from it.
+    """
+
+    def __init__(self, root_path: str, min_size: int = 1, max_workers: Optional[int] = None,
+                 exclude=DEFAULT_EXCLUDES, cancel_token: Optional[CancelToken] = None,
+                 hash_cache: Optional[HashCache] = None):
+        self.root_path = root_path
+        self.hash_cache = hash_cache
+        self.min_size = min_size
+        self.max_workers = max_workers
+        self.exclude = exclude
+        self.cancel_token = cancel_token or CancelToken()
+        self.files_scanned = 0
+        self.files_partially_hashed = 0
+        self.files_fully_hashed = 0
+
+    def _size_groups(self) -> List[Tuple[int, List[str]]]:
+        by_size: Dict[int, List[str]] = {}
+        inodes = set()
+        walker = ParallelWalker(self.root_path, exclude=self.exclude, cancel_token=self.cancel_token)
+        for _, _, files in walker.walk():
+            for entry in files:
+                try:
+                    if not entry.is_file(follow_symlinks=False):
+                        continue
+                    st = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                self.files_scanned += 1
+                if st.st_size < self.min_size:
+                    continue
+                if st.st_nlink > 1:
+                    inode = (st.st_dev, st.st_ino)
+                    if inode in inodes:
+                        continue
+                    inodes.add(inode)
+                by_size.setdefault(st.st_size, []).append(entry.path)
+        return sorted(((size, paths) for size, paths in by_size.items() if len(paths) > 1), reverse=True)
+
+    def find(self) -> Iterator[DuplicateGroup]:
+        """Yield groups of identical files as they are confirmed."""
+        size_groups = self._size_groups()
+        executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        try:
+            round_groups: List[Tuple[int, List[str]]] = []
+            round_files = 0
+            for size, paths in size_groups:
+                if self.cancel_token.cancelled:
+                    return
+                round_groups.append((size, paths))
+                round_files += len(paths)
+                if round_files >= FILES_PER_ROUND:
+                    yield from self._hash_round(executor, round_groups)
+                    round_groups, round_files = [], 0
+            if round_groups and not self.cancel_token.cancelled:
+                yield from self._hash_round(executor, round_groups)
+        finally:
+            executor.shutdown(cancel_futures=True)  # A cancelled search drops its queued hashes
+
+    def _hash(self, executor, function, algorithm: str, paths: List[str], chunksize: int) -> List[Optional[bytes]]:
+        """Digest ``paths`` in order, hashing only the cache misses on the pool."""
+        if self.hash_cache is None:
+            return list(executor.map(function, paths, chunksize=chunksize))
+        stats = {}
+        for path in paths:
+            try:
+                stats[path] = os.stat(path)
+            except OSError:
+                pass
+        cached = self.hash_cache.lookup(stats, algorithm)
+        missing = [path for path in stats if path not in cached]
+        started = time.monotonic()
+        computed = dict(zip(missing, executor.map(function, missing, chunksize=chunksize)))
+        self.hash_cache.store([(path, stats[path], digest) for path, digest in computed.items() if digest is not None],
+                              algorithm, time.monotonic() - started)
+        return [cached.get(path) or computed.get(path) for path in paths]
+
+    def _hash_round(self, executor, size_groups: List[Tuple[int, List[str]]]) -> Iterator[DuplicateGroup]:
+        paths = [path for _, group in size_groups for path in group]
+        self.files_partially_hashed += len(paths)
+        digests = iter(self._hash(executor, partial_hash, PARTIAL_ALGORITHM, paths, 32))
+        candidates = []  # (size, paths) still colliding after the partial hash
+        for size, group in size_groups:
+            if self.cancel_token.cancelled:
+                return
+            for matches in _regroup(group, [next(digests) for _ in group]):
+                if size <= 2 * PARTIAL_SIZE:
+                    yield DuplicateGroup(size, sorted(matches))  # The partial hash read the whole file
+                else:
+                    candidates.append((size, matches))
+        if self.cancel_token.cancelled or not candidates:
+            return
+        paths = [path for _, group in candidates for path in group]
+        self.files_fully_hashed += len(paths)
+        digests = iter(self._hash(executor, full_hash, DEFAULT_ALGORITHM, paths, 4))
+        for size, group in candidates:
+            if self.cancel_token.cancelled:
+                return
+            for matches in _regroup(group, [next(digests) for _ in group]):
+                yield DuplicateGroup(size, sorted(matches))
@@ -0,0 +1,49 @@
+# src/utils/duplicate_thread.py
+import sqlite3
+import time
+from PyQt6.QtCore import QThread, pyqtSignal
+from utils.cancellation import CancelToken, CancelledError
+from utils.duplicate_finder import DuplicateFinder, reclaimable_bytes
+from utils.hash_cache import HashCache
+
+BATCH_INTERVAL = 0.1  # seconds between group batches
+
+class DuplicateSearchThread(QThread):
+    groups_found = pyqtSignal(list)
+    search_complete = pyqtSignal(int, 'qint64')  # groups, reclaimable bytes
+
+    def __init__(self, root_path: str, min_size: int = 1, parent=None):
+        super().__init__(parent)
+        self.root_path = root_path
+        self.min_size = min_size
+        self.cancel_token = CancelToken()
+        self.finder = None
+        self.hash_cache = None
+
+    def cancel(self):
+        self.cancel_token.cancel()
+
+    def run(self):
+        self.hash_cache = HashCache()
+        self.finder = DuplicateFinder(self.root_path, self.min_size, cancel_token=self.cancel_token,
+                                      hash_cache=self.hash_cache)
+        batch = []
+        group_count = reclaimable = 0
+        last_emit = 0.0
+        try:
+            for group in self.finder.find():
+                batch.append(group)
+                group_count += 1
+                reclaimable += reclaimable_bytes(group)
+                if time.monotonic() - last_emit >= BATCH_INTERVAL:
+                    self.groups_found.emit(batch)
+                    batch, last_emit = [], time.monotonic()
+        except (CancelledError, OSError, sqlite3.Error):
+            return
+        finally:
+            self.hash_cache.close()
+        if self.cancel_token.cancelled:
+            return
+        if batch:
+            self.groups_found.emit(batch)
+        self.search_complete.emit(group_count, reclaimable)
@@ -1,7 +1,7 @@
 # src/file_operations.py
 
 import os
-import shutil
+from utils import copy_engine, delete_engine
 
 def create_file(path):
     with open(path, 'w') as f:
@@ -14,10 +14,15 @@ def delete_file(path):
     os.remove(path)
 
 def copy_file(src, dest):
-    shutil.copy(src, dest)
+    if os.path.isdir(dest):
+        dest = os.path.join(dest, os.path.basename(src))
+    copy_engine.copy_file(src, dest)
+
+def copy_directory(src, dest):
+    copy_engine.copy_tree(src, dest)
 
 def create_directory(path):
     os.makedirs(path, exist_ok=True)
 
 def delete_directory(path):
-    shutil.rmtree(path)
+    delete_engine.delete_tree(path)
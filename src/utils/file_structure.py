@@ -1,7 +1,12 @@
 # src/utils/file_structure.py
 import os
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple
 from PyQt6.QtWidgets import QMessageBox
+from utils.structure_parser import parse_structure
+
+DEFAULT_STRUCTURE_WORKERS = 8
+PLAN_CHUNK_SIZE = 512  # entries created or listed per worker task
 
 class FileStructureError(Exception):
     """Base class for file structure errors."""
@@ -11,166 +16,287 @@ class InvalidStructureError(FileStructureError):
     """Raised when the input structure is invalid."""
     pass
 
-class FileStructure:
-    """Class for creating a file structure based on user input."""
+class PlanDiff:
+    """The result of checking a StructurePlan against the disk.
 
-    def __init__(self, status_bar):
-        self.status_bar = status_bar
-        self.current_directory = None
+    All paths are relative to the plan's root.
+    """
 
-    def set_current_directory(self, path: str):
-        """Set the current directory for creating the file structure.
+    def __init__(self):
+        self.missing_directories: List[str] = []
+        self.missing_files: List[str] = []
+        self.existing = 0
+        self.conflicts: List[str] = []  # Planned as one kind, present on disk as the other
 
-        Args:
-            path (str): The current directory path.
-        """
-        self.current_directory = path
+    def summary(self) -> str:
+        """Describe the diff in one line.
 
-    def create_file_structure(self, structure: str):
-        """Create a file structure based on the input structure.
+        Returns:
+            str: Counts of the entries to create, already present and in conflict.
+        """
+        text = (f"{len(self.missing_directories)} directories and {len(self.missing_files)} files to create, "
+                f"{self.existing} already exist")
+        if self.conflicts:
+            text += f", {len(self.conflicts)} conflicts ({', '.join(self.conflicts[:5])})"
+        return text
 
-        Args:
-            structure (str): The input structure as a string.
+class StructurePlan:
+    """A deduplicated set of directories and files to create below a root.
 
-        Raises:
-            FileStructureError: If the current directory is not set.
-            InvalidStructureError: If the input structure is invalid.
-        """
-        if not self.current_directory:
-            raise FileStructureError("Current directory is not set.")
+    Adding a path also adds its parent directories, so every directory is
+    created by exactly one ``mkdir`` and every file by one ``open``, with
+    no ``makedirs`` probing of ancestors. ``diff`` lists each existing
+    directory at most once instead of stat-ing every planned entry.
+    """
 
-        try:
-            if self.is_valid_structure(structure):
-                self._create_from_structure(structure)
-            else:
-                self._create_from_manual_input(structure)
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+        self.directories: Set[str] = set()
+        self.files: Set[str] = set()
 
-            self.status_bar.showMessage("File structure created successfully.")
-        except Exception as e:
-            QMessageBox.critical(None, "Error", f"Could not create file structure. Error: {e}")
-            self.status_bar.showMessage(f"Error creating file structure: {e}")
+    def __len__(self):
+        return len(self.directories) + len(self.files)
 
-    def is_valid_structure(self, structure: str) -> bool:
-        """Check if the input structure is valid.
+    def add(self, relative_path: str, is_file: bool) -> List[Tuple[str, bool]]:
+        """Add a path to the plan.
 
         Args:
-            structure (str): The input structure as a string.
+            relative_path (str): The path relative to the root.
+            is_file (bool): Whether the path is a file rather than a directory.
 
         Returns:
-            bool: True if the structure is valid, False otherwise.
-        """
-        return any(char in structure for char in ['┣', '┗', '┃', '📂', '📜'])
+            list: ``(path, is_file)`` of the entries new to the plan, parents first.
 
-    def _create_from_structure(self, structure: str):
-        """Create the file structure from a valid input structure.
+        Raises:
+            InvalidStructureError: If the path points outside the root.
+        """
+        if relative_path in (self.files if is_file else self.directories):
+            return []  # Only normalized paths are stored, so this one was checked already
+        path = os.path.normpath(relative_path)
+        if path == os.curdir:
+            return []
+        if os.path.isabs(path) or path == os.pardir or path.startswith(os.pardir + os.sep):
+            raise InvalidStructureError(f"{relative_path} is outside the current directory.")
+        (self.files if is_file else self.directories).add(path)
+        added = [(path, is_file)]
+        parent = os.path.dirname(path)
+        while parent and parent not in self.directories:
+            self.directories.add(parent)
+            added.append((parent, False))
+            parent = os.path.dirname(parent)
+        added.reverse()
+        return added
+
+    def create(self, relative_path: str, is_file: bool) -> List[Tuple[str, bool]]:
+        """Add a path to the plan and create it on disk right away, with its missing parents.
+
+        For structures that arrive one entry at a time, such as a streamed AI
+        response, where waiting for the whole plan would delay every entry.
+        Existing files are left untouched, as with ``execute``.
 
         Args:
-            structure (str): The input structure as a string.
+            relative_path (str): The path relative to the root.
+            is_file (bool): Whether the path is a file rather than a directory.
+
+        Returns:
+            list: ``(path, is_file)`` of the entries created, parents first.
 
         Raises:
-            InvalidStructureError: If the input structure is invalid.
+            InvalidStructureError: If the path points outside the root.
+            FileStructureError: If an entry exists with a different type than planned.
         """
-        lines = structure.split('\n')
-        stack = [self.current_directory]
-
-        for line in lines:
-            line = line.rstrip()
-            if not line:
+        created = []
+        for path, path_is_file in self.add(relative_path, is_file):
+            full_path = os.path.join(self.root, path)
+            try:
+                if path_is_file:
+                    os.close(os.open(full_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666))
+                else:
+                    os.makedirs(full_path)  # Only the root may be missing above a new directory
+            except FileExistsError:
+                if os.path.isdir(full_path) == path_is_file:
+                    raise FileStructureError(f"{path} already exists with a different type.")
                 continue
+            created.append((path, path_is_file))
+        return created
 
-            depth = self._get_indent_level(line)
+    def _levels(self, paths) -> List[List[str]]:
+        levels: Dict[int, List[str]] = {}
+        for path in paths:
+            levels.setdefault(path.count(os.sep), []).append(path)
+        return [sorted(levels[depth]) for depth in sorted(levels)]
 
-            clean_line = line.lstrip(' ┣┃┗').strip()
-            if not clean_line:
-                continue
+    def diff(self, max_workers: int = DEFAULT_STRUCTURE_WORKERS) -> PlanDiff:
+        """Check the plan against the disk without changing anything (a dry run).
 
-            path_parts = self._extract_path_parts(clean_line)
+        Args:
+            max_workers (int): Number of directories listed concurrently.
 
-            while depth < len(stack) - 1:
-                stack.pop()
+        Returns:
+            PlanDiff: What executing the plan would create, and what is in the way.
+        """
+        diff = PlanDiff()
+        diff.conflicts = sorted(self.files & self.directories)  # Planned as both
+        has_children = {os.path.dirname(path) for path in self.directories | self.files}
+        listings: Dict[str, Optional[Dict[str, bool]]] = {'': self._listing(self.root)}  # None: does not exist
+
+        def kind_on_disk(path):
+            listing = listings.get(os.path.dirname(path))
+            if listing is None:
+                return None  # Parent missing, so this is missing too
+            return listing.get(os.path.basename(path))
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='structure') as executor:
+            for level in self._levels(self.directories):
+                existing = []
+                for path in level:
+                    is_dir = kind_on_disk(path)
+                    if is_dir is None:
+                        diff.missing_directories.append(path)
+                        listings[path] = None
+                    elif not is_dir:
+                        diff.conflicts.append(path)
+                        listings[path] = None
+                    else:
+                        diff.existing += 1
+                        if path in has_children:
+                            existing.append(path)
+                        else:
+                            listings[path] = {}
+                # Listing a level's existing directories is independent work
+                for path, listing in zip(existing, executor.map(
+                        self._listing, (os.path.join(self.root, path) for path in existing))):
+                    listings[path] = listing
+        for path in sorted(self.files - self.directories):
+            is_dir = kind_on_disk(path)
+            if is_dir is None:
+                diff.missing_files.append(path)
+            elif is_dir:
+                diff.conflicts.append(path)
+            else:
+                diff.existing += 1
+        diff.conflicts.sort()
+        return diff
 
-            current_path = os.path.join(stack[-1], *path_parts)
+    def _listing(self, path: str) -> Optional[Dict[str, bool]]:
+        try:
+            with os.scandir(path) as it:
+                return {entry.name: entry.is_dir() for entry in it}  # Symlinked directories count as directories
+        except (FileNotFoundError, NotADirectoryError):
+            return None
 
-            if self._is_file(clean_line):
-                self._create_file(current_path)
-            else:
-                self._create_directory(current_path)
-                if depth >= len(stack):
-                    stack.append(current_path)
+    def execute(self, diff: Optional[PlanDiff] = None, max_workers: int = DEFAULT_STRUCTURE_WORKERS) -> PlanDiff:
+        """Create the missing part of the plan; existing files are left untouched.
 
-    def _get_indent_level(self, line: str) -> int:
-        """Get the indent level of a line in the input structure.
+        Directories are created level by level, and the entries of one level
+        and all the files are created concurrently in chunks.
 
         Args:
-            line (str): The line from the input structure.
+            diff (PlanDiff, optional): A diff computed beforehand, e.g. by a dry run.
+            max_workers (int): Number of concurrent workers.
 
         Returns:
-            int: The indent level of the line.
-        """
-        return len(line) - len(line.lstrip(' ┣┃┗'))
+            PlanDiff: The diff that was applied.
 
-    def _is_file(self, line: str) -> bool:
-        """Check if a line in the input structure represents a file.
+        Raises:
+            FileStructureError: If entries exist with a different type than planned.
+        """
+        diff = diff or self.diff(max_workers)
+        if diff.conflicts:
+            raise FileStructureError(f"These paths already exist with a different type: {', '.join(diff.conflicts[:5])}")
+        os.makedirs(self.root, exist_ok=True)
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='structure') as executor:
+            for level in self._levels(diff.missing_directories):
+                list(executor.map(self._make_directories, _chunks(level)))
+            list(executor.map(self._make_files, _chunks(diff.missing_files)))
+        return diff
+
+    def _make_directories(self, paths: List[str]):
+        for path in paths:
+            try:
+                os.mkdir(os.path.join(self.root, path))
+            except FileExistsError:
+                pass
+
+    def _make_files(self, paths: List[str]):
+        for path in paths:
+            os.close(os.open(os.path.join(self.root, path), os.O_WRONLY | os.O_CREAT, 0o666))
+
+def _chunks(paths: List[str]) -> List[List[str]]:
+    return [paths[i:i + PLAN_CHUNK_SIZE] for i in range(0, len(paths), PLAN_CHUNK_SIZE)]
 
-        Args:
-            line (str): The line from the input structure.
+class FileStructure:
+    """Class for creating a file structure based on user input."""
 
-        Returns:
-            bool: True if the line represents a file, False otherwise.
-        """
-        return '.' in os.path.basename(line)
+    def __init__(self, status_bar):
+        self.status_bar = status_bar
+        self.current_directory = None
 
-    def _create_directory(self, path: str):
-        """Create a directory at the given path.
+    def set_current_directory(self, path: str):
+        """Set the current directory for creating the file structure.
 
         Args:
-            path (str): The path of the directory to create.
+            path (str): The current directory path.
         """
-        os.makedirs(path, exist_ok=True)
+        self.current_directory = path
 
-    def _create_file(self, path: str):
-        """Create a file at the given path.
+    def create_file_structure(self, structure: str, dry_run: bool = False) -> Optional[PlanDiff]:
+        """Create a file structure based on the input structure.
 
         Args:
-            path (str): The path of the file to create.
+            structure (str): The input structure as a string.
+            dry_run (bool): Only compare the structure with the disk and report the differences.
+
+        Returns:
+            PlanDiff: What was (or, for a dry run, would be) created; None on errors.
+
+        Raises:
+            FileStructureError: If the current directory is not set.
         """
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-        open(path, 'a').close()
+        if not self.current_directory:
+            raise FileStructureError("Current directory is not set.")
+
+        try:
+            plan = self.plan_file_structure(structure)
+            diff = plan.diff()
+            if dry_run:
+                self.status_bar.showMessage(f"Dry run: {diff.summary()}.")
+                return diff
+            plan.execute(diff)
+            self.status_bar.showMessage(f"File structure created successfully: {diff.summary()}.")
+            return diff
+        except Exception as e:
+            QMessageBox.critical(None, "Error", f"Could not create file structure. Error: {e}")
+            self.status_bar.showMessage(f"Error creating file structure: {e}")
+            return None
+
+    def plan_file_structure(self, structure: str) -> StructurePlan:
+        """Compile the input structure into a plan below the current directory.
 
-    def _extract_path_parts(self, line: str) -> List[str]:
-        """Extract the path parts from a line in the input structure.
+        Box-drawing trees, indented lists and plain paths are all accepted,
+        see ``parse_structure``.
 
         Args:
-            line (str): The line from the input structure.
+            structure (str): The input structure as a string.
 
         Returns:
-            list[str]: A list of path parts.
+            StructurePlan: The deduplicated directories and files.
+
+        Raises:
+            InvalidStructureError: If the input structure is invalid.
         """
-        parts = []
-        special_chars = ['📦', '📂', '📜', '┣', '┃', '┗']
-        for part in line.split():
-            part = part.strip()
-            for char in special_chars:
-                part = part.replace(char, '')
-            if part:
-                parts.append(part)
-        return parts
-
-    def _create_from_manual_input(self, structure: str):
-        """Create the file structure from a manual input structure.
+        plan = StructurePlan(self.current_directory)
+        for entry in parse_structure(structure):
+            plan.add(entry.path, entry.is_file)
+        return plan
+
+    def is_valid_structure(self, structure: str) -> bool:
+        """Check if the input structure is valid.
 
         Args:
             structure (str): The input structure as a string.
-        """
-        for line in structure.split('\n'):
-            line = line.strip()
-            if not line:
-                continue
 
-            if self._is_file(line):
-                path = os.path.join(self.current_directory, line)
-                os.makedirs(os.path.dirname(path), exist_ok=True)
-                open(path, 'a').close()
-            else:
-                path = os.path.join(self.current_directory, line.rstrip('/'))
-                os.makedirs(path, exist_ok=True)
+        Returns:
+            bool: True if the structure is valid, False otherwise.
+        """
+        return any(char in structure for char in ['┣', '┗', '┃', '📂', '📜'])
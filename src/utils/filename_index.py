@@ -0,0 +1,360 @@
+# src/utils/filename_index.py
+import hashlib
+import mmap
+import os
+import struct
+import time
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from utils.utils import get_cache_path
+
+MAGIC = b'FMIX'
+VERSION = 2
+HEADER = struct.Struct('<4sIQQdQ')  # magic, version, path count, trigram count, build time, root fingerprint
+MAX_INDEX_AGE = 3600  # seconds after which a walk rebuilds the index, for changes below the top level
+MAX_DELTA_RECORDS = 4096  # delta records kept before they are merged into the index file
+
+
+def _trigrams(text: str):
+    """Yield the packed trigram keys of an already lowercased string."""
+    for i in range(len(text) - 2):
+        yield (ord(text[i]) << 42) | (ord(text[i + 1]) << 21) | ord(text[i + 2])
+
+
+def _basename(relative_path: str) -> str:
+    return relative_path.rsplit(os.sep, 1)[-1]
+
+
+class FilenameIndex:
+    """Trigram index over the lowercased basenames below a root directory.
+
+    The index is stored as a single file laid out as fixed-width arrays so it
+    can be memory-mapped and queried without parsing:
+
+        header | path offsets (u64) | trigram keys (u64, sorted)
+               | posting offsets (u64) | postings (u32) | path blob (utf-8)
+
+    Paths are stored relative to the root, joined with ``os.sep``. The
+    header records when the walk behind the index started and a fingerprint
+    of the root's top-level directory mtimes, so ``is_fresh`` can tell when
+    the disk has moved on without the watcher seeing it.
+
+    Changes seen by the watcher are appended to a delta file next to the
+    index, as NUL-terminated ``+path`` and ``-path`` records, and applied
+    on top of the mapped arrays when searching. The delta is merged into a
+    rewritten index file once it exceeds MAX_DELTA_RECORDS, and dropped
+    when a walk rebuilds the index.
+    """
+
+    def __init__(self, root_path: str, index_path: Optional[str] = None):
+        self.root_path = os.path.abspath(root_path)
+        self.index_path = index_path or self.path_for(self.root_path)
+        self._file = None
+        self._mmap = None
+        self._path_count = 0
+        self._path_offsets = None
+        self._keys = None
+        self._posting_offsets = None
+        self._postings = None
+        self._blob = None
+        self._added: Dict[str, int] = {}  # relative path -> number of the delta record adding it
+        self._removed: Dict[str, int] = {}  # relative path -> number of the last delta record removing it
+        self._delta_records = 0
+        self.built = 0.0
+        self.root_fingerprint = 0
+
+    @staticmethod
+    def path_for(root_path: str) -> str:
+        """Return the location of the index file for ``root_path``."""
+        return get_cache_path('filename_index', root_path, '.idx')
+
+    @classmethod
+    def exists(cls, root_path: str) -> bool:
+        """Check whether an index has been built for ``root_path``."""
+        return os.path.isfile(cls.path_for(root_path))
+
+    @classmethod
+    def version(cls, root_path: str) -> Tuple[int, int]:
+        """Return a stamp that changes whenever the paths in the index change.
+
+        Raises:
+            OSError: If there is no index for ``root_path``.
+        """
+        index_path = cls.path_for(root_path)
+        mtime_ns = os.stat(index_path).st_mtime_ns
+        try:
+            delta_size = os.stat(index_path + '.delta').st_size
+        except FileNotFoundError:
+            delta_size = 0
+        return mtime_ns, delta_size
+
+    @staticmethod
+    def fingerprint(root_path: str) -> int:
+        """Digest of the mtimes of the root and its subdirectories.
+
+        A directory's mtime changes whenever an entry is added to or removed
+        from it, so this changes with the top two levels of the tree.
+        """
+        stamps = [str(os.stat(root_path).st_mtime_ns)]
+        with os.scandir(root_path) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stamps.append(f"{entry.name}\0{entry.stat(follow_symlinks=False).st_mtime_ns}")
+                except OSError:
+                    continue
+        stamps[1:] = sorted(stamps[1:])
+        digest = hashlib.blake2b('\n'.join(stamps).encode('utf-8', 'surrogateescape'), digest_size=8).digest()
+        return int.from_bytes(digest, 'little')
+
+    @classmethod
+    def mark_stale(cls, root_path: str):
+        """Make the next search rebuild the index, e.g. after an update to it failed.
+
+        A marker file is used rather than deleting the index, which fails on
+        Windows while the index is mapped.
+        """
+        open(cls.path_for(root_path) + '.stale', 'wb').close()
+
+    def is_fresh(self, max_age: float = MAX_INDEX_AGE) -> bool:
+        """Whether the open index can still answer searches without a walk.
+
+        False once it is older than ``max_age``, marked stale, or the root's
+        top-level directories changed since the walk it was built from.
+        """
+        if time.time() - self.built > max_age or os.path.exists(self.index_path + '.stale'):
+            return False
+        try:
+            return self.fingerprint(self.root_path) == self.root_fingerprint
+        except OSError:
+            return False
+
+    @classmethod
+    def build(cls, root_path: str, relative_paths: List[str], index_path: Optional[str] = None,
+              built: Optional[float] = None, root_fingerprint: Optional[int] = None) -> 'FilenameIndex':
+        """Write an index for ``relative_paths`` and return it opened.
+
+        Args:
+            root_path (str): The directory the paths are relative to.
+            relative_paths (list[str]): Every file and directory below the root.
+            index_path (str, optional): Where to write the index file.
+            built (float, optional): When the walk listing the paths started; now by default.
+            root_fingerprint (int, optional): ``fingerprint(root_path)`` taken before that
+                walk; computed now by default.
+
+        Returns:
+            FilenameIndex: The freshly written index, memory-mapped.
+        """
+        index = cls(root_path, index_path)
+        if built is None:
+            built = time.time()
+        if root_fingerprint is None:
+            root_fingerprint = cls.fingerprint(index.root_path)
+        postings: Dict[int, array] = {}
+        for path_id, relative_path in enumerate(relative_paths):
+            for key in set(_trigrams(_basename(relative_path).lower())):
+                ids = postings.get(key)
+                if ids is None:
+                    ids = postings[key] = array('I')
+                ids.append(path_id)
+
+        keys = array('Q', sorted(postings))
+        posting_offsets = array('Q', [0])
+        posting_data = array('I')
+        for key in keys:
+            posting_data.extend(postings[key])
+            posting_offsets.append(len(posting_data))
+
+        path_offsets = array('Q', [0])
+        blob = bytearray()
+        for relative_path in relative_paths:
+            blob += relative_path.encode('utf-8', 'surrogateescape')
+            path_offsets.append(len(blob))
+
+        tmp_path = index.index_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, len(relative_paths), len(keys), built, root_fingerprint))
+            path_offsets.tofile(f)
+            keys.tofile(f)
+            posting_offsets.tofile(f)
+            posting_data.tofile(f)
+            f.write(blob)
+        os.replace(tmp_path, index.index_path)
+        for suffix in ('.delta', '.stale'):
+            try:
+                os.remove(index.index_path + suffix)
+            except FileNotFoundError:
+                pass
+        index.open()
+        return index
+
+    def open(self):
+        """Memory-map the index file.
+
+        Raises:
+            ValueError: If the file is not a filename index of this version.
+        """
+        self.close()
+        self._file = open(self.index_path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version = struct.unpack_from('<4sI', self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"Unsupported filename index: {self.index_path}")
+        _, _, path_count, key_count, self.built, self.root_fingerprint = HEADER.unpack_from(self._mmap, 0)
+
+        view = memoryview(self._mmap)
+        offset = HEADER.size
+
+        def take(count, fmt, itemsize):
+            nonlocal offset
+            section = view[offset:offset + count * itemsize].cast(fmt)
+            offset += count * itemsize
+            return section
+
+        self._path_count = path_count
+        self._path_offsets = take(path_count + 1, 'Q', 8)
+        self._keys = take(key_count, 'Q', 8)
+        self._posting_offsets = take(key_count + 1, 'Q', 8)
+        self._postings = take(self._posting_offsets[key_count], 'I', 4)
+        self._blob = view[offset:]
+        self._load_delta()
+
+    def _load_delta(self):
+        self._added, self._removed = {}, {}
+        try:
+            with open(self.index_path + '.delta', 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            data = b''
+        records = data.split(b'\0')[:-1]  # A trailing partial record is still being appended
+        for number, record in enumerate(records):
+            relative_path = record[1:].decode('utf-8', 'surrogateescape')
+            if record[:1] == b'-':
+                self._removed[relative_path] = number
+            else:
+                self._added[relative_path] = number
+        self._delta_records = len(records)
+
+    def _removed_after(self, relative_path: str, number: int) -> bool:
+        """Whether the path or a directory above it was removed by a delta record after ``number``."""
+        while relative_path:
+            if self._removed.get(relative_path, -1) > number:
+                return True
+            relative_path = relative_path.rpartition(os.sep)[0]
+        return False
+
+    def _added_paths(self) -> List[str]:
+        return [relative_path for relative_path, number in self._added.items()
+                if not self._removed_after(relative_path, number)]
+
+    def close(self):
+        for name in ('_path_offsets', '_keys', '_posting_offsets', '_postings', '_blob'):
+            section = getattr(self, name)
+            if section is not None:
+                section.release()
+                setattr(self, name, None)
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __len__(self):
+        return self._path_count
+
+    def relative_path(self, path_id: int) -> str:
+        start, end = self._path_offsets[path_id], self._path_offsets[path_id + 1]
+        return bytes(self._blob[start:end]).decode('utf-8', 'surrogateescape')
+
+    def relative_paths(self) -> List[str]:
+        """Return every indexed path, relative to the root."""
+        paths = [self.relative_path(path_id) for path_id in range(self._path_count)]
+        if not (self._added or self._removed):
+            return paths
+        paths = [path for path in paths if not self._removed_after(path, -1)]
+        known = set(paths)
+        return paths + [path for path in self._added_paths() if path not in known]
+
+    def apply_changes(self, created: Iterable[str], deleted: Iterable[str]) -> 'FilenameIndex':
+        """Record paths added and removed, without walking the disk.
+
+        The changes are appended to the delta file, so a batch costs in
+        proportion to its own size. Once the delta holds more than
+        MAX_DELTA_RECORDS records it is merged: the index file is rewritten
+        with the build time and fingerprint of the original walk, since the
+        changes only cover what the watcher saw, not what happened before.
+
+        Args:
+            created (Iterable[str]): Absolute paths that now exist below the root.
+            deleted (Iterable[str]): Absolute paths that are gone; deleting a
+                directory also drops everything below it.
+
+        Returns:
+            FilenameIndex: The updated index, opened; this instance unless the delta was merged.
+        """
+        def relative(path):
+            relative_path = os.path.relpath(path, self.root_path)
+            return None if relative_path == os.curdir or relative_path.startswith(os.pardir) else relative_path
+
+        records = bytearray()
+        # Removals first, so a directory replaced within the batch keeps its new entries
+        for marker, paths in ((b'-', deleted), (b'+', created)):
+            for relative_path in filter(None, map(relative, paths)):
+                records += marker + relative_path.encode('utf-8', 'surrogateescape') + b'\0'
+        if records:
+            with open(self.index_path + '.delta', 'ab') as f:
+                f.write(records)  # One append, so readers see whole batches or a partial last record
+            self._load_delta()
+        if self._delta_records <= MAX_DELTA_RECORDS:
+            return self
+        paths = self.relative_paths()
+        built, root_fingerprint = self.built, self.root_fingerprint
+        self.close()
+        return self.build(self.root_path, paths, self.index_path, built, root_fingerprint)
+
+    def _posting_list(self, key: int):
+        i = bisect_left(self._keys, key)
+        if i == len(self._keys) or self._keys[i] != key:
+            return None
+        return self._postings[self._posting_offsets[i]:self._posting_offsets[i + 1]]
+
+    def _candidates(self, needle: str):
+        if len(needle) < 3:
+            return range(self._path_count)
+        lists = []
+        for key in set(_trigrams(needle)):
+            ids = self._posting_list(key)
+            if ids is None:
+                return ()
+            lists.append(ids)
+        lists.sort(key=len)
+        candidates = set(lists[0])
+        for ids in lists[1:]:
+            candidates.intersection_update(ids)
+            if not candidates:
+                break
+        return sorted(candidates)
+
+    def search(self, search_text: str) -> Iterator[str]:
+        """Yield the absolute paths whose basename contains ``search_text``.
+
+        Matching is case-insensitive. Queries of three or more characters
+        are answered from the trigram postings; shorter ones scan the names.
+        """
+        needle = search_text.lower()
+        has_delta = bool(self._added or self._removed)
+        matched = set()
+        for path_id in self._candidates(needle):
+            relative_path = self.relative_path(path_id)
+            if needle in _basename(relative_path).lower():
+                if has_delta:
+                    if self._removed_after(relative_path, -1):
+                        continue
+                    matched.add(relative_path)
+                yield os.path.join(self.root_path, relative_path)
+        for relative_path in self._added_paths() if has_delta else ():
+            if needle in _basename(relative_path).lower() and relative_path not in matched:
+                yield os.path.join(self.root_path, relative_path)
@@ -0,0 +1,227 @@
+# src/utils/fs_watcher.py
+import logging
+import os
+import threading
+import time
+from typing import Callable, List, Optional, Set
+from PyQt6.QtCore import QObject, pyqtSignal
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+from utils.content_index import ContentIndex
+from utils.disk_usage import DiskUsageCache
+from utils.filename_index import FilenameIndex
+from utils.utils import CACHE_DIR
+from utils.walker import ParallelWalker
+
+CREATED = 'created'
+MODIFIED = 'modified'
+DELETED = 'deleted'
+
+logger = logging.getLogger(__name__)
+
+
+class ChangeSet:
+    """Coalesced filesystem changes below a watched root.
+
+    Attributes:
+        root_path (str): The watched directory.
+        created (set[str]): Paths that appeared, including everything below new directories.
+        modified (set[str]): Existing files whose contents changed.
+        deleted (set[str]): Paths that disappeared; directories are not expanded.
+        directories (set[str]): Parent directories whose listing changed.
+        lag (float): Seconds between the oldest event and the dispatch of this set.
+    """
+
+    def __init__(self, root_path: str):
+        self.root_path = root_path
+        self.created: Set[str] = set()
+        self.modified: Set[str] = set()
+        self.deleted: Set[str] = set()
+        self.directories: Set[str] = set()
+        self.lag = 0.0
+
+    def __bool__(self):
+        return bool(self.created or self.modified or self.deleted)
+
+    def __len__(self):
+        return len(self.created) + len(self.modified) + len(self.deleted)
+
+
+class _EventCollector(FileSystemEventHandler):
+    def __init__(self, watcher: 'FileSystemWatcher'):
+        super().__init__()
+        self.watcher = watcher
+
+    def on_created(self, event):
+        self.watcher._record(event.src_path, CREATED, event.is_directory)
+
+    def on_modified(self, event):
+        if not event.is_directory:  # A directory "modification" is just its children changing
+            self.watcher._record(event.src_path, MODIFIED, False)
+
+    def on_deleted(self, event):
+        self.watcher._record(event.src_path, DELETED, event.is_directory)
+
+    def on_moved(self, event):
+        self.watcher._record(event.src_path, DELETED, event.is_directory)
+        self.watcher._record(event.dest_path, CREATED, event.is_directory)
+
+
+class FileSystemWatcher(QObject):
+    """Watches the active root and feeds coalesced changes to index maintainers.
+
+    watchdog events are collected into a pending map keyed by path, so a
+    burst of events on one file collapses to its final state. A dispatcher
+    thread waits ``coalesce_interval`` after the first event of a burst,
+    then hands one ChangeSet to every listener (on the dispatcher thread)
+    and finally emits ``changes_applied`` for GUI-side caches.
+    """
+
+    changes_applied = pyqtSignal(object)
+
+    def __init__(self, coalesce_interval: float = 0.5, parent=None):
+        super().__init__(parent)
+        self.coalesce_interval = coalesce_interval
+        self.root_path: Optional[str] = None
+        self.batches_applied = 0
+        self.last_apply_duration = 0.0
+        self._listeners: List[Callable[[ChangeSet], None]] = []
+        self._pending = {}  # path -> (kind, is_directory)
+        self._oldest_event = None
+        self._condition = threading.Condition()
+        self._observer = None
+        self._ignored_prefix = os.path.abspath(CACHE_DIR) + os.sep
+        self._thread = threading.Thread(target=self._dispatch_loop, name='fs-watcher', daemon=True)
+        self._thread.start()
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of distinct paths with changes not yet dispatched."""
+        with self._condition:
+            return len(self._pending)
+
+    @property
+    def lag(self) -> float:
+        """Age in seconds of the oldest change not yet dispatched."""
+        with self._condition:
+            return time.monotonic() - self._oldest_event if self._oldest_event is not None else 0.0
+
+    def add_listener(self, listener: Callable[[ChangeSet], None]):
+        self._listeners.append(listener)
+
+    def watch(self, root_path: str):
+        """Start watching ``root_path`` recursively, replacing the previous root."""
+        root_path = os.path.abspath(root_path)
+        if root_path == self.root_path:
+            return
+        self.stop()
+        self.root_path = root_path
+        self._observer = Observer()
+        self._observer.schedule(_EventCollector(self), root_path, recursive=True)
+        self._observer.daemon = True
+        try:
+            self._observer.start()
+        except OSError:
+            self._observer = None  # e.g. inotify watch limit reached; caches just go unmaintained
+
+    def stop(self):
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join(timeout=1)
+            self._observer = None
+        with self._condition:
+            self._pending.clear()
+            self._oldest_event = None
+        self.root_path = None
+
+    def _record(self, path: str, kind: str, is_directory: bool):
+        if path.startswith(self._ignored_prefix):
+            return  # Our own index writes
+        with self._condition:
+            previous = self._pending.get(path)
+            if previous and previous[0] == CREATED and kind == MODIFIED:
+                kind = CREATED
+            self._pending[path] = (kind, is_directory)
+            if self._oldest_event is None:
+                self._oldest_event = time.monotonic()
+            self._condition.notify()
+
+    def _dispatch_loop(self):
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+            time.sleep(self.coalesce_interval)  # Let the rest of the burst arrive
+            with self._condition:
+                pending, self._pending = self._pending, {}
+                oldest, self._oldest_event = self._oldest_event, None
+                root_path = self.root_path
+            if not pending or root_path is None:
+                continue
+            changes = self._build_change_set(root_path, pending)
+            changes.lag = time.monotonic() - oldest
+            started = time.monotonic()
+            for listener in self._listeners:
+                try:
+                    listener(changes)
+                except Exception:
+                    # A failing cache must not stop the others from being maintained
+                    logger.exception("Index listener %s failed on %d changes below %s",
+                                     getattr(listener, '__name__', listener), len(changes), root_path)
+            self.last_apply_duration = time.monotonic() - started
+            self.batches_applied += 1
+            self.changes_applied.emit(changes)
+
+    @staticmethod
+    def _build_change_set(root_path: str, pending) -> ChangeSet:
+        changes = ChangeSet(root_path)
+        for path, (kind, is_directory) in pending.items():
+            if kind == DELETED:
+                changes.deleted.add(path)
+            elif kind == MODIFIED:
+                changes.modified.add(path)
+            else:
+                changes.created.add(path)
+                if is_directory:
+                    # Directories moved in arrive as a single event; pick up their contents.
+                    changes.created.update(entry.path for entry in ParallelWalker(path).iter_entries())
+            if kind != MODIFIED:
+                changes.directories.add(os.path.dirname(path))
+        return changes
+
+
+def update_filename_index(changes: ChangeSet):
+    """Listener keeping the root's FilenameIndex in step with ``changes``."""
+    if (changes.created or changes.deleted) and FilenameIndex.exists(changes.root_path):
+        index = FilenameIndex(changes.root_path)
+        try:
+            index.open()
+            index.apply_changes(changes.created, changes.deleted).close()
+        except (OSError, ValueError):
+            # e.g. os.replace onto the mapped index on Windows; the next search walks and rebuilds
+            index.close()
+            FilenameIndex.mark_stale(changes.root_path)
+            raise
+
+
+def update_content_index(changes: ChangeSet):
+    """Listener keeping the root's ContentIndex in step with ``changes``."""
+    if ContentIndex.exists(changes.root_path):
+        index = ContentIndex(changes.root_path)
+        try:
+            index.apply_changes(changes.created | changes.modified, changes.deleted)
+        finally:
+            index.close()
+
+
+def update_disk_usage(changes: ChangeSet):
+    """Listener dropping the DiskUsageCache rows of directories whose files changed."""
+    # Added and removed entries bump their directory's mtime, which retires
+    # its row anyway; files rewritten in place do not.
+    directories = {os.path.dirname(path) for path in changes.modified}
+    if directories:
+        cache = DiskUsageCache()
+        try:
+            cache.invalidate(directories)
+        finally:
+            cache.close()
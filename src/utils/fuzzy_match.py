@@ -0,0 +1,195 @@
+# src/utils/fuzzy_match.py
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+
+FUZZY = 'fuzzy'  # Search mode ranked by FuzzyMatcher
+
+SCORE_MATCH = 16
+BONUS_BOUNDARY = 8
+BONUS_CAMEL = 7
+BONUS_CONSECUTIVE = 4
+BONUS_BASENAME = 2
+BONUS_BASENAME_PREFIX = 8
+PENALTY_GAP_START = 3
+PENALTY_GAP_EXTENSION = 1
+MAX_GAP_EXTENSION = 16
+
+SEPARATORS = '/\\_-. '
+PATH_SEPARATORS = '/\\'
+
+
+def fuzzy_score(query: str, text: str) -> Optional[int]:
+    """Score a single string the same way FuzzyMatcher scores paths.
+
+    Args:
+        query (str): The characters to find, in order.
+        text (str): The candidate string.
+
+    Returns:
+        int or None: The match score, or None if ``query`` is not a subsequence.
+    """
+    query, lowered = query.lower(), text.lower()
+    if not query:
+        return 0
+    if len(lowered) != len(text):
+        text = lowered  # Case folding changed the length; skip camelCase bonuses
+    # Anchor the last character as late as possible and walk backwards, so the
+    # match hugs the basename, then check the remaining characters fit before it.
+    end = lowered.rfind(query[-1])
+    if end == -1:
+        return None
+    positions = [end]
+    for char in reversed(query[:-1]):
+        end = lowered.rfind(char, 0, end)
+        if end == -1:
+            return None
+        positions.append(end)
+    positions.reverse()
+
+    basename_start = max(lowered.rfind('/'), lowered.rfind('\\')) + 1
+    score = SCORE_MATCH * len(query)
+    previous = None
+    for position in positions:
+        if position == 0 or lowered[position - 1] in SEPARATORS:
+            score += BONUS_BOUNDARY
+        elif text[position].isupper() and text[position - 1].islower():
+            score += BONUS_CAMEL
+        if position >= basename_start:
+            score += BONUS_BASENAME
+        if previous is not None:
+            gap = position - previous - 1
+            if gap == 0:
+                score += BONUS_CONSECUTIVE
+            else:
+                score -= PENALTY_GAP_START + PENALTY_GAP_EXTENSION * min(gap - 1, MAX_GAP_EXTENSION)
+        previous = position
+    if positions[0] == basename_start:
+        score += BONUS_BASENAME_PREFIX
+    return score
+
+
+class FuzzyMatcher:
+    """fzf-style subsequence matcher that scores many paths at once with NumPy.
+
+    All candidates are lowercased and packed into one NUL-separated byte
+    buffer. For a query, each character's occurrences in the buffer are
+    located with ``np.searchsorted``, so matching and scoring cost a handful
+    of array operations per query character instead of a Python loop per
+    path. Scores follow ``fuzzy_score``.
+    """
+
+    def __init__(self, paths: Sequence[str]):
+        self.paths = list(paths)
+        joined = ''.join(path + '\0' for path in self.paths)
+        lowered = joined.lower()
+        buffer = np.frombuffer(lowered.encode('utf-8', 'surrogateescape'), dtype=np.uint8)
+        self._buffer = buffer
+        self._ends = np.flatnonzero(buffer == 0)
+        self._starts = np.zeros(len(self._ends), dtype=np.int64)
+        self._starts[1:] = self._ends[:-1] + 1
+        self._lengths = self._ends - self._starts
+
+        separators = np.isin(buffer, np.frombuffer(SEPARATORS.encode(), dtype=np.uint8))
+        boundary = np.zeros(len(buffer), dtype=bool)
+        boundary[self._starts] = True
+        boundary[1:] |= separators[:-1]
+        self._boundary = boundary
+
+        camel = np.zeros(len(buffer), dtype=bool)
+        original = np.frombuffer(joined.encode('utf-8', 'surrogateescape'), dtype=np.uint8)
+        if len(original) == len(buffer):
+            upper = (original >= ord('A')) & (original <= ord('Z'))
+            lower = (original >= ord('a')) & (original <= ord('z'))
+            camel[1:] = upper[1:] & lower[:-1] & ~boundary[1:]
+        self._camel = camel
+
+        slashes = np.flatnonzero(np.isin(buffer, np.frombuffer(PATH_SEPARATORS.encode(), dtype=np.uint8)))
+        last_slash = np.searchsorted(slashes, self._ends) - 1
+        previous_slash = slashes[np.maximum(last_slash, 0)] if len(slashes) else np.zeros_like(self._ends)
+        in_path = (last_slash >= 0) & (previous_slash >= self._starts)
+        self._basename_starts = np.where(in_path, previous_slash + 1, self._starts)
+
+        # One bit per byte value (mod 64) that occurs in each path: a query can
+        # only match paths whose mask covers all of its bits.
+        bits = np.left_shift(np.uint64(1), (buffer % 64).astype(np.uint64))
+        self._masks = np.bitwise_or.reduceat(bits, self._starts) if len(buffer) else np.empty(0, dtype=np.uint64)
+        self._occurrences = {}
+
+    def __len__(self):
+        return len(self.paths)
+
+    def _positions_of(self, byte: int) -> np.ndarray:
+        positions = self._occurrences.get(byte)
+        if positions is None:
+            positions = self._occurrences[byte] = np.flatnonzero(self._buffer == byte)
+        return positions
+
+    def match(self, query: str, candidates: Optional[np.ndarray] = None,
+              limit: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Rank the paths matching ``query``.
+
+        Args:
+            query (str): The characters to find, in order, case-insensitively.
+            candidates (np.ndarray, optional): Path indices to restrict scoring to,
+                e.g. the result of a shorter query.
+            limit (int, optional): Return at most this many of the best matches.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Matching path indices, best first, and their scores.
+        """
+        needle = query.lower().encode('utf-8', 'surrogateescape')
+        if not needle:
+            indices = np.arange(len(self.paths)) if candidates is None else np.asarray(candidates, dtype=np.int64)
+            return indices[:limit], np.zeros(len(indices[:limit]), dtype=np.int64)
+
+        query_mask = np.uint64(0)
+        for byte in set(needle):
+            query_mask |= np.uint64(1 << (byte % 64))
+        if candidates is None:
+            indices = np.flatnonzero((self._masks & query_mask) == query_mask)
+        else:
+            indices = np.asarray(candidates, dtype=np.int64)
+            indices = indices[(self._masks[indices] & query_mask) == query_mask]
+
+        # Forward pass: keep the paths that contain the query as a subsequence.
+        cursor = self._starts[indices]
+        for byte in needle:
+            occurrences = self._positions_of(byte)
+            if not len(occurrences):
+                return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+            k = np.searchsorted(occurrences, cursor)
+            found = occurrences[np.minimum(k, len(occurrences) - 1)]
+            keep = (k < len(occurrences)) & (found < self._ends[indices])
+            indices, cursor = indices[keep], found[keep] + 1
+
+        # Backward pass from the last occurrence of the final character, which
+        # gives the tightest match nearest the basename.
+        positions = np.empty((len(indices), len(needle)), dtype=np.int64)
+        occurrences = self._positions_of(needle[-1])
+        cursor = occurrences[np.searchsorted(occurrences, self._ends[indices]) - 1]
+        positions[:, -1] = cursor
+        for j in range(len(needle) - 2, -1, -1):
+            occurrences = self._positions_of(needle[j])
+            cursor = occurrences[np.searchsorted(occurrences, cursor) - 1]
+            positions[:, j] = cursor
+
+        basename_starts = self._basename_starts[indices]
+        scores = np.full(len(indices), SCORE_MATCH * len(needle), dtype=np.int64)
+        scores += BONUS_BOUNDARY * self._boundary[positions].sum(axis=1)
+        scores += BONUS_CAMEL * self._camel[positions].sum(axis=1)
+        scores += BONUS_BASENAME * (positions >= basename_starts[:, None]).sum(axis=1)
+        scores += BONUS_BASENAME_PREFIX * (positions[:, 0] == basename_starts)
+        gaps = positions[:, 1:] - positions[:, :-1] - 1
+        scores += BONUS_CONSECUTIVE * (gaps == 0).sum(axis=1)
+        penalties = PENALTY_GAP_START + PENALTY_GAP_EXTENSION * np.minimum(gaps - 1, MAX_GAP_EXTENSION)
+        scores -= np.where(gaps > 0, penalties, 0).sum(axis=1)
+
+        if limit is not None and limit < len(indices):
+            top = np.argpartition(-scores, limit - 1)[:limit]
+            indices, scores = indices[top], scores[top]
+        order = np.lexsort((self._lengths[indices], -scores))
+        return indices[order], scores[order]
+
+    def ranked_paths(self, query: str, limit: Optional[int] = None) -> List[str]:
+        indices, _ = self.match(query, limit=limit)
+        return [self.paths[i] for i in indices]
@@ -0,0 +1,190 @@
+# src/utils/hash_cache.py
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from utils.cancellation import CancelToken
+from utils.utils import CACHE_DIR
+
+try:
+    import xxhash
+except ImportError:  # Optional: much faster than BLAKE2 but not a cryptographic hash
+    xxhash = None
+
+DEFAULT_ALGORITHM = 'blake2b'
+HASH_BUFFER_SIZE = 1024 * 1024
+BATCH_SIZE = 256  # files looked up and stored per transaction
+DEFAULT_HASH_WORKERS = 4  # hashlib and xxhash release the GIL on large buffers
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS hashes (
+    dev INTEGER NOT NULL,
+    ino INTEGER NOT NULL,
+    algorithm TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    digest BLOB NOT NULL,
+    PRIMARY KEY (dev, ino, algorithm)
+) WITHOUT ROWID;
+"""
+
+
+def available_algorithms() -> List[str]:
+    algorithms = ['blake2b', 'blake2s', 'sha256']
+    if xxhash:
+        algorithms += ['xxh3_128', 'xxh64']
+    return algorithms
+
+
+def _new_hash(algorithm: str):
+    if algorithm.startswith('xxh'):
+        if xxhash is None:
+            raise ValueError(f"{algorithm} needs the xxhash package")
+        return getattr(xxhash, algorithm)()
+    return hashlib.new(algorithm)
+
+
+def hash_file(path: str, algorithm: str = DEFAULT_ALGORITHM) -> bytes:
+    digest = _new_hash(algorithm)
+    buffer = bytearray(HASH_BUFFER_SIZE)
+    view = memoryview(buffer)
+    with open(path, 'rb') as f:
+        while True:
+            count = f.readinto(buffer)
+            if not count:
+                return digest.digest()
+            digest.update(view[:count])
+
+
+def _key(st: os.stat_result) -> Tuple[int, int, int, int]:
+    return st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns
+
+
+class HashCache:
+    """Persistent file digests keyed by (device, inode, size, mtime).
+
+    A digest is reused while the file's inode, size and mtime are unchanged,
+    so a file is hashed again only after it is modified. Digests computed
+    while the file changed underneath are not stored. Counters record the
+    hit rate and the hashing throughput.
+    """
+
+    def __init__(self, cache_path: Optional[str] = None):
+        if cache_path is None:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            cache_path = os.path.join(CACHE_DIR, 'hashes.sqlite')
+        self.cache_path = cache_path
+        # Shared by hashing threads, serialized by the lock.
+        self.connection = sqlite3.connect(cache_path, check_same_thread=False)
+        self.connection.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bytes_hashed = 0
+        self.hash_seconds = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes_hashed / self.hash_seconds if self.hash_seconds else 0.0
+
+    def stats(self) -> str:
+        return (f"hash cache: {self.hits} hits, {self.misses} misses ({self.hit_rate:.0%}), "
+                f"{self.bytes_hashed / (1024 * 1024):.1f} MB hashed at {self.bytes_per_second / (1024 * 1024):.1f} MB/s")
+
+    def lookup(self, stats: Dict[str, os.stat_result], algorithm: str = DEFAULT_ALGORITHM) -> Dict[str, bytes]:
+        """Return the cached digests of the files whose stat results still match; counts hits and misses."""
+        found = {}
+        with self._lock:
+            for path, st in stats.items():
+                row = self.connection.execute(
+                    "SELECT size, mtime_ns, digest FROM hashes WHERE dev = ? AND ino = ? AND algorithm = ?",
+                    (st.st_dev, st.st_ino, algorithm)).fetchone()
+                if row and (row[0], row[1]) == (st.st_size, st.st_mtime_ns):
+                    found[path] = row[2]
+            self.hits += len(found)
+            self.misses += len(stats) - len(found)
+        return found
+
+    def store(self, entries: Iterable[Tuple[str, os.stat_result, bytes]], algorithm: str = DEFAULT_ALGORITHM,
+              seconds: float = 0.0):
+        """Record digests computed from files that had the given stat results."""
+        rows = []
+        hashed = 0
+        for path, st, digest in entries:
+            hashed += st.st_size
+            try:
+                if _key(os.stat(path)) != _key(st):
+                    continue  # Changed while it was being hashed
+            except OSError:
+                continue
+            rows.append((st.st_dev, st.st_ino, algorithm, st.st_size, st.st_mtime_ns, digest))
+        with self._lock:
+            self.connection.executemany("INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?, ?, ?)", rows)
+            self.connection.commit()
+            self.bytes_hashed += hashed
+            self.hash_seconds += seconds
+
+    def digest(self, path: str, algorithm: str = DEFAULT_ALGORITHM) -> bytes:
+        st = os.stat(path)
+        cached = self.lookup({path: st}, algorithm)
+        if path in cached:
+            return cached[path]
+        started = time.monotonic()
+        digest = hash_file(path, algorithm)
+        self.store([(path, st, digest)], algorithm, time.monotonic() - started)
+        return digest
+
+    def digests(self, paths: Iterable[str], algorithm: str = DEFAULT_ALGORITHM,
+                max_workers: int = DEFAULT_HASH_WORKERS,
+                cancel_token: Optional[CancelToken] = None) -> Iterator[Tuple[str, Optional[bytes]]]:
+        """Yield ``(path, digest)`` for many files, hashing cache misses in batches on a thread pool.
+
+        Unreadable files yield a digest of None.
+        """
+        cancel_token = cancel_token or CancelToken()
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='hash') as executor:
+            batch = []
+            for path in paths:
+                batch.append(path)
+                if len(batch) >= BATCH_SIZE:
+                    cancel_token.raise_if_cancelled()
+                    yield from self._digest_batch(executor, batch, algorithm)
+                    batch = []
+            if batch:
+                cancel_token.raise_if_cancelled()
+                yield from self._digest_batch(executor, batch, algorithm)
+
+    def _digest_batch(self, executor, paths: List[str], algorithm: str) -> Iterator[Tuple[str, Optional[bytes]]]:
+        stats = {}
+        for path in paths:
+            try:
+                stats[path] = os.stat(path)
+            except OSError:
+                yield path, None
+        cached = self.lookup(stats, algorithm)
+        yield from cached.items()
+        missing = [path for path in stats if path not in cached]
+        started = time.monotonic()
+        futures = [(path, executor.submit(hash_file, path, algorithm)) for path in missing]
+        computed = []
+        for path, future in futures:
+            try:
+                digest = future.result()
+            except OSError:
+                yield path, None
+                continue
+            computed.append((path, stats[path], digest))
+            yield path, digest
+        if computed:
+            self.store(computed, algorithm, time.monotonic() - started)
+
+    def close(self):
+        self.connection.close()
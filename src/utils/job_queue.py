@@ -0,0 +1,375 @@
+# src/utils/job_queue.py
+import errno
+import itertools
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+from PyQt6.QtCore import QObject, pyqtSignal
+from utils.cancellation import CancelToken, CancelledError
+from utils.archive import create_archive, extract_archive
+from utils.copy_engine import copy_path
+from utils.delete_engine import delete_tree, move_to_trash
+from utils.dir_compare import DirectoryDiff, mirror
+from utils.hash_cache import DEFAULT_ALGORITHM, HashCache
+from utils.walker import ParallelWalker
+
+QUEUED = 'Queued'
+RUNNING = 'Running'
+PAUSED = 'Paused'
+DONE = 'Done'
+FAILED = 'Failed'
+CANCELLED = 'Cancelled'
+
+PROGRESS_INTERVAL = 0.1  # seconds between progress signals per job
+
+_job_ids = itertools.count(1)
+
+
+class Job:
+    """A unit of work for the JobQueue.
+
+    Subclasses implement ``execute`` and report progress through
+    ``self.report(done, total)``; they call ``self.token.raise_if_cancelled()``
+    (directly or through the engines) so cancel and pause take effect.
+    """
+
+    uses_io = True  # Counts against the queue's I/O concurrency limit
+    reports_bytes = False  # Whether done/total are bytes rather than items
+
+    def __init__(self, description: str):
+        self.id = next(_job_ids)
+        self.description = description
+        self.state = QUEUED
+        self.error = None
+        self.token = CancelToken()
+        self.done = 0
+        self.total = 0
+        self.started = None
+        self.queue = None
+
+    @property
+    def bytes_per_second(self) -> float:
+        if not self.started or not self.reports_bytes:
+            return 0.0
+        elapsed = time.monotonic() - self.started
+        return self.done / elapsed if elapsed > 0 else 0.0
+
+    def report(self, done: int, total: int):
+        self.done, self.total = done, total
+        if self.queue:
+            self.queue._job_progressed(self)
+
+    def execute(self):
+        raise NotImplementedError
+
+
+class CopyJob(Job):
+    reports_bytes = True
+
+    def __init__(self, src: str, dst: str, verify: Optional[str] = None):
+        super().__init__(f"Copy {src} to {dst}")
+        self.src = src
+        self.dst = dst
+        self.verify = verify
+
+    def execute(self):
+        hash_cache = HashCache() if self.verify else None
+        try:
+            copy_path(self.src, self.dst, progress_callback=lambda p: self.report(p.bytes_done, p.total_bytes),
+                      cancel_token=self.token, verify=self.verify, hash_cache=hash_cache)
+        finally:
+            if hash_cache:
+                hash_cache.close()
+
+
+class MoveJob(CopyJob):
+    def __init__(self, src: str, dst: str):
+        super().__init__(src, dst)
+        self.description = f"Move {src} to {dst}"
+
+    def execute(self):
+        if os.path.lexists(self.dst):
+            raise FileExistsError(errno.EEXIST, "Destination already exists", self.dst)
+        try:
+            os.rename(self.src, self.dst)
+            return
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+        # Different filesystem: copy, then remove the source.
+        super().execute()
+        delete_tree(self.src, cancel_token=self.token)
+
+
+class DeleteJob(Job):
+    def __init__(self, paths: List[str], trash: bool = False):
+        action = "Move to Trash" if trash else "Delete"
+        super().__init__(f"{action} {paths[0]}" if len(paths) == 1 else f"{action} {len(paths)} items")
+        self.paths = paths
+        self.trash = trash
+
+    def execute(self):
+        if self.trash:
+            for i, path in enumerate(self.paths):
+                self.token.raise_if_cancelled()
+                move_to_trash(path)
+                self.report(i + 1, len(self.paths))
+            return
+        removed = 0
+        for path in self.paths:
+            # The number of entries is unknown up front, so progress is a running count
+            progress = delete_tree(path, progress_callback=lambda p: self.report(removed + p.entries_done, 0),
+                                   cancel_token=self.token)
+            removed += progress.entries_done
+
+
+class HashJob(Job):
+    """Fills the HashCache for every file below a path, so later verifies and compares are lookups."""
+
+    reports_bytes = True
+
+    def __init__(self, path: str, algorithm: str = DEFAULT_ALGORITHM):
+        super().__init__(f"Hash {path}")
+        self.path = path
+        self.algorithm = algorithm
+
+    def execute(self):
+        sizes = {}
+        if os.path.isdir(self.path):
+            for entry in ParallelWalker(self.path, cancel_token=self.token).iter_entries():
+                try:
+                    if entry.is_file(follow_symlinks=False):
+                        sizes[entry.path] = entry.stat(follow_symlinks=False).st_size
+                except OSError:
+                    continue
+        else:
+            sizes[self.path] = os.path.getsize(self.path)
+        self.token.raise_if_cancelled()
+        total = sum(sizes.values())
+        done = 0
+        hash_cache = HashCache()
+        try:
+            for path, _ in hash_cache.digests(sizes, self.algorithm, cancel_token=self.token):
+                done += sizes[path]
+                self.report(done, total)
+        finally:
+            hash_cache.close()
+
+
+class MirrorJob(Job):
+    """Applies a DirectoryDiff so its target matches its source."""
+
+    reports_bytes = True
+
+    def __init__(self, diff: DirectoryDiff):
+        super().__init__(f"Mirror {diff.source} to {diff.target}")
+        self.diff = diff
+
+    def execute(self):
+        mirror(self.diff, progress_callback=lambda p: self.report(p.bytes_done, p.total_bytes), cancel_token=self.token)
+
+
+class ArchiveJob(Job):
+    reports_bytes = True
+
+    def __init__(self, sources: List[str], archive_path: str):
+        super().__init__(f"Archive {sources[0] if len(sources) == 1 else f'{len(sources)} items'} to {archive_path}")
+        self.sources = sources
+        self.archive_path = archive_path
+
+    def execute(self):
+        create_archive(self.sources, self.archive_path,
+                       progress_callback=lambda p: self.report(p.bytes_done, p.total_bytes), cancel_token=self.token)
+
+
+class ExtractJob(Job):
+    reports_bytes = True
+
+    def __init__(self, archive_path: str, destination: str):
+        super().__init__(f"Extract {archive_path} to {destination}")
+        self.archive_path = archive_path
+        self.destination = destination
+
+    def execute(self):
+        extract_archive(self.archive_path, self.destination,
+                        progress_callback=lambda p: self.report(p.bytes_done, p.total_bytes), cancel_token=self.token)
+
+
+class RenameJob(Job):
+    uses_io = False  # A single metadata operation
+
+    def __init__(self, src: str, dst: str):
+        super().__init__(f"Rename {src} to {os.path.basename(dst)}")
+        self.src = src
+        self.dst = dst
+
+    def execute(self):
+        if os.path.lexists(self.dst):
+            raise FileExistsError(errno.EEXIST, "Destination already exists", self.dst)
+        os.rename(self.src, self.dst)
+
+
+class JobQueue(QObject):
+    """Runs file-operation jobs on a worker pool off the GUI thread.
+
+    Up to ``max_workers`` jobs run at once, of which at most ``io_limit``
+    may be I/O-heavy (copy, move, delete); the rest wait in FIFO order.
+    Waiting jobs are handed to the worker pool only once they can start,
+    so jobs paused while queued, or waiting for an I/O slot, never tie up
+    a worker that a later job could use. Signals are emitted from worker
+    threads and delivered queued to receivers in the GUI thread.
+    """
+
+    job_added = pyqtSignal(int, str)
+    job_progress = pyqtSignal(int, 'qint64', 'qint64', float)  # id, done, total, bytes per second
+    job_state_changed = pyqtSignal(int, str)
+    job_finished = pyqtSignal(int, str, str)  # id, final state, error message
+    status_changed = pyqtSignal(str)
+
+    def __init__(self, max_workers: int = 4, io_limit: int = 2, parent=None):
+        super().__init__(parent)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job')
+        self.max_workers = max_workers
+        self.io_limit = io_limit
+        self._waiting = deque()  # Jobs not yet handed to the pool, in FIFO order
+        self._workers_busy = 0
+        self._io_busy = 0
+        self._jobs: Dict[int, Job] = {}
+        self._last_progress: Dict[int, float] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, job: Job) -> int:
+        job.queue = self
+        with self._lock:
+            self._jobs[job.id] = job
+            self._waiting.append(job)
+        self.job_added.emit(job.id, job.description)
+        self._dispatch()
+        self._emit_status()
+        return job.id
+
+    def job(self, job_id: int) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def active_jobs(self) -> List[Job]:
+        with self._lock:
+            return [job for job in self._jobs.values() if job.state in (QUEUED, RUNNING, PAUSED)]
+
+    def cancel(self, job_id: int):
+        job = self._jobs.get(job_id)
+        if job:
+            job.token.cancel()
+            self._dispatch()  # A paused waiting job still has to be finished as cancelled
+
+    def pause(self, job_id: int):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if not job or job.state not in (QUEUED, RUNNING):
+                return
+            job.token.pause()
+            job.state = PAUSED
+        self._set_state(job, PAUSED)
+
+    def resume(self, job_id: int):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if not job or job.state != PAUSED:
+                return
+            job.token.resume()
+            job.state = RUNNING if job.started else QUEUED
+        self._set_state(job, job.state)
+        self._dispatch()
+
+    def cancel_all(self):
+        for job in self.active_jobs():
+            job.token.cancel()
+        self._dispatch()
+
+    def _dispatch(self):
+        """Hand the waiting jobs that can start now to the pool, oldest first."""
+        with self._lock:
+            for job in list(self._waiting):
+                if self._workers_busy == self.max_workers:
+                    break
+                cancelled = job.token.cancelled
+                if job.state == PAUSED and not cancelled:
+                    continue
+                # A cancelled job only records its state, without I/O
+                uses_io = job.uses_io and not cancelled
+                if uses_io and self._io_busy == self.io_limit:
+                    continue
+                self._waiting.remove(job)
+                self._workers_busy += 1
+                self._io_busy += uses_io
+                self._executor.submit(self._run, job, uses_io)
+
+    def _set_state(self, job: Job, state: str):
+        job.state = state
+        self.job_state_changed.emit(job.id, state)
+        self._emit_status()
+
+    def _run(self, job: Job, uses_io: bool):
+        try:
+            with self._lock:
+                if job.token.cancelled:
+                    raise CancelledError()
+                if job.state == PAUSED:
+                    # Paused between dispatch and here: wait again, without the worker
+                    self._waiting.appendleft(job)
+                    self._release(uses_io)
+                    requeued = True
+                else:
+                    requeued = False
+                    job.started = time.monotonic()
+                    job.state = RUNNING
+            if requeued:
+                self._dispatch()
+                return
+            self._set_state(job, RUNNING)
+            job.execute()
+            state, error = DONE, ""
+        except CancelledError:
+            state, error = CANCELLED, ""
+        except Exception as e:
+            state, error = FAILED, str(e)
+        with self._lock:
+            self._release(uses_io)
+        self._dispatch()
+        job.error = error or None
+        self._set_state(job, state)
+        self.job_finished.emit(job.id, state, error)
+        with self._lock:
+            self._jobs.pop(job.id, None)
+            self._last_progress.pop(job.id, None)
+        self._emit_status()
+
+    def _release(self, uses_io: bool):
+        self._workers_busy -= 1
+        self._io_busy -= uses_io
+
+    def _job_progressed(self, job: Job):
+        now = time.monotonic()
+        finished = job.done >= job.total > 0  # The final report always goes out; jobs with no total are throttled
+        if now - self._last_progress.get(job.id, 0.0) < PROGRESS_INTERVAL and not finished:
+            return
+        self._last_progress[job.id] = now
+        self.job_progress.emit(job.id, job.done, job.total, job.bytes_per_second)
+        self._emit_status()
+
+    def _emit_status(self):
+        jobs = self.active_jobs()
+        if not jobs:
+            self.status_changed.emit("Ready")
+            return
+        running = sum(1 for job in jobs if job.state == RUNNING)
+        fractions = [job.done / job.total for job in jobs if job.total]  # Jobs count bytes or items
+        rate = sum(job.bytes_per_second for job in jobs if job.state == RUNNING)
+        message = f"{running} running, {len(jobs) - running} waiting"
+        if fractions:
+            message += f" - {int(sum(fractions) * 100 / len(fractions))}%"
+        if rate:
+            message += f" ({rate / (1024 * 1024):.1f} MB/s)"
+        self.status_changed.emit(message)
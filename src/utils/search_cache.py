@@ -0,0 +1,68 @@
+# src/utils/search_cache.py
+import os
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+
+class SearchCache:
+    """LRU cache of completed search results keyed by (root, mode, query).
+
+    Besides exact hits (e.g. after backspace), ``closest_prefix`` returns
+    the results of the longest cached query the new query extends, which a
+    search can filter instead of searching the disk again. Entries are
+    dropped when the cache is full, when the root directory's mtime moves,
+    and when ``invalidate`` is told that a path below their root changed.
+    """
+
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # (root, mode, query) -> (root mtime, results)
+
+    @staticmethod
+    def _root_mtime(root_path: str) -> Optional[float]:
+        try:
+            return os.stat(root_path).st_mtime
+        except OSError:
+            return None
+
+    def _lookup(self, key) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] != self._root_mtime(key[0]):
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def get(self, root_path: str, mode, query: str) -> Optional[Any]:
+        return self._lookup((root_path, mode, query))
+
+    def closest_prefix(self, root_path: str, mode, query: str) -> Optional[Tuple[str, Any]]:
+        """Return ``(prefix, results)`` for the longest cached proper prefix of ``query``."""
+        for length in range(len(query) - 1, 0, -1):
+            results = self._lookup((root_path, mode, query[:length]))
+            if results is not None:
+                return query[:length], results
+        return None
+
+    def put(self, root_path: str, mode, query: str, results: Any):
+        key = (root_path, mode, query)
+        self._entries[key] = (self._root_mtime(root_path), results)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, path: Optional[str] = None):
+        """Drop the entries whose root contains ``path``, or everything if no path is given."""
+        if path is None:
+            self._entries.clear()
+            return
+        path = os.path.abspath(path)
+        for key in list(self._entries):
+            root = os.path.abspath(key[0])
+            if path == root or path.startswith(root.rstrip(os.sep) + os.sep) or root.startswith(path + os.sep):
+                del self._entries[key]
+
+    def __len__(self):
+        return len(self._entries)
@@ -1,15 +1,40 @@
 # src/search_filter_proxy_model.py
 
-from PyQt6.QtCore import QSortFilterProxyModel, Qt
+from PyQt6.QtCore import QSortFilterProxyModel, Qt, pyqtSlot
+from utils.fuzzy_match import fuzzy_score
 
 class SearchFilterProxyModel(QSortFilterProxyModel):
-    def __init__(self):
-        super().__init__()
+    """Filters rows by fuzzy subsequence match and sorts the best matches first."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
         self.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
         self.setFilterKeyColumn(0)
+        self.filter_text = ""
+        self._scores = {}
 
+    @pyqtSlot(str)
     def set_filter(self, text: str):
-        if not text:
-            self.setFilterRegularExpression("")
-        else:
-            self.setFilterRegularExpression(f".*{text}.*")
+        self.filter_text = text
+        self._scores = {}
+        self.invalidateFilter()
+        if text:
+            self.sort(0, Qt.SortOrder.DescendingOrder)
+
+    def _score(self, name):
+        if name not in self._scores:
+            self._scores[name] = fuzzy_score(self.filter_text, name)
+        return self._scores[name]
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if not self.filter_text:
+            return True
+        index = self.sourceModel().index(source_row, self.filterKeyColumn(), source_parent)
+        return self._score(str(self.sourceModel().data(index))) is not None
+
+    def lessThan(self, left, right):
+        if not self.filter_text:
+            return super().lessThan(left, right)
+        left_score = self._score(str(self.sourceModel().data(left))) or 0
+        right_score = self._score(str(self.sourceModel().data(right))) or 0
+        return left_score < right_score
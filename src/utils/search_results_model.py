@@ -0,0 +1,78 @@
+# src/utils/search_results_model.py
+
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, Qt
+from utils.content_search import ContentMatch
+
+class SearchResultsModel(QAbstractListModel):
+    """List model that receives search results in batches and exposes them lazily.
+
+    Every result is kept in a plain list, but rows are only made visible to
+    the view in chunks through ``canFetchMore``/``fetchMore``, so the view
+    never lays out more rows than the user has scrolled to.
+
+    Results are either plain paths from a name search or ContentMatch
+    tuples from a content search.
+    """
+
+    FETCH_CHUNK = 256
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.root_path = ""
+        self._results = []
+        self._loaded = 0
+
+    def reset(self, root_path=""):
+        self.beginResetModel()
+        self.root_path = root_path
+        self._results = []
+        self._loaded = 0
+        self.endResetModel()
+
+    def add_results(self, results):
+        was_complete = self._loaded == len(self._results)
+        self._results.extend(results)
+        # Keep filling the first screen as results stream in; beyond that the
+        # view pulls more rows itself when it is scrolled to the bottom.
+        if was_complete and self._loaded < self.FETCH_CHUNK:
+            self.fetchMore(QModelIndex())
+
+    def result_count(self):
+        return len(self._results)
+
+    def path(self, index):
+        item = self._results[index.row()]
+        return item.path if isinstance(item, ContentMatch) else item
+
+    def relative_path(self, path):
+        if self.root_path and path.startswith(self.root_path):
+            return path[len(self.root_path):].lstrip('\\/') or path
+        return path
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._loaded
+
+    def canFetchMore(self, parent):
+        return not parent.isValid() and self._loaded < len(self._results)
+
+    def fetchMore(self, parent):
+        if parent.isValid():
+            return
+        count = min(self.FETCH_CHUNK, len(self._results) - self._loaded)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._loaded, self._loaded + count - 1)
+        self._loaded += count
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= self._loaded:
+            return None
+        item = self._results[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            if isinstance(item, ContentMatch):
+                return f"{self.relative_path(item.path)}:{item.line}:{item.column}: {item.text.strip()}"
+            return self.relative_path(item)
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return self.path(index)
+        return None
@@ -1,18 +1,262 @@
 from PyQt6.QtCore import QThread, pyqtSignal
 import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from utils.cancellation import CancelToken
+from utils.content_index import ContentIndex
+from utils.content_search import LITERAL, ContentSearcher
+from utils.filename_index import FilenameIndex
+from utils.fuzzy_match import FuzzyMatcher
+from utils.walker import ParallelWalker
+
+BATCH_INTERVAL = 0.05  # seconds between result batches
+BATCH_SIZE = 1000
 
 class SearchThread(QThread):
-    search_complete = pyqtSignal(list)
+    results_found = pyqtSignal(list)
+    search_complete = pyqtSignal(int)
+    search_failed = pyqtSignal(str)  # Emitted instead of search_complete, so partial results are not cached
 
-    def __init__(self, root_path: str, search_text: str):
-        super().__init__()
+    def __init__(self, root_path: str, search_text: str, build_index: bool = True, refine_from=None, parent=None):
+        super().__init__(parent)
         self.root_path = root_path
         self.search_text = search_text
+        self.build_index = build_index
+        self.refine_from = refine_from  # Complete results of a query this one extends
+        self.cancel_token = CancelToken()
+        self.cache_entry = []  # What a SearchCache should keep once the search completes
+        self._batch = []
+        self._last_emit = 0.0
+        self._match_count = 0
+
+    def cancel(self):
+        self.cancel_token.cancel()
+
+    def run(self):
+        if self.refine_from is not None:
+            self._search_previous()
+        elif self._index_is_fresh():
+            try:
+                self._search_index()
+            except (OSError, ValueError):
+                self._search_walk()
+        else:
+            self._search_walk()  # Also rebuilds a missing or stale index
+        self._flush()
+        if not self.cancel_token.cancelled:
+            self.search_complete.emit(self._match_count)
+
+    def _add_match(self, path):
+        # The first match goes out immediately; after that matches are
+        # grouped so the GUI thread is not flooded with signals.
+        self._batch.append(path)
+        self.cache_entry.append(path)
+        self._match_count += 1
+        self._maybe_flush()
+
+    def _maybe_flush(self):
+        if len(self._batch) >= BATCH_SIZE or (self._batch and time.monotonic() - self._last_emit >= BATCH_INTERVAL):
+            self._flush()
+
+    def _flush(self):
+        if self._batch and not self.cancel_token.cancelled:
+            self.results_found.emit(self._batch)
+        self._batch = []
+        self._last_emit = time.monotonic()
+
+    def _search_previous(self):
+        # A name containing the longer query also contains its prefix, so
+        # the prefix's matches are a complete candidate set.
+        search_text = self.search_text.lower()
+        for path in self.refine_from:
+            if self.cancel_token.cancelled:
+                return
+            if search_text in os.path.basename(path).lower():
+                self._add_match(path)
+
+    def _index_is_fresh(self) -> bool:
+        if not FilenameIndex.exists(self.root_path):
+            return False
+        index = FilenameIndex(self.root_path)
+        try:
+            index.open()
+            return index.is_fresh()
+        except (OSError, ValueError):
+            return False
+        finally:
+            index.close()
+
+    def _search_index(self):
+        index = FilenameIndex(self.root_path)
+        index.open()
+        try:
+            for path in index.search(self.search_text):
+                if self.cancel_token.cancelled:
+                    return
+                self._add_match(path)
+        finally:
+            index.close()
+
+    def _search_walk(self, match_names=True):
+        # The walk sees every name anyway, so keep them to build the index
+        # that answers the next query for this root.
+        relative_paths = []
+        search_text = self.search_text.lower()
+        if self.build_index:
+            # Taken before the walk, so changes made during it make the index stale
+            started = time.time()
+            try:
+                root_fingerprint = FilenameIndex.fingerprint(self.root_path)
+            except OSError:
+                root_fingerprint = 0
+        walker = ParallelWalker(self.root_path, cancel_token=self.cancel_token)
+        for root, dirs, files in walker.walk():
+            relative_root = os.path.relpath(root, self.root_path)
+            for entry in dirs + files:
+                name = entry.name
+                if match_names and search_text in name.lower():
+                    self._add_match(entry.path)
+                if self.build_index:
+                    relative_paths.append(name if relative_root == os.curdir else os.path.join(relative_root, name))
+            self._maybe_flush()
+        if self.build_index and not self.cancel_token.cancelled:
+            try:
+                FilenameIndex.build(self.root_path, relative_paths, built=started,
+                                    root_fingerprint=root_fingerprint).close()
+            except OSError:
+                pass
+
+class ContentSearchThread(SearchThread):
+    """Search file contents instead of names, streaming ContentMatch batches."""
+
+    def __init__(self, root_path: str, search_text: str, mode: str = LITERAL, parent=None):
+        super().__init__(root_path, search_text, build_index=False, parent=parent)
+        self.mode = mode
+
+    def run(self):
+        error = None
+        try:
+            searcher = ContentSearcher(self.root_path, self.search_text, self.mode, cancel_token=self.cancel_token)
+            for matches in searcher.search():
+                for match in matches:
+                    self._add_match(match)
+        except re.error:
+            pass  # An incomplete regex typed into the search bar simply matches nothing
+        except Exception as e:  # e.g. BrokenProcessPool, or an unreadable root
+            error = f"{type(e).__name__}: {e}"
+        finally:
+            # Always end the search, so the search bar does not stay busy
+            self._flush()
+            if not self.cancel_token.cancelled:
+                if error is None:
+                    self.search_complete.emit(self._match_count)
+                else:
+                    self.search_failed.emit(error)
+
+
+class IndexedSearchThread(SearchThread):
+    """Answer word and phrase queries from the root's persistent ContentIndex.
+
+    The index is brought up to date incrementally before a query when the
+    root's directory fingerprint has changed since the last update, or
+    when that update is older than REFRESH_INTERVAL (edits below the top
+    two levels do not change the fingerprint). Other queries only read
+    the index.
+    """
+
+    REFRESH_INTERVAL = 300  # seconds
+    refreshed = {}  # root path -> (fingerprint, time of the last update)
+
+    def run(self):
+        try:
+            index = ContentIndex(self.root_path)
+            try:
+                if self._needs_update():
+                    started = time.time()
+                    fingerprint = self._fingerprint()
+                    index.update(self.cancel_token)
+                    if not self.cancel_token.cancelled:
+                        self.refreshed[self.root_path] = (fingerprint, started)
+                if not self.cancel_token.cancelled:
+                    for path in index.search(self.search_text):
+                        self._add_match(path)
+            finally:
+                index.close()
+        except sqlite3.Error:
+            pass  # Index locked or damaged; the search just comes back empty
+        self._flush()
+        if not self.cancel_token.cancelled:
+            self.search_complete.emit(self._match_count)
+
+    def _fingerprint(self):
+        try:
+            return FilenameIndex.fingerprint(self.root_path)
+        except OSError:
+            return None
+
+    def _needs_update(self) -> bool:
+        refreshed = self.refreshed.get(self.root_path)
+        if refreshed is None or time.time() - refreshed[1] > self.REFRESH_INTERVAL:
+            return True
+        fingerprint = self._fingerprint()
+        return fingerprint is None or fingerprint != refreshed[0]
+
+
+class FuzzySearchThread(SearchThread):
+    """Rank every indexed path below the root against the query, fzf style.
+
+    Matchers are kept per root for as long as the root's FilenameIndex is
+    unchanged, so each keystroke only pays for the vectorized scoring; only
+    the MAX_CACHED_MATCHERS most recently searched roots keep theirs.
+    Cache entries and ``refine_from`` are ``(matcher, indices)`` pairs rather
+    than paths, and are ignored once the matcher has been rebuilt.
+    """
+
+    RESULT_LIMIT = 1000
+    MAX_CACHED_MATCHERS = 3
+    matchers = OrderedDict()  # root path -> (index version, FuzzyMatcher), least recently used first
+    matchers_lock = threading.Lock()  # A cancelled search may still be running beside the next one
 
     def run(self):
-        matches = []
-        for root, dirs, files in os.walk(self.root_path):
-            for name in dirs + files:
-                if self.search_text.lower() in name.lower():
-                    matches.append(os.path.join(root, name))
-        self.search_complete.emit(matches)
+        matcher = self._matcher()
+        if matcher is not None and not self.cancel_token.cancelled:
+            # Every match is cached (as indices) so a longer query only
+            # rescores these; only the best RESULT_LIMIT are shown.
+            candidates = None
+            if self.refine_from is not None and self.refine_from[0] is matcher:
+                candidates = self.refine_from[1]
+            indices, _ = matcher.match(self.search_text, candidates=candidates)
+            for i in indices[:self.RESULT_LIMIT]:
+                self._add_match(os.path.join(self.root_path, matcher.paths[i]))
+            self.cache_entry = (matcher, indices)
+        self._flush()
+        if not self.cancel_token.cancelled:
+            self.search_complete.emit(self._match_count)
+
+    def _matcher(self):
+        if not self._index_is_fresh():
+            self._search_walk(match_names=False)
+        try:
+            version = FilenameIndex.version(self.root_path)
+            with self.matchers_lock:
+                cached = self.matchers.get(self.root_path)
+                if cached and cached[0] == version:
+                    self.matchers.move_to_end(self.root_path)
+                    return cached[1]
+            index = FilenameIndex(self.root_path)
+            index.open()
+            try:
+                matcher = FuzzyMatcher(index.relative_paths())
+            finally:
+                index.close()
+        except (OSError, ValueError):
+            return None
+        with self.matchers_lock:
+            self.matchers[self.root_path] = (version, matcher)
+            self.matchers.move_to_end(self.root_path)
+            while len(self.matchers) > self.MAX_CACHED_MATCHERS:
+                self.matchers.popitem(last=False)
+        return matcher
@@ -0,0 +1,37 @@
+# src/utils/structure_export_thread.py
+import time
+from typing import Optional
+from PyQt6.QtCore import QThread, pyqtSignal
+from utils.cancellation import CancelToken
+from utils.structure_parser import render_structure
+
+BATCH_INTERVAL = 0.1  # seconds between text batches
+
+class StructureExportThread(QThread):
+    lines_ready = pyqtSignal(str)  # A batch of lines, newline terminated
+    export_complete = pyqtSignal(int)
+
+    def __init__(self, root_path: str, max_depth: Optional[int] = None, parent=None):
+        super().__init__(parent)
+        self.root_path = root_path
+        self.max_depth = max_depth
+        self.cancel_token = CancelToken()
+
+    def cancel(self):
+        self.cancel_token.cancel()
+
+    def run(self):
+        batch = []
+        count = 0
+        last_emit = time.monotonic()
+        for line in render_structure(self.root_path, self.max_depth, cancel_token=self.cancel_token):
+            batch.append(line)
+            count += 1
+            if time.monotonic() - last_emit >= BATCH_INTERVAL:
+                self.lines_ready.emit('\n'.join(batch) + '\n')
+                batch, last_emit = [], time.monotonic()
+        if self.cancel_token.cancelled:
+            return
+        if batch:
+            self.lines_ready.emit('\n'.join(batch) + '\n')
+        self.export_complete.emit(count)
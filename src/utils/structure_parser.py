@@ -0,0 +1,175 @@
+# src/utils/structure_parser.py
+import os
+import re
+import sys
+import time
+from collections import namedtuple
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+from utils.cancellation import CancelToken
+from utils.content_search import DEFAULT_EXCLUDES
+from utils.walker import compile_excludes
+
+StructureEntry = namedtuple('StructureEntry', ['path', 'is_file', 'depth'])
+
+DIRECTORY_MARKERS = '📦📂'
+FILE_MARKERS = '📜'
+
+# indentation, an optional marker, then the name
+_LINE = re.compile(rf'([ \t│├└─┣┃┗━|`+*-]*)([{DIRECTORY_MARKERS}{FILE_MARKERS}]?)\s*(.*)')
+_COMMENT = re.compile(r'\s#')
+_STRIP = str.maketrans('', '', DIRECTORY_MARKERS + FILE_MARKERS + '┣┃┗')  # Markers and box characters left inside names
+
+
+def parse_line(line: str) -> Tuple[int, str, bool]:
+    """Tokenize one line.
+
+    Args:
+        line (str): A line of structure text.
+
+    Returns:
+        tuple: ``(indent width, name, is_file)``. The name is '' for blank lines
+        and lines that hold no entry, such as code fences.
+    """
+    indent, marker, name = _LINE.match(line).groups()
+    if '#' in name:
+        name = _COMMENT.split(name, 1)[0]  # 'main.py  # entry point'
+    if not name.isascii():  # A flag check; most names skip the translate
+        name = name.translate(_STRIP)
+    parts = name.split()  # Whitespace separates path parts, as it always has
+    if not parts or parts[0].startswith('```'):
+        return 0, '', False
+    name = parts[0] if len(parts) == 1 else '/'.join(parts)
+    if marker:
+        return len(indent), name.rstrip('/'), marker in FILE_MARKERS
+    if name[-1] == '/':
+        return len(indent), name.rstrip('/'), False
+    return len(indent), name, '.' in name.rpartition('/')[2]
+
+
+def iter_lines(chunks: Iterable[str]) -> Iterator[str]:
+    """Split a stream of text chunks (e.g. streamed AI tokens) into complete lines."""
+    pending = ''
+    for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split('\n')
+        yield from lines
+    if pending:
+        yield pending
+
+
+def parse_structure(lines: Union[str, Iterable[str]]) -> Iterator[StructureEntry]:
+    """Yield the entries of structure text with their paths relative to its root.
+
+    Accepts the formats users paste and the AI returns::
+
+        📦project            project/             project
+         ┣ 📂src             ├── src/               src
+         ┃ ┗ 📜main.py       │   └── main.py          main.py
+         ┗ 📜README.md       └── README.md          README.md
+
+    Nesting follows the width of each line's indentation (spaces, tabs,
+    box-drawing characters or list bullets), so any consistent indentation
+    works. Each line is tokenized by one precompiled regex match and one
+    ``str.translate``, and its entry is yielded before the next line is read.
+
+    Args:
+        lines (str or Iterable[str]): The structure text, or its lines one at a time
+            (a file object, or ``iter_lines`` over a stream).
+
+    Yields:
+        StructureEntry: ``(path, is_file, depth)`` for every entry, parents first.
+    """
+    if isinstance(lines, str):
+        lines = lines.split('\n')
+    stack: List[Tuple[int, str]] = []  # (indent width, path) of the open directories
+    for line in lines:
+        width, name, is_file = parse_line(line)
+        if not name:
+            continue
+        while stack and stack[-1][0] >= width:
+            stack.pop()
+        path = f"{stack[-1][1]}/{name}" if stack else name
+        yield StructureEntry(path, is_file, len(stack))
+        if not is_file:
+            stack.append((width, path))
+
+
+def _sorted_listing(path: str, root_path: str, exclude_name, exclude_path) -> List[Tuple[os.DirEntry, bool]]:
+    directories, files = [], []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if exclude_name and exclude_name(entry.name):
+                    continue
+                if exclude_path and exclude_path(os.path.relpath(entry.path, root_path).replace(os.sep, '/')):
+                    continue
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                (directories if is_dir else files).append(entry)
+    except OSError:
+        pass  # Unreadable directories are shown empty
+    directories.sort(key=lambda entry: entry.name.casefold())
+    files.sort(key=lambda entry: entry.name.casefold())
+    return [(entry, True) for entry in directories] + [(entry, False) for entry in files]
+
+
+def render_structure(root_path: str, max_depth: Optional[int] = None, exclude: Optional[Iterable[str]] = DEFAULT_EXCLUDES,
+                     cancel_token: Optional[CancelToken] = None) -> Iterator[str]:
+    """Yield a directory tree as structure text, one line at a time; the inverse of ``parse_structure``.
+
+    Directories come before files, each sorted by name. Only the listings
+    of the directories on the current path are held in memory, so the
+    output of a huge tree can be consumed as it is produced. Symlinked
+    directories are shown but not entered. Names containing whitespace do
+    not survive a round trip, as the parser splits on whitespace.
+
+    Args:
+        root_path (str): The directory to render.
+        max_depth (int, optional): Deepest level to descend to; 0 lists only the root's entries.
+        exclude (Iterable[str], optional): Glob patterns of entries to leave out, as for ParallelWalker.
+        cancel_token (CancelToken, optional): Ends the output early once cancelled.
+
+    Yields:
+        str: The lines of the structure text, without newlines.
+    """
+    cancel_token = cancel_token or CancelToken()
+    root_path = os.path.abspath(root_path)
+    exclude_name, exclude_path = compile_excludes(exclude)
+    yield f"{DIRECTORY_MARKERS[0]}{os.path.basename(root_path) or root_path}"
+    # (entries, index of the next one, line prefix) for each open directory
+    stack = [(_sorted_listing(root_path, root_path, exclude_name, exclude_path), 0, ' ')]
+    while stack:
+        entries, index, prefix = stack[-1]
+        if index == len(entries) or cancel_token.cancelled:
+            stack.pop()
+            continue
+        stack[-1] = (entries, index + 1, prefix)
+        entry, is_dir = entries[index]
+        last = index == len(entries) - 1
+        marker = DIRECTORY_MARKERS[1] if is_dir else FILE_MARKERS
+        yield f"{prefix}{'┗' if last else '┣'} {marker}{entry.name}"
+        if is_dir and (max_depth is None or len(stack) <= max_depth) and not entry.is_symlink():
+            stack.append((_sorted_listing(entry.path, root_path, exclude_name, exclude_path), 0,
+                          prefix + ('  ' if last else '┃ ')))
+
+
+def _benchmark(line_count: int):
+    lines = []
+    while len(lines) < line_count:
+        package = len(lines)
+        lines.append(f" ┣ 📂package{package}")
+        for module in range(50):
+            lines.append(f" ┃ ┣ 📂module{module}")
+            lines.extend(f" ┃ ┃ ┣ 📜file{number}.py" for number in range(20))
+    text = '\n'.join(lines[:line_count])
+    started = time.perf_counter()
+    entries = sum(1 for _ in parse_structure(text))
+    elapsed = time.perf_counter() - started
+    print(f"{entries} entries from {line_count} lines in {elapsed:.3f} s ({line_count / elapsed:,.0f} lines/s)")
+
+
+if __name__ == '__main__':
+    # python -m utils.structure_parser [line count]
+    _benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -1,7 +1,34 @@
+import hashlib
 import os
 
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../settings/cache')
+
 def is_image_file(path):
     return path.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp', '.gif'))
 
 def is_text_file(path):
     return not is_image_file(path)
+
+def get_cache_path(namespace, root_path, suffix=''):
+    """Return the cache file used by ``namespace`` for ``root_path``.
+
+    Args:
+        namespace (str): Sub-directory of the cache directory, e.g. 'filename_index'.
+        root_path (str): The directory the cached data belongs to.
+        suffix (str): Optional file extension for the cache file.
+
+    Returns:
+        str: The absolute path of the cache file.
+    """
+    root_path = os.path.normcase(os.path.abspath(root_path))
+    digest = hashlib.sha1(root_path.encode('utf-8', 'surrogateescape')).hexdigest()
+    directory = os.path.join(CACHE_DIR, namespace)
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, digest + suffix)
+
+def format_size(size):
+    """Format a byte count for display, e.g. ``format_size(1536)`` -> ``'1.5 KB'``."""
+    for unit in ('bytes', 'KB', 'MB', 'GB', 'TB'):
+        if size < 1024 or unit == 'TB':
+            return f"{size} {unit}" if unit == 'bytes' else f"{size:.1f} {unit}"
+        size /= 1024
@@ -0,0 +1,128 @@
+# src/utils/walker.py
+import os
+import re
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from fnmatch import translate
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+from utils.cancellation import CancelToken
+
+DEFAULT_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+
+def compile_excludes(patterns: Optional[Iterable[str]]) -> Tuple[Optional[Callable], Optional[Callable]]:
+    """Compile exclude globs into ``(name match, relative path match)`` functions, None when unused.
+
+    Patterns containing a path separator match the '/'-separated path
+    relative to the root, others match the entry name.
+    """
+    name_patterns, path_patterns = [], []
+    for pattern in patterns or ():
+        (path_patterns if '/' in pattern or os.sep in pattern else name_patterns).append(translate(pattern))
+    return (re.compile('|'.join(name_patterns)).match if name_patterns else None,
+            re.compile('|'.join(path_patterns)).match if path_patterns else None)
+
+
+class ParallelWalker:
+    """Walk a directory tree with ``os.scandir`` calls spread over a thread pool.
+
+    ``walk`` yields ``(dirpath, dirs, files)`` like ``os.walk`` in top-down
+    mode, except that ``dirs`` and ``files`` hold ``os.DirEntry`` objects and
+    directories arrive in completion order rather than a fixed order.
+    Removing entries from ``dirs`` before resuming the generator prunes them,
+    just as with ``os.walk``.
+    """
+
+    def __init__(self, root_path: str, max_workers: int = DEFAULT_WORKERS, max_depth: Optional[int] = None,
+                 exclude: Optional[Iterable[str]] = None, follow_symlinks: bool = False,
+                 onerror: Optional[Callable[[OSError], None]] = None, cancel_token: Optional[CancelToken] = None):
+        """
+        Args:
+            root_path (str): The directory to walk.
+            max_workers (int): Number of directories read concurrently.
+            max_depth (int, optional): Deepest level to descend to; 0 lists only the root.
+            exclude (Iterable[str], optional): Glob patterns of entries to skip. Patterns
+                containing a path separator match the path relative to the root, others
+                match the entry name.
+            follow_symlinks (bool): Descend into symlinked directories. Each directory is
+                still visited only once, so symlink loops terminate.
+            onerror (callable, optional): Called with the OSError of unreadable directories.
+            cancel_token (CancelToken, optional): Stops the walk once cancelled; the
+                generator then simply ends.
+        """
+        self.root_path = os.path.abspath(root_path)
+        self.max_workers = max(1, max_workers)
+        self.max_depth = max_depth
+        self.follow_symlinks = follow_symlinks
+        self.onerror = onerror
+        self.cancel_token = cancel_token or CancelToken()
+        self._exclude_name, self._exclude_path = compile_excludes(exclude)
+
+    def _is_excluded(self, entry: os.DirEntry) -> bool:
+        if self._exclude_name and self._exclude_name(entry.name):
+            return True
+        if self._exclude_path:
+            relative_path = os.path.relpath(entry.path, self.root_path).replace(os.sep, '/')
+            return bool(self._exclude_path(relative_path))
+        return False
+
+    def _scan(self, path: str, depth: int) -> Tuple[str, int, List[os.DirEntry], List[os.DirEntry]]:
+        dirs, files = [], []
+        if self.cancel_token.cancelled:
+            return path, depth, dirs, files
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    if self._is_excluded(entry):
+                        continue
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    (dirs if is_dir else files).append(entry)
+        except OSError as e:
+            if self.onerror:
+                self.onerror(e)
+        return path, depth, dirs, files
+
+    def _should_descend(self, entry: os.DirEntry, visited: set) -> bool:
+        try:
+            if not self.follow_symlinks:
+                return not entry.is_symlink()
+            st = entry.stat()
+        except OSError:
+            return False
+        key = (st.st_dev, st.st_ino)
+        if key in visited:
+            return False
+        visited.add(key)
+        return True
+
+    def walk(self) -> Iterator[Tuple[str, List[os.DirEntry], List[os.DirEntry]]]:
+        """Yield ``(dirpath, dirs, files)`` for every directory below the root."""
+        visited = set()
+        if self.follow_symlinks:
+            st = os.stat(self.root_path)
+            visited.add((st.st_dev, st.st_ino))
+        pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='walker')
+        try:
+            pending = {pool.submit(self._scan, self.root_path, 0)}
+            while pending and not self.cancel_token.cancelled:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if self.cancel_token.cancelled:
+                        return
+                    path, depth, dirs, files = future.result()
+                    yield path, dirs, files
+                    if self.max_depth is not None and depth >= self.max_depth:
+                        continue
+                    for entry in dirs:
+                        if self._should_descend(entry, visited):
+                            pending.add(pool.submit(self._scan, entry.path, depth + 1))
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def iter_entries(self) -> Iterator[os.DirEntry]:
+        """Yield every entry below the root, directories and files alike."""
+        for _, dirs, files in self.walk():
+            yield from dirs
+            yield from files